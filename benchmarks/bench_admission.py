@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK CONTRÔLE D'ADMISSION HUMEAN
+Surcharge d'une route à capacité fixe : latences p50/p99 et taux de rejet, avec et sans limiteur
+"""
+
+import argparse
+import http.client
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+from src.core.humean_admission import AdaptiveLimiter, install_admission_control  # noqa: E402
+
+
+def _make_app(service_ms, admission):
+    app = Flask(__name__)
+    app.config['limiter'] = None
+    backend = threading.Semaphore(2)  # ressource partagée à capacité fixe (ex: base SQLite)
+    if admission:
+        limiter = AdaptiveLimiter("interactive", initial_limit=4, min_limit=2, max_limit=32, queue_timeout=0.05)
+        install_admission_control(app, pools=[(('/api/query',), limiter)])
+        app.config['limiter'] = limiter
+
+    @app.route('/api/query', methods=['POST'])
+    def query():
+        with backend:
+            time.sleep(service_ms / 1000)
+        return {'ok': True}
+
+    return app
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2)
+
+
+def _run(admission, clients, duration, service_ms):
+    app = _make_app(service_ms, admission)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    latencies, shed = [], []
+    stop = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=30)
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            conn.request("POST", "/api/query", body=b"{}", headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+            if response.status == 503:
+                shed.append(elapsed)
+                time.sleep(0.01)  # client discipliné : courte pause avant nouvel essai
+            else:
+                latencies.append(elapsed)
+        conn.close()
+
+    workers = [threading.Thread(target=client) for _ in range(clients)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    server.shutdown()
+    total = len(latencies) + len(shed)
+    limiter = app.config['limiter']
+    return {
+        'admission': admission,
+        'ok': len(latencies),
+        'shed_ratio': round(len(shed) / total, 3) if total else 0.0,
+        'p50_ms': _percentile(latencies, 0.5),
+        'p99_ms': _percentile(latencies, 0.99),
+        'shed_p99_ms': _percentile(shed, 0.99),
+        'limiter': limiter.get_stats() if limiter else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--service-ms', type=float, default=5.0)
+    args = parser.parse_args()
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    for admission in (False, True):
+        print(_run(admission, args.clients, args.duration, args.service_ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK REQUÊTES PAR LOT HUMEAN
+Débit de /api/query/batch comparé à N appels /api/query (client de test Flask en processus)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+# Base et logs isolés dans un répertoire temporaire
+os.chdir(tempfile.mkdtemp(prefix="humean_bench_"))
+
+from core import humean_server  # noqa: E402
+
+
+def main():
+    client = humean_server.app.test_client()
+    rounds = 5
+
+    print("📦 BENCHMARK REQUÊTES PAR LOT")
+    print(f"{'N':>5} | {'N appels (req/s)':>17} | {'lot (req/s)':>12} | {'gain':>6}")
+    print("-" * 50)
+    for size in (10, 50, 200):
+        single_time = batch_time = 0.0
+        for r in range(rounds):
+            queries = [f"analyse du sujet {r}-{i}-{size}" for i in range(size)]
+
+            start = time.perf_counter()
+            for query in queries:
+                client.post('/api/query', json={'query': query + ' s'})
+            single_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            client.post('/api/query/batch', json={'queries': [q + ' b' for q in queries]})
+            batch_time += time.perf_counter() - start
+
+        single_rps = size * rounds / single_time
+        batch_rps = size * rounds / batch_time
+        print(f"{size:>5} | {single_rps:>17.0f} | {batch_rps:>12.0f} | {batch_rps / single_rps:>5.1f}x")
+
+    humean_server.data_connector.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK DE CHARGE HTTP HUMEAN
+Mélanges scriptés de requêtes (/api/query, /api/feedback, /api/training-data, /data/*) à
+concurrence fixe, en processus (client de test Flask) ou sur socket local ; débit,
+latences p50/p95/p99 et export JSON comparable d'une exécution à l'autre
+
+Exemples :
+    python benchmarks/bench_http.py --mix mixed --transport socket --concurrency 8 --duration 10
+    python benchmarks/bench_http.py --mix query --output base.json
+    python benchmarks/bench_http.py --mix query --compare base.json
+"""
+
+import argparse
+import contextlib
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+TOPICS = ["analyse", "marché", "climat", "énergie", "santé", "robotique", "finance", "éducation"]
+
+
+def _query(rng):
+    return {'query': f"{rng.choice(TOPICS)} {rng.choice(TOPICS)} {rng.randint(0, 500)}"}
+
+
+def _feedback(rng):
+    return {
+        'input_data': f"{rng.choice(TOPICS)} {rng.randint(0, 500)}",
+        'expected_output': f"réponse {rng.randint(0, 50)}",
+        'feedback_score': rng.choice([0.2, 0.6, 0.9, 1.0]),
+    }
+
+
+# (nom, méthode, chemin, fabrique du corps JSON ou None)
+OPERATIONS = {
+    'query': ('POST', '/api/query', _query),
+    'feedback': ('POST', '/api/feedback', _feedback),
+    'training_data': ('GET', '/api/training-data?limit=50', None),
+    'health': ('GET', '/api/health', None),
+    'data_insights': ('GET', '/data/insights', None),
+    'data_sources': ('GET', '/data/sources', None),
+    'connect_financial': ('POST', '/data/connect/financial',
+                          lambda rng: {'symbol': rng.choice(['AAPL', 'MSFT', 'NVDA']), 'days': 30}),
+    'connect_scientific': ('POST', '/data/connect/scientific', lambda rng: {'query': rng.choice(TOPICS)}),
+}
+
+# Poids relatifs des opérations par scénario
+MIXES = {
+    'query': {'query': 1},
+    'read': {'query': 6, 'training_data': 2, 'data_insights': 1, 'data_sources': 1},
+    'mixed': {'query': 60, 'feedback': 15, 'training_data': 10, 'data_insights': 8, 'connect_financial': 5,
+              'connect_scientific': 2},
+    'ingest': {'connect_financial': 5, 'connect_scientific': 3, 'data_insights': 2},
+}
+
+
+def build_app(workdir):
+    """Application complète (API + endpoints données) sur une base isolée"""
+    os.chdir(workdir)
+    from src.core.humean_data_api import create_data_endpoints
+    from src.core.humean_server import HumeanComponents, create_app
+
+    components = HumeanComponents(db_path=os.path.join(workdir, 'bench.db'))
+    app = create_app(components)
+    create_data_endpoints(app)
+    return app, components
+
+
+class _InProcessClient:
+    """Client de test Flask : mesure l'application sans la pile réseau"""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, body):
+        response = self._client.open(path, method=method, json=body)
+        response.get_data()
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class _SocketClient:
+    """Connexion HTTP/1.1 persistante vers le serveur local"""
+
+    def __init__(self, port):
+        self._conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+    def request(self, method, path, body):
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        self._conn.request(method, path, body=payload, headers=headers)
+        response = self._conn.getresponse()
+        response.read()
+        return response.status
+
+    def close(self):
+        self._conn.close()
+
+
+def _start_socket_server(app):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return round(sorted_values[index] * 1000, 3)
+
+
+def _summary(latencies, statuses, elapsed):
+    latencies = sorted(latencies)
+    errors = sum(1 for status in statuses if status >= 500)
+    by_status = {}
+    for status in statuses:
+        by_status[str(status)] = by_status.get(str(status), 0) + 1
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'errors': errors,
+        'status': by_status,
+        'p50_ms': _percentile(latencies, 0.50),
+        'p95_ms': _percentile(latencies, 0.95),
+        'p99_ms': _percentile(latencies, 0.99),
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else None,
+    }
+
+
+def run_load(make_client, mix, concurrency, duration=None, requests=None, warmup=0.0, seed=0):
+    """Boucle fermée à concurrence fixe ; séquence d'opérations reproductible (graine par client)"""
+    names = sorted(mix)
+    weights = [mix[name] for name in names]
+    samples = [[] for _ in range(concurrency)]
+    barrier = threading.Barrier(concurrency + 1)
+    state = {'measure_from': None, 'stop_at': None}
+
+    def worker(slot):
+        rng = random.Random(seed * 1000 + slot)
+        client = make_client()
+        out = samples[slot]
+        barrier.wait()
+        done = 0
+        try:
+            while True:
+                if requests is not None and done >= requests:
+                    break
+                name = rng.choices(names, weights)[0]
+                method, path, body_factory = OPERATIONS[name]
+                body = body_factory(rng) if body_factory else None
+                start = time.perf_counter()
+                if state['stop_at'] is not None and start >= state['stop_at']:
+                    break
+                status = client.request(method, path, body)
+                end = time.perf_counter()
+                if start >= state['measure_from']:
+                    out.append((name, end - start, status))
+                    done += 1
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    now = time.perf_counter()
+    state['measure_from'] = now + warmup
+    if duration is not None:
+        state['stop_at'] = state['measure_from'] + duration
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    # Mode durée : fenêtre fixe ; mode nombre de requêtes : jusqu'à la fin du dernier client
+    end = state['stop_at'] if state['stop_at'] is not None else time.perf_counter()
+    elapsed = end - state['measure_from']
+
+    results = [sample for per_worker in samples for sample in per_worker]
+    by_operation = {}
+    for name, latency, status in results:
+        entry = by_operation.setdefault(name, ([], []))
+        entry[0].append(latency)
+        entry[1].append(status)
+    return {
+        'overall': _summary([r[1] for r in results], [r[2] for r in results], elapsed),
+        'operations': {name: _summary(lat, st, elapsed) for name, (lat, st) in sorted(by_operation.items())},
+        'elapsed_s': round(elapsed, 3),
+    }
+
+
+def _environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def _print_report(report, baseline=None):
+    config = report['config']
+    print(f"🌐 {config['mix']} / {config['transport']} / concurrence {config['concurrency']}"
+          f" ({report['result']['elapsed_s']} s)")
+    print(f"{'opération':<20}{'req':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'5xx':>6}")
+    rows = list(report['result']['operations'].items()) + [('TOTAL', report['result']['overall'])]
+    base_ops = {}
+    if baseline is not None:
+        base_ops = dict(baseline['result']['operations'], TOTAL=baseline['result']['overall'])
+    for name, s in rows:
+        line = (f"{name:<20}{s['requests']:>8}{s['throughput_rps']:>10}{s['p50_ms'] or '-':>10}"
+                f"{s['p95_ms'] or '-':>10}{s['p99_ms'] or '-':>10}{s['errors']:>6}")
+        base = base_ops.get(name)
+        if base and base['throughput_rps'] and base['p99_ms']:
+            line += (f"   débit {s['throughput_rps'] / base['throughput_rps'] - 1:+.1%}"
+                     f", p99 {s['p99_ms'] / base['p99_ms'] - 1:+.1%}")
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de charge HTTP HUMEAN")
+    parser.add_argument('--mix', choices=sorted(MIXES), default='mixed')
+    parser.add_argument('--mix-file', help="Poids JSON {opération: poids} (remplace --mix)")
+    parser.add_argument('--transport', choices=('inprocess', 'socket'), default='inprocess')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help="Durée mesurée (s)")
+    parser.add_argument('--requests', type=int, help="Requêtes par client (remplace --duration)")
+    parser.add_argument('--warmup', type=float, default=1.0, help="Échauffement non mesuré (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Fichier JSON de résultats")
+    parser.add_argument('--compare', help="Résultats JSON de référence à comparer")
+    args = parser.parse_args()
+    # build_app change de répertoire (base isolée) : chemins utilisateur résolus avant
+    for name in ('mix_file', 'output', 'compare'):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+
+    mix = MIXES[args.mix]
+    if args.mix_file:
+        with open(args.mix_file, encoding='utf-8') as f:
+            mix = json.load(f)
+        unknown = set(mix) - set(OPERATIONS)
+        if unknown:
+            parser.error(f"Opérations inconnues: {', '.join(sorted(unknown))}")
+
+    # Journaux du serveur limités aux avertissements : on mesure l'API, pas la console
+    logging.basicConfig(level=logging.WARNING)
+    workdir = tempfile.mkdtemp(prefix="humean_bench_")
+    app, components = build_app(workdir)
+    components.ensure_started()
+
+    server = None
+    if args.transport == 'socket':
+        server = _start_socket_server(app)
+        port = server.server_port
+
+        def make_client():
+            return _SocketClient(port)
+    else:
+        def make_client():
+            return _InProcessClient(app)
+
+    try:
+        # Le connecteur de données écrit sur stdout à chaque appel : silencieux pendant la mesure
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            result = run_load(make_client, mix, args.concurrency,
+                              duration=None if args.requests else args.duration,
+                              requests=args.requests, warmup=0.0 if args.requests else args.warmup,
+                              seed=args.seed)
+    finally:
+        if server is not None:
+            server.shutdown()
+        components.shutdown()
+
+    report = {
+        'config': {
+            'mix': args.mix_file or args.mix,
+            'weights': mix,
+            'transport': args.transport,
+            'concurrency': args.concurrency,
+            'duration_s': None if args.requests else args.duration,
+            'requests_per_client': args.requests,
+            'warmup_s': args.warmup,
+            'seed': args.seed,
+        },
+        'environment': _environment(),
+        'result': result,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    _print_report(report, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Résultats enregistrés: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK GÉNÉRATION D'INSIGHTS P3 HUMEAN
+Débit de generate_p3_insights sur un arriéré raw_data : série vs pool de processus (1, 2, 4... workers)
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.humean_data_connector import HumeanDataConnector  # noqa: E402
+
+KINDS = ("financial", "scientific", "social", "iot")
+
+
+def _backlog(count):
+    for i in range(count):
+        kind = KINDS[i % len(KINDS)]
+        yield kind, {
+            "symbol": "AAPL", "data": {"price_change_percent": i % 13 - 5, "volatility": 0.2},
+            "query": "ia", "papers_found": i % 90, "trending_topics": ["LLM optimization", "AGI safety"],
+            "topic": "AI ethics", "sentiment_analysis": {"positive": 0.7},
+            "engagement_metrics": {"mentions": i % 2000},
+            "sensor_type": "environmental", "readings": {"temperature": 21.5}, "anomalies_detected": i % 3,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--workers", default="1,2,4")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="humean_bench_")
+    template = os.path.join(workdir, "backlog.db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        HumeanDataConnector(db_path=template).store_raw_data_many(_backlog(args.rows))
+
+    print(f"🔮 BENCHMARK INSIGHTS P3 ({args.rows} lignes, {os.cpu_count()} CPU)")
+    print(f"{'workers':>8} | {'lignes/s':>10} | {'gain':>6}")
+    print("-" * 32)
+    baseline = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        path = os.path.join(workdir, f"run_{workers}.db")
+        shutil.copyfile(template, path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            connector = HumeanDataConnector(db_path=path)
+            start = time.perf_counter()
+            generated = connector.generate_p3_insights(chunk_size=args.chunk_size, workers=workers)
+            elapsed = time.perf_counter() - start
+            connector.close()
+        assert generated == args.rows, generated
+        rate = args.rows / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} | {rate:>10,.0f} | {rate / baseline:>5.1f}x")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
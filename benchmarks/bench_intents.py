@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK MOTEUR D'INTENTIONS HUMEAN
+Latence de reconnaissance selon le nombre de règles : expression compilée vs chaîne de 'in'
+"""
+
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.humean_intents import DEFAULT_INTENTS, IntentEngine
+
+
+def make_rules(count, rng):
+    """Génère des règles synthétiques + les règles par défaut"""
+    rules = list(DEFAULT_INTENTS)
+    for i in range(count):
+        keywords = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))) for _ in range(3)]
+        rules.append({"name": f"intent_{i}", "keywords": keywords, "response": f"Réponse {i}"})
+    return rules
+
+
+def linear_match(rules, text):
+    """Référence : l'ancienne chaîne de tests de sous-chaînes"""
+    lower = text.lower()
+    for rule in rules:
+        for keyword in rule["keywords"]:
+            if keyword in lower:
+                return rule
+    return None
+
+
+def main():
+    rng = random.Random(42)
+    queries = [
+        "Bonjour HUMEAN, peux-tu analyser les tendances du marché aujourd'hui ?",
+        "Quelle est la meilleure architecture pour un système auto-apprenant distribué ?",
+        "merci pour la réponse détaillée",
+    ]
+    runs = 2000
+
+    print("🧭 BENCHMARK MOTEUR D'INTENTIONS")
+    print(f"{'règles':>8} | {'compilé (µs)':>13} | {'linéaire (µs)':>14}")
+    print("-" * 42)
+    for count in (10, 100, 1000, 5000):
+        rules = make_rules(count, rng)
+        engine = IntentEngine(rules=rules)
+        compiled = timeit.timeit(lambda: [engine.match(q) for q in queries], number=runs)
+        linear = timeit.timeit(lambda: [linear_match(rules, q) for q in queries], number=runs)
+        per_call = 1e6 / (runs * len(queries))
+        print(f"{count:>8} | {compiled * per_call:>13.2f} | {linear * per_call:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
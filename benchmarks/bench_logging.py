@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK JOURNALISATION HUMEAN
+Surcoût par requête de la journalisation : FileHandler synchrone vs file + thread d'écriture
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.humean_logging import LOG_FORMAT, configure_logging, flush_logging, stop_logging  # noqa: E402
+
+logger = logging.getLogger("HumeanServer")
+
+
+def _configure(mode, log_file):
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    stop_logging()
+    root.setLevel(logging.DEBUG)
+    if mode == "sync":
+        handler = logging.FileHandler(log_file, encoding='utf-8')
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+    elif mode == "async":
+        configure_logging(log_file, level="DEBUG", console=False, max_bytes=0)
+
+
+def _request(i):
+    # Profil d'une requête : événement DEBUG à fort volume + une ligne INFO
+    logger.debug("Requête traitée (source=%s, confiance=%s)", "learned", 0.91)
+    logger.info(f"📚 Apprentissage à partir du feedback: {i % 5}")
+    logger.debug("Feedback reçu (score=%s)", i % 5)
+
+
+def _run(mode, threads, requests, workdir):
+    log_file = os.path.join(workdir, f"{mode}.log")
+    _configure(mode, log_file)
+    samples = [[] for _ in range(threads)]
+
+    def worker(slot):
+        out = samples[slot]
+        for i in range(requests):
+            start = time.perf_counter()
+            _request(i)
+            out.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    hot_path = time.perf_counter() - start
+    flush_logging()
+    total = time.perf_counter() - start
+    latencies = sorted(x for s in samples for x in s)
+    count = len(latencies)
+    return {
+        "mode": mode,
+        "threads": threads,
+        "requests": count,
+        "mean_us": round(sum(latencies) / count * 1e6, 2),
+        "p99_us": round(latencies[int(0.99 * (count - 1))] * 1e6, 2),
+        "hot_path_s": round(hot_path, 3),
+        "drained_s": round(total, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [_run(mode, args.threads, args.requests, workdir) for mode in ("none", "sync", "async")]
+    stop_logging()
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<8}{'moy (µs)':>12}{'p99 (µs)':>12}{'chemin req. (s)':>18}{'écrit (s)':>12}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['mean_us']:>12}{r['p99_us']:>12}{r['hot_path_s']:>18}{r['drained_s']:>12}")
+
+
+if __name__ == "__main__":
+    main()
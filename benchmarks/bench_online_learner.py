@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK APPRENTISSAGE EN LIGNE HUMEAN
+Débit d'entraînement (lignes/s) et latence d'inférence du modèle en ligne ;
+--json enregistre les résultats pour comparaison entre versions
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+import numpy as np  # noqa: E402
+
+from core.humean_online_learner import OnlineLearner  # noqa: E402
+
+VOCABULARY = [f"mot{i}" for i in range(5000)]
+
+
+def _dataset(rows, responses, seed=0):
+    rng = random.Random(seed)
+    # Chaque réponse est associée à un petit groupe de mots caractéristiques
+    topics = [rng.sample(VOCABULARY, 8) for _ in range(responses)]
+    data = []
+    for _ in range(rows):
+        answer = rng.randrange(responses)
+        words = rng.sample(topics[answer], 3) + rng.sample(VOCABULARY, 3)
+        data.append((" ".join(words), f"réponse {answer}"))
+    return data
+
+
+def run(rows, responses, queries):
+    data = _dataset(rows, responses)
+    learner = OnlineLearner()
+
+    start = time.perf_counter()
+    learner.partial_fit(data)
+    train_s = time.perf_counter() - start
+
+    probes = [q for q, _ in data[:queries]]
+    latencies = []
+    for query in probes:
+        t = time.perf_counter()
+        learner.rank(query, k=3)
+        latencies.append((time.perf_counter() - t) * 1e6)
+    correct = sum(learner.rank(q, k=1)[0][0] == a for q, a in data[:queries])
+
+    return {
+        "rows": rows,
+        "responses": responses,
+        "train_rows_per_s": round(rows / train_s),
+        "rank_p50_us": round(float(np.percentile(latencies, 50)), 1),
+        "rank_p99_us": round(float(np.percentile(latencies, 99)), 1),
+        "train_accuracy": round(correct / len(probes), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark apprentissage en ligne HUMEAN")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--json", help="enregistre les résultats dans ce fichier")
+    args = parser.parse_args()
+
+    results = [run(args.rows, responses, args.queries) for responses in (10, 100, 1000)]
+
+    print("🎓 BENCHMARK APPRENTISSAGE EN LIGNE")
+    print(f"{'réponses':>9} | {'entraînement (lignes/s)':>24} | {'rank p50 (µs)':>13} | {'rank p99 (µs)':>13} | {'précision':>9}")
+    print("-" * 82)
+    for r in results:
+        print(f"{r['responses']:>9} | {r['train_rows_per_s']:>24} | {r['rank_p50_us']:>13} | "
+              f"{r['rank_p99_us']:>13} | {r['train_accuracy']:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "results": results,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats enregistrés: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
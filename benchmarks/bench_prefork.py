@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK SERVEUR PRE-FORK HUMEAN
+Débit de /api/query sur socket local avec 1, 2, 4... workers (clients en processus séparés)
+"""
+
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVER_SCRIPT = r'''
+import sys
+from core.humean_server import HumeanComponents, create_app
+from core.humean_prefork import PreforkServer
+
+components = HumeanComponents(db_path=sys.argv[1])
+server = PreforkServer(create_app(components), port=0, workers=int(sys.argv[2]))
+print(server.bind(), flush=True)
+server.serve_forever()
+'''
+
+
+def _client(port, requests, results):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    body = json.dumps({'query': 'analyse du sujet', 'store_for_training': False})
+    headers = {'Content-Type': 'application/json'}
+    start = time.perf_counter()
+    for _ in range(requests):
+        conn.request("POST", "/api/query", body=body, headers=headers)
+        conn.getresponse().read()
+    results.put(time.perf_counter() - start)
+    conn.close()
+
+
+def _run(workers, clients, requests, workdir):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT_DIR, os.path.join(ROOT_DIR, 'src')]))
+    server = subprocess.Popen(
+        [sys.executable, "-c", SERVER_SCRIPT, os.path.join(workdir, f"bench_{workers}.db"), str(workers)],
+        cwd=workdir, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        port = int(server.stdout.readline())
+        time.sleep(1.0)  # démarrage des workers
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=_client, args=(port, requests, results)) for _ in range(clients)]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+        return clients * requests / elapsed
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+
+def main():
+    clients = int(os.environ.get("BENCH_CLIENTS", 8))
+    requests = int(os.environ.get("BENCH_REQUESTS", 200))
+    workdir = tempfile.mkdtemp(prefix="humean_bench_")
+
+    print(f"🧬 BENCHMARK PRE-FORK ({os.cpu_count()} CPU, {clients} clients x {requests} requêtes)")
+    print(f"{'workers':>8} | {'req/s':>8} | {'gain':>6}")
+    print("-" * 30)
+    baseline = None
+    for workers in (1, 2, 4):
+        rps = _run(workers, clients, requests, workdir)
+        baseline = baseline or rps
+        print(f"{workers:>8} | {rps:>8.0f} | {rps / baseline:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK INSTANTANÉS DE MODÈLE HUMEAN
+Temps de chargement d'un instantané projeté en mémoire (mmap) comparé à la réindexation
+complète des connaissances, selon la taille du modèle
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+from core.humean_online_learner import OnlineLearner  # noqa: E402
+from core.humean_snapshots import open_snapshot, write_snapshot  # noqa: E402
+from core.humean_vector_index import VectorIndex  # noqa: E402
+
+
+def _knowledge(size):
+    return [(f"k{i}", f"question {i} sujet {i % 97} thème {i % 13}", f"réponse {i}") for i in range(size)]
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="humean_bench_")
+    print("📸 BENCHMARK INSTANTANÉS DE MODÈLE")
+    print(f"{'entrées':>8} | {'taille (Mo)':>11} | {'écriture (ms)':>13} | {'réindexation (ms)':>17} | {'mmap (ms)':>9}")
+    print("-" * 72)
+    for size in (10_000, 50_000, 200_000):
+        knowledge = _knowledge(size)
+
+        start = time.perf_counter()
+        index = VectorIndex()
+        for key, text, output in knowledge:
+            index.add(key, text, output)
+        rebuild_ms = (time.perf_counter() - start) * 1000
+
+        learner = OnlineLearner()
+        learner.partial_fit([(text, output) for _, text, output in knowledge[:2000]] * 2)
+        vector_arrays, vector_strings = index.export_state('vectors.')
+        learner_arrays, learner_strings, learner_metadata = learner.export_state('learner.')
+        path = os.path.join(workdir, f"model_{size}.hsnap")
+        start = time.perf_counter()
+        total = write_snapshot(path, {**vector_arrays, **learner_arrays}, {**vector_strings, **learner_strings},
+                               {'learner': learner_metadata})
+        write_ms = (time.perf_counter() - start) * 1000
+
+        # Meilleur de 3 chargements, hors passages du GC sur les grosses listes du benchmark
+        gc.collect()
+        load_ms = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            snapshot = open_snapshot(path)
+            loaded = VectorIndex.from_snapshot(snapshot, 'vectors.')
+            OnlineLearner().load_snapshot(snapshot, 'learner.', snapshot.metadata['learner'])
+            load_ms = min(load_ms, (time.perf_counter() - start) * 1000)
+        assert loaded.best_answer(knowledge[7][1])['output'] == knowledge[7][2]
+
+        print(f"{size:>8} | {total / 1e6:>11.1f} | {write_ms:>13.0f} | {rebuild_ms:>17.0f} | {load_ms:>9.2f}")
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK INDEX VECTORIEL HUMEAN
+Latence de recherche top-k et coût des ajouts incrémentaux selon la taille de l'index
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.humean_vector_index import VectorIndex
+
+WORDS = ("analyse marché données modèle système prix tendance capitale météo recherche "
+         "énergie réseau innovation éthique sécurité apprentissage architecture finance").split()
+
+
+def random_query(rng):
+    return " ".join(rng.choices(WORDS, k=rng.randint(4, 9)))
+
+
+def main():
+    rng = random.Random(7)
+    index = VectorIndex()
+    queries = [random_query(rng) for _ in range(200)]
+
+    print("🧮 BENCHMARK INDEX VECTORIEL")
+    print(f"{'entrées':>8} | {'ajout (µs)':>10} | {'recherche (ms)':>14} | {'lot x32 (ms/req)':>16}")
+    print("-" * 58)
+    for target in (1000, 10000, 100000):
+        start = time.perf_counter()
+        added = 0
+        while len(index) < target:
+            index.add(f"k{len(index)}", random_query(rng), "réponse", rng.random())
+            added += 1
+        add_us = (time.perf_counter() - start) / max(added, 1) * 1e6
+
+        start = time.perf_counter()
+        for query in queries:
+            index.best_answer(query)
+        search_ms = (time.perf_counter() - start) / len(queries) * 1e3
+
+        start = time.perf_counter()
+        for i in range(0, len(queries), 32):
+            index.best_answers(queries[i:i + 32])
+        batch_ms = (time.perf_counter() - start) / len(queries) * 1e3
+
+        print(f"{target:>8} | {add_us:>10.1f} | {search_ms:>14.3f} | {batch_ms:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
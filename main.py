@@ -9,7 +9,6 @@ import os
 import webbrowser
 import subprocess
 import logging
-import time
 
 # Configuration des paths et encodage
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -54,10 +53,10 @@ def start_web_server():
     print("⏳ Initialisation en cours...")
     
     try:
-        # Import simple qui démarre automatiquement le serveur
-        import core.humean_server
+        # Import sans effet de bord : les composants sont créés par run_server()
+        from core.humean_server import run_server
         
-        print("✅ Système HUMEAN initialisé avec succès!")
+        print("✅ Système HUMEAN chargé avec succès!")
         print("")
         print("📍 Serveur accessible sur: http://127.0.0.1:5000")
         print("")
@@ -77,10 +76,9 @@ def start_web_server():
         print("🛑 Appuyez sur Ctrl+C pour arrêter le serveur")
         print("="*50)
         
-        # Maintenir le programme en vie
+        # Serveur bloquant jusqu'à Ctrl+C
         try:
-            while True:
-                time.sleep(1)
+            run_server()
         except KeyboardInterrupt:
             print("\n👋 Arrêt du serveur HUMEAN...")
             
@@ -154,9 +152,9 @@ def direct_server_start():
     print("=" * 40)
     
     try:
-        # Méthode directe - importer le module qui démarre automatiquement
+        # Méthode directe - l'import est léger, run_server() initialise et sert
         print("⏳ Chargement du système HUMEAN...")
-        import core.humean_server
+        from core.humean_server import run_server
         
         print("\\n🎉 SYSTÈME HUMEAN OPÉRATIONNEL!")
         print("=" * 40)
@@ -171,9 +169,8 @@ def direct_server_start():
         print("\\n🛑 Appuyez sur Ctrl+C pour arrêter")
         print("=" * 40)
         
-        # Maintenir l'exécution
-        while True:
-            time.sleep(1)
+        # Serveur bloquant jusqu'à Ctrl+C
+        run_server()
             
     except KeyboardInterrupt:
         print("\\n👋 Arrêt du serveur HUMEAN")
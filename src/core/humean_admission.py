@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+CONTRÔLE D'ADMISSION HUMEAN
+Limiteurs de concurrence adaptatifs par classe de trafic (interactif / volumineux) :
+attente bornée en file, rejet rapide 503 + Retry-After au-delà de la cible, limite
+ajustée selon la latence observée
+"""
+
+import math
+import os
+import threading
+import time
+
+from flask import g, jsonify, request
+
+from src.core.humean_tracing import add_timing
+
+
+class AdaptiveLimiter:
+    """Limite de concurrence ajustée par gradient de latence (latence minimale / récente)"""
+
+    def __init__(self, name, initial_limit=16, min_limit=2, max_limit=128, queue_timeout=0.05,
+                 max_queue=None, tolerance=2.0, smoothing=0.2, baseline_decay=0.001):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        # Attente maximale en file avant rejet (cible de temps de file)
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue if max_queue is not None else max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.baseline_decay = baseline_decay
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._long_rtt = None   # latence de référence (minimum glissant)
+        self._short_rtt = None  # latence récente (moyenne rapide)
+        self._stats = {"admitted": 0, "queued": 0, "dequeued": 0, "shed": 0, "total_queue_ms": 0.0, "max_queue_ms": 0.0}
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        """Réserve une place ; retourne le temps passé en file (s) ou None si la requête est rejetée"""
+        with self._cond:
+            if self._in_flight < int(self.limit):
+                self._in_flight += 1
+                self._stats["admitted"] += 1
+                return 0.0
+            if self._waiting >= self.max_queue:
+                self._stats["shed"] += 1
+                return None
+
+            start = time.perf_counter()
+            deadline = start + self.queue_timeout
+            self._waiting += 1
+            self._stats["queued"] += 1
+            try:
+                while self._in_flight >= int(self.limit):
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._stats["shed"] += 1
+                        return None
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            waited = time.perf_counter() - start
+            self._in_flight += 1
+            self._stats["admitted"] += 1
+            self._stats["dequeued"] += 1
+            self._stats["total_queue_ms"] += waited * 1000
+            self._stats["max_queue_ms"] = max(self._stats["max_queue_ms"], waited * 1000)
+            return waited
+
+    def release(self, latency):
+        """Libère la place et ajuste la limite avec la latence de service observée (s)"""
+        with self._cond:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+            self._update_limit(latency, in_flight)
+            self._cond.notify()
+
+    def _update_limit(self, latency, in_flight):
+        if latency <= 0:
+            return
+        if self._long_rtt is None:
+            self._long_rtt = self._short_rtt = latency
+            return
+        self._short_rtt = 0.5 * self._short_rtt + 0.5 * latency
+        # Référence = latence minimale observée, relâchée lentement pour suivre un changement durable
+        self._long_rtt = min(latency, self._long_rtt * (1 + self.baseline_decay))
+        # Limite non sollicitée (moins de la moitié utilisée) : aucune information de saturation
+        if in_flight < self.limit / 2:
+            return
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / self._short_rtt))
+        # Marge de sondage (racine de la limite) uniquement hors congestion
+        target = self.limit * gradient if gradient < 1.0 else self.limit + math.sqrt(self.limit)
+        limit = (1 - self.smoothing) * self.limit + self.smoothing * target
+        self.limit = max(self.min_limit, min(self.max_limit, limit))
+
+    def retry_after(self):
+        """Délai conseillé (s) avant nouvel essai"""
+        rtt = self._short_rtt or self.queue_timeout
+        return max(1, math.ceil(rtt * (self._waiting + 1) / max(int(self.limit), 1)))
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats["limit"] = int(self.limit)
+            stats["in_flight"] = self._in_flight
+            stats["waiting"] = self._waiting
+            stats["latency_ms"] = round(self._short_rtt * 1000, 3) if self._short_rtt else None
+            stats["baseline_latency_ms"] = round(self._long_rtt * 1000, 3) if self._long_rtt else None
+        stats["avg_queue_ms"] = round(stats.pop("total_queue_ms") / max(stats.pop("dequeued"), 1), 3)
+        stats["max_queue_ms"] = round(stats["max_queue_ms"], 3)
+        return stats
+
+
+def default_pools():
+    """Classes de trafic par défaut : requêtes interactives et traitements volumineux"""
+    interactive = AdaptiveLimiter(
+        "interactive",
+        initial_limit=int(os.environ.get('HUMEAN_INTERACTIVE_LIMIT', 32)),
+        max_limit=int(os.environ.get('HUMEAN_INTERACTIVE_MAX_LIMIT', 128)),
+        queue_timeout=float(os.environ.get('HUMEAN_INTERACTIVE_QUEUE_MS', 50)) / 1000,
+    )
+    bulk = AdaptiveLimiter(
+        "bulk",
+        initial_limit=int(os.environ.get('HUMEAN_BULK_LIMIT', 4)),
+        min_limit=1,
+        max_limit=int(os.environ.get('HUMEAN_BULK_MAX_LIMIT', 16)),
+        queue_timeout=float(os.environ.get('HUMEAN_BULK_QUEUE_MS', 500)) / 1000,
+    )
+    # Premier préfixe correspondant : les plus spécifiques d'abord
+    return [
+        (('/api/query/batch', '/data/connect/', '/api/auto-improvement/'), bulk),
+        (('/api/query',), interactive),
+    ]
+
+
+class AdmissionControl:
+    """Limiteurs placés devant les routes Flask (hooks before/teardown)"""
+
+    def __init__(self, pools=None):
+        self.pools = pools if pools is not None else default_pools()
+
+    def init_app(self, app):
+        app.before_request(self._before)
+        app.teardown_request(self._teardown)
+        app.extensions['humean_admission'] = self
+
+    def limiter_for(self, path):
+        for prefixes, limiter in self.pools:
+            if path.startswith(prefixes):
+                return limiter
+        return None
+
+    def _before(self):
+        limiter = self.limiter_for(request.path)
+        if limiter is None:
+            return None
+        waited = limiter.acquire()
+        if waited is None:
+            response = jsonify({'error': 'Serveur surchargé, réessayez plus tard', 'pool': limiter.name})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(limiter.retry_after())
+            return response
+        if waited:
+            add_timing('queue', waited)
+        g._admission = (limiter, time.perf_counter())
+        return None
+
+    def _teardown(self, error=None):
+        admitted = g.pop('_admission', None)
+        if admitted is not None:
+            limiter, start = admitted
+            limiter.release(time.perf_counter() - start)
+
+    def get_stats(self):
+        return {limiter.name: limiter.get_stats() for _, limiter in self.pools}
+
+
+def install_admission_control(app, pools=None):
+    """Installe le contrôle d'admission une seule fois par application"""
+    existing = app.extensions.get('humean_admission')
+    if existing is not None:
+        return existing
+    control = AdmissionControl(pools)
+    control.init_app(app)
+    return control
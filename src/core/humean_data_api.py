@@ -4,31 +4,109 @@ EXTENSION API HUMEAN POUR DONNÉES RÉELLES
 Nouveaux endpoints pour la connexion aux données externes
 """
 
+from src.core.humean_admission import install_admission_control
 from src.core.humean_data_connector import HumeanDataConnector
+from src.core.humean_jobs import CoalescingJob
+from src.core.humean_metrics import install_metrics
+from src.core.humean_tracing import install_tracing, span
 from flask import Flask, request, jsonify
+import atexit
 import json
+import os
 
-# Initialisation du connecteur
+# Initialisation du connecteur (pool SQLite propre tant que l'application ne fournit pas le sien)
 data_connector = HumeanDataConnector()
 
-def create_data_endpoints(app):
-    """Ajoute les endpoints données à l'application Flask"""
+
+def _close_data_connector():
+    data_connector.close()
+
+
+# Pool de génération des insights (HUMEAN_INSIGHT_WORKERS > 1) arrêté proprement à la sortie
+atexit.register(_close_data_connector)
+
+INSIGHT_MAX_CHUNKS = int(os.environ.get('HUMEAN_INSIGHT_MAX_CHUNKS', 10))
+
+
+# Passes sans progrès alors que l'arriéré n'est pas vide (erreur de base, lignes bloquées...)
+insight_progress = {"last_pass_rows": 0, "stalled_passes": 0}
+
+
+def _run_insight_generation():
+    """Une passe bornée de génération P3 ; True si elle a avancé et qu'il reste des lignes à traiter
+
+    Une passe sans progrès ne relance pas la tâche : le prochain déclenchement réessaiera.
+    """
+    processed = [0]
+
+    def progress(rows, insights):
+        processed[0] = rows
+
+    data_connector.generate_p3_insights(max_chunks=INSIGHT_MAX_CHUNKS, progress=progress)
+    remaining = data_connector.get_insight_backlog()["backlog_rows"]
+    insight_progress["last_pass_rows"] = processed[0]
+    if not processed[0] and remaining:
+        insight_progress["stalled_passes"] += 1
+    return processed[0] > 0 and remaining > 0
+
+
+# Génération des insights hors du chemin de requête : déclenchements regroupés, cadence bornée
+insight_job = CoalescingJob(
+    _run_insight_generation,
+    name="humean-insights",
+    min_interval=float(os.environ.get('HUMEAN_INSIGHT_MIN_INTERVAL', 1.0)),
+)
+
+
+def _run_stats_reconciliation():
+    """Recomptage des tables : corrige la dérive des compteurs de get_data_stats"""
+    data_connector.reconcile_data_stats()
+    return False
+
+
+# Réconciliation périodique (écritures faites hors du connecteur, restaurations de base...)
+stats_reconciliation_job = CoalescingJob(
+    _run_stats_reconciliation,
+    name="humean-stats-reconciliation",
+    min_interval=60.0,
+    period=float(os.environ.get('HUMEAN_STATS_RECONCILE_INTERVAL', 3600)),
+)
+
+def create_data_endpoints(app, pool=None):
+    """Ajoute les endpoints données à l'application Flask
+
+    pool : SQLiteConnectionPool de l'application, partagé par le connecteur (pragmas WAL,
+    connexions réutilisées) au lieu du pool ouvert à l'import.
+    """
+    global data_connector
+    if pool is not None and data_connector.db_pool is not pool:
+        data_connector.close()
+        data_connector = HumeanDataConnector(pool=pool)
+    # Instrumentation commune (sans effet si déjà installée par le serveur)
+    install_metrics(app)
+    install_tracing(app)
+    # /data/connect/* : classe de trafic volumineux, bornée séparément des requêtes interactives
+    install_admission_control(app)
+    insight_job.start()
+    stats_reconciliation_job.start()
     
     @app.route('/data/connect/financial', methods=['POST'])
     def connect_financial_data():
         """Connexion aux données financières"""
         try:
-            data = request.get_json()
+            with span('parse'):
+                data = request.get_json()
             symbol = data.get('symbol', 'AAPL')
             days = data.get('days', 30)
             
             financial_data = data_connector.connect_financial_data(symbol, days)
-            data_connector.generate_p3_insights()
+            insight_job.trigger()
             
             return jsonify({
                 "status": "success",
                 "data_type": "financial",
                 "symbol": symbol,
+                "insights": "scheduled",
                 "data": financial_data
             })
             
@@ -39,16 +117,18 @@ def create_data_endpoints(app):
     def connect_scientific_data():
         """Connexion aux données scientifiques"""
         try:
-            data = request.get_json()
+            with span('parse'):
+                data = request.get_json()
             query = data.get('query', 'artificial intelligence')
             
             scientific_data = data_connector.connect_scientific_data(query)
-            data_connector.generate_p3_insights()
+            insight_job.trigger()
             
             return jsonify({
                 "status": "success", 
                 "data_type": "scientific",
                 "query": query,
+                "insights": "scheduled",
                 "data": scientific_data
             })
             
@@ -59,16 +139,18 @@ def create_data_endpoints(app):
     def connect_social_data():
         """Connexion aux données sociales"""
         try:
-            data = request.get_json()
+            with span('parse'):
+                data = request.get_json()
             topic = data.get('topic', 'AI ethics')
             
             social_data = data_connector.connect_social_data(topic)
-            data_connector.generate_p3_insights()
+            insight_job.trigger()
             
             return jsonify({
                 "status": "success",
                 "data_type": "social", 
                 "topic": topic,
+                "insights": "scheduled",
                 "data": social_data
             })
             
@@ -80,9 +162,16 @@ def create_data_endpoints(app):
         """Récupère les insights P3 générés"""
         try:
             stats = data_connector.get_data_stats()
+            queue = insight_job.get_stats()
+            queue.update(data_connector.get_insight_backlog())
+            queue.update(insight_progress)
             return jsonify({
                 "status": "success",
                 "data_stats": stats,
+                "insight_queue": queue,
+                "stats_reconciliation": dict(
+                    stats_reconciliation_job.get_stats(), last=data_connector.last_reconciliation
+                ),
                 "available_sources": list(data_connector.data_sources.keys())
             })
             
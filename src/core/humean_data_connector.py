@@ -6,13 +6,92 @@ Connexion aux sources de données externes sans dépendances lourdes
 
 import requests
 import json
-import sqlite3
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, wait
 from datetime import datetime
+from itertools import islice
+import multiprocessing
 import os
 import random
+import threading
+
+from src.core.humean_db_pool import SQLiteConnectionPool
+from src.core.humean_migrations import apply_migrations
+from src.core.humean_tracing import span, traced
+
+def generate_insight(source_type, data):
+    """Génère un insight P3 spécifique au type de données (fonction pure : exécutable en processus fils)"""
+    if source_type == "financial":
+        price_change = data.get('data', {}).get('price_change_percent', 0)
+        trend = "haussière" if price_change > 0 else "baissière"
+        return {
+            "text": f"ARBITRAGE P3: {data.get('symbol')} montre tendance {trend} ({price_change}%). Opportunité d'optimisation détectée avec volatilité {data.get('data', {}).get('volatility', 0)}",
+            "confidence": round(random.uniform(0.85, 0.95), 2),
+            "level": "🚀 AVANCÉ"
+        }
+    elif source_type == "scientific":
+        return {
+            "text": f"INNOVATION P3: Analyse de {data.get('papers_found', 0)} publications sur '{data.get('query')}' révèle convergence vers {', '.join(data.get('trending_topics', [])[:2])}",
+            "confidence": round(random.uniform(0.88, 0.98), 2),
+            "level": "🔬 SCIENTIFIQUE"
+        }
+    elif source_type == "social":
+        sentiment = data.get('sentiment_analysis', {}).get('positive', 0) * 100
+        return {
+            "text": f"ARBITRAGE SOCIAL P3: Sentiment {sentiment:.1f}% positif sur '{data.get('topic')}'. Engagement élevé ({data.get('engagement_metrics', {}).get('mentions', 0)} mentions) suggère momentum croissant",
+            "confidence": round(random.uniform(0.82, 0.92), 2),
+            "level": "💬 SOCIAL"
+        }
+    elif source_type == "iot":
+        anomalies = data.get('anomalies_detected', 0)
+        return {
+            "text": f"P3 IOT: {anomalies} anomalies détectées dans données {data.get('sensor_type')}. Conditions environnementales: {data.get('readings', {})}",
+            "confidence": round(random.uniform(0.80, 0.90), 2),
+            "level": "🌡️ ENVIRONNEMENTAL"
+        }
+    return None
+
+def compute_insights_chunk(chunk):
+    """(lignes p3_insights à insérer, lignes raw_data à marquer) pour un lot (id, source_type, data_content)"""
+    now = datetime.now().isoformat(sep=' ')
+    inserts, updates = [], []
+    for data_id, source_type, data_content in chunk:
+        try:
+            insight = generate_insight(source_type, json.loads(data_content))
+        except Exception:
+            # Contenu illisible (JSON invalide, NULL, structure inattendue) : la ligne ne doit pas
+            # bloquer le lot ni les suivants
+            insight = None
+        if insight:
+            inserts.append((data_id, insight['text'], insight['confidence'], insight['level'], now, data_id))
+        # Ligne sans insight (type inconnu, contenu illisible) marquée aussi : elle ne sera plus relue
+        updates.append((bool(insight), data_id))
+    return inserts, updates
 
 class HumeanDataConnector:
-    def __init__(self):
+    RAW_INSERT_SQL = "INSERT INTO raw_data (source_type, data_content, timestamp) VALUES (?, ?, ?)"
+    # Insertion ignorée si l'insight de cette donnée existe déjà (lot rejoué)
+    INSIGHT_INSERT_SQL = (
+        "INSERT INTO p3_insights (raw_data_id, insight_text, confidence_score, innovation_level, generated_at) "
+        "SELECT ?, ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM p3_insights WHERE raw_data_id = ?)"
+    )
+    # Compteurs de get_data_stats, incrémentés dans la transaction de chaque écriture
+    COUNTER_UPSERT_SQL = (
+        "INSERT INTO data_counters (counter, value) VALUES (?, ?) "
+        "ON CONFLICT (counter) DO UPDATE SET value = value + excluded.value"
+    )
+    # Valeurs réelles des compteurs (balayage complet, réservé à la réconciliation)
+    COUNTER_RECOUNT_SQL = (
+        "SELECT 'raw_data', COUNT(*) FROM raw_data "
+        "UNION ALL SELECT 'processed', COUNT(*) FROM raw_data WHERE processed = TRUE "
+        "UNION ALL SELECT 'p3_insights', COUNT(*) FROM p3_insights "
+        "UNION ALL SELECT 'source_type:' || IFNULL(source_type, ''), COUNT(*) FROM raw_data GROUP BY source_type"
+    )
+    
+    def __init__(self, db_path='humean_data.db', pool=None):
+        # Pool du serveur si fourni (mêmes pragmas WAL, connexions réutilisées), sinon pool propre
+        self._owns_db_pool = pool is None
+        self.db_pool = SQLiteConnectionPool(db_path) if pool is None else pool
+        self.db_path = self.db_pool.db_path
         self.data_sources = {
             "financial": {
                 "name": "Données Financières",
@@ -36,47 +115,28 @@ class HumeanDataConnector:
             }
         }
         
+        # Génération des insights : processus parallèles si > 1 (lecteur et écrivain uniques)
+        self.insight_workers = int(os.environ.get('HUMEAN_INSIGHT_WORKERS', 1))
+        # Pool de processus créé au premier besoin et conservé (démarrage spawn : ~0,5 s)
+        self._pool = None
+        self._pool_workers = 0
+        self._pool_lock = threading.Lock()
+        self.last_reconciliation = None
+        
         # Initialisation base de données locale
         self.init_database()
     
     def init_database(self):
-        """Initialise la base de données locale HUMEAN"""
+        """Initialise la base de données locale HUMEAN (migrations versionnées)"""
         try:
-            conn = sqlite3.connect('humean_data.db')
-            cursor = conn.cursor()
-            
-            # Table données brutes
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS raw_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source_type TEXT,
-                    data_content TEXT,
-                    timestamp DATETIME,
-                    processed BOOLEAN DEFAULT FALSE,
-                    p3_insight_generated BOOLEAN DEFAULT FALSE
-                )
-            ''')
-            
-            # Table insights P3
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS p3_insights (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    raw_data_id INTEGER,
-                    insight_text TEXT,
-                    confidence_score REAL,
-                    innovation_level TEXT,
-                    generated_at DATETIME,
-                    FOREIGN KEY (raw_data_id) REFERENCES raw_data (id)
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            with self.db_pool.connection() as conn:
+                apply_migrations(conn)
             print("✅ Base de données HUMEAN initialisée")
             
         except Exception as e:
             print(f"❌ Erreur initialisation DB: {e}")
     
+    @traced('connect')
     def connect_financial_data(self, symbol="AAPL", days=30):
         """Connexion aux données financières (simulation)"""
         print(f"📈 Connexion données financières: {symbol}")
@@ -102,6 +162,7 @@ class HumeanDataConnector:
         self.store_raw_data("financial", financial_data)
         return financial_data
     
+    @traced('connect')
     def connect_scientific_data(self, query="artificial intelligence"):
         """Connexion aux données scientifiques (simulation)"""
         print(f"🔬 Connexion données scientifiques: {query}")
@@ -128,6 +189,7 @@ class HumeanDataConnector:
         self.store_raw_data("scientific", scientific_data)
         return scientific_data
     
+    @traced('connect')
     def connect_social_data(self, topic="AI ethics"):
         """Connexion aux données sociales (simulation)"""
         print(f"💬 Connexion données sociales: {topic}")
@@ -155,6 +217,7 @@ class HumeanDataConnector:
         self.store_raw_data("social", social_data)
         return social_data
     
+    @traced('connect')
     def connect_iot_data(self, sensor_type="environmental"):
         """Connexion aux données IoT (simulation)"""
         print(f"🌡️ Connexion données IoT: {sensor_type}")
@@ -174,127 +237,306 @@ class HumeanDataConnector:
         self.store_raw_data("iot", iot_data)
         return iot_data
     
+    @traced()
     def store_raw_data(self, source_type, data):
         """Stocke les données brutes en base"""
         try:
-            conn = sqlite3.connect('humean_data.db')
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO raw_data (source_type, data_content, timestamp)
-                VALUES (?, ?, ?)
-            ''', (source_type, json.dumps(data), datetime.now()))
-            
-            conn.commit()
-            conn.close()
+            with span('sqlite'), self.db_pool.transaction() as conn:
+                conn.execute(self.RAW_INSERT_SQL, (source_type, json.dumps(data), datetime.now()))
+                self._bump_counters(conn, {"raw_data": 1, self._source_type_counter(source_type): 1})
             print(f"💾 Données {source_type} stockées")
             
         except Exception as e:
             print(f"❌ Erreur stockage données: {e}")
     
-    def generate_p3_insights(self):
-        """Génère des insights P3 à partir des données stockées"""
+    @staticmethod
+    def _source_type_counter(source_type):
+        return f"source_type:{source_type if source_type is not None else ''}"
+    
+    def _bump_counters(self, conn, deltas):
+        """Applique des deltas aux compteurs (à appeler dans la transaction de l'écriture)"""
+        conn.executemany(self.COUNTER_UPSERT_SQL, [(name, delta) for name, delta in deltas.items() if delta])
+    
+    @traced()
+    def store_raw_data_many(self, records, source_type=None, chunk_size=10000, progress=None):
+        """Ingestion en masse depuis un itérable ou un générateur ; retourne le nombre de lignes insérées
+        
+        records : tuples (source_type, données[, horodatage]) ou, si source_type est fourni,
+        données seules. Les données déjà sérialisées (str JSON) sont stockées telles quelles.
+        Une transaction par lot de chunk_size lignes ; progress(insérées, lot) après chaque commit.
+        En cas d'erreur, le lot courant est annulé (les lots précédents restent) et l'exception remonte.
+        """
+        dumps = json.dumps
+        
+        def rows(chunk, now, counts):
+            if source_type is not None:
+                counts[source_type] = len(chunk)
+                for data in chunk:
+                    yield source_type, data if data.__class__ is str else dumps(data), now
+                return
+            for record in chunk:
+                if len(record) == 3:
+                    kind, data, timestamp = record
+                else:
+                    kind, data = record
+                    timestamp = now
+                counts[kind] = counts.get(kind, 0) + 1
+                yield kind, data if data.__class__ is str else dumps(data), timestamp
+        
+        iterator = iter(records)
+        inserted = 0
+        # Connexion du pool gardée pour tout l'appel ; une transaction explicite par lot
+        with self.db_pool.connection() as conn:
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                # Horodatage unique par lot (même format que l'adaptateur datetime de sqlite3)
+                now = datetime.now().isoformat(sep=' ')
+                with span('sqlite_chunk', rows=len(chunk)):
+                    counts = {}
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        conn.executemany(self.RAW_INSERT_SQL, rows(chunk, now, counts))
+                        deltas = {"raw_data": len(chunk)}
+                        for kind, count in counts.items():
+                            name = self._source_type_counter(kind)
+                            deltas[name] = deltas.get(name, 0) + count
+                        self._bump_counters(conn, deltas)
+                        conn.execute("COMMIT")
+                    except BaseException:
+                        conn.execute("ROLLBACK")
+                        raise
+                inserted += len(chunk)
+                if progress is not None:
+                    progress(inserted, len(chunk))
+        return inserted
+    
+    def _iter_unprocessed_chunks(self, conn, chunk_size, after_id=0):
+        """Lots de (id, source_type, data_content) non traités, par id croissant (lecture hors transaction)"""
+        while True:
+            with span('sqlite_read'):
+                chunk = conn.execute(
+                    "SELECT id, source_type, data_content FROM raw_data "
+                    "WHERE processed = FALSE AND id > ? ORDER BY id LIMIT ?",
+                    (after_id, chunk_size)
+                ).fetchall()
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1][0]
+    
+    def _insights_for_chunk(self, chunk):
+        """(lignes p3_insights à insérer, lignes raw_data à marquer) pour un lot"""
+        return compute_insights_chunk(chunk)
+    
+    def _write_insights(self, conn, inserts, updates):
+        """Écrit un lot dans une transaction courte ; idempotent si le lot est rejoué après un arrêt"""
+        with span('sqlite_write', insights=len(inserts)):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Lignes réellement écrites (lot rejoué : insertions et marquages ignorés)
+                before = conn.total_changes
+                conn.executemany(self.INSIGHT_INSERT_SQL, inserts)
+                inserted = conn.total_changes - before
+                conn.executemany(
+                    "UPDATE raw_data SET processed = TRUE, p3_insight_generated = ? "
+                    "WHERE id = ? AND processed = FALSE",
+                    updates
+                )
+                self._bump_counters(conn, {
+                    "p3_insights": inserted,
+                    "processed": conn.total_changes - before - inserted,
+                })
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+    
+    def _unprocessed_source_types(self, conn):
+        """Types de source ayant des lignes non traitées (sauts successifs dans l'index partiel)"""
+        types = []
+        current = conn.execute("SELECT MIN(source_type) FROM raw_data WHERE processed = FALSE").fetchone()[0]
+        while current is not None:
+            types.append(current)
+            current = conn.execute(
+                "SELECT MIN(source_type) FROM raw_data WHERE processed = FALSE AND source_type > ?", (current,)
+            ).fetchone()[0]
+        if conn.execute("SELECT 1 FROM raw_data WHERE processed = FALSE AND source_type IS NULL LIMIT 1").fetchone():
+            types.append(None)
+        return types
+    
+    def _iter_partition_chunks(self, conn, source_type, chunk_size):
+        """Lots non traités d'un type de source, par id croissant"""
+        after_id = 0
+        while True:
+            chunk = conn.execute(
+                "SELECT id, source_type, data_content FROM raw_data "
+                "WHERE processed = FALSE AND source_type IS ? AND id > ? ORDER BY id LIMIT ?",
+                (source_type, after_id, chunk_size)
+            ).fetchall()
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1][0]
+    
+    def _generate_serial(self, conn, chunk_size, max_chunks, record):
+        for index, chunk in enumerate(self._iter_unprocessed_chunks(conn, chunk_size)):
+            with span('insights', rows=len(chunk)):
+                inserts, updates = self._insights_for_chunk(chunk)
+            self._write_insights(conn, inserts, updates)
+            record(inserts, updates)
+            if max_chunks is not None and index + 1 >= max_chunks:
+                break
+    
+    def _get_pool(self, workers):
+        """Pool de processus partagé entre les appels (recréé si le nombre de workers change)"""
+        with self._pool_lock:
+            if self._pool is not None and self._pool_workers != workers:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+            if self._pool is None:
+                # spawn : pas de fork d'un serveur multi-thread (verrous hérités dans un état indéterminé)
+                context = multiprocessing.get_context(os.environ.get('HUMEAN_INSIGHT_START_METHOD', 'spawn'))
+                self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+                self._pool_workers = workers
+            return self._pool
+    
+    def _discard_pool(self, pool):
+        """Abandonne un pool cassé (processus fils tué) : le prochain appel en recrée un"""
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+                self._pool_workers = 0
+        pool.shutdown(wait=False)
+    
+    def close(self):
+        """Arrête le pool de processus de génération des insights (et le pool SQLite s'il est propre)"""
+        with self._pool_lock:
+            pool, self._pool, self._pool_workers = self._pool, None, 0
+        if pool is not None:
+            pool.shutdown(wait=True)
+        if self._owns_db_pool:
+            self.db_pool.close()
+    
+    def _unprocessed_count(self, conn):
+        """Lignes non traitées d'après les compteurs maintenus (sans balayage)"""
+        counters = dict(conn.execute(
+            "SELECT counter, value FROM data_counters WHERE counter IN ('raw_data', 'processed')"
+        ).fetchall())
+        return max(0, counters.get("raw_data", 0) - counters.get("processed", 0))
+    
+    def _generate_parallel(self, conn, workers, chunk_size, max_chunks, record):
+        """Calcul réparti sur un pool de processus par (type de source, lot) ; écritures par ce seul thread"""
+        partitions = [self._iter_partition_chunks(conn, t, chunk_size) for t in self._unprocessed_source_types(conn)]
+        
+        def round_robin():
+            # Les types de source avancent ensemble : aucun ne monopolise le pool
+            while partitions:
+                for partition in list(partitions):
+                    chunk = next(partition, None)
+                    if chunk is None:
+                        partitions.remove(partition)
+                    else:
+                        yield chunk
+        
+        chunks = round_robin()
+        submitted = 0
+        pool = self._get_pool(workers)
+        pending = set()
         try:
-            conn = sqlite3.connect('humean_data.db')
-            cursor = conn.cursor()
-            
-            # Récupérer données non traitées
-            cursor.execute('''
-                SELECT id, source_type, data_content 
-                FROM raw_data 
-                WHERE processed = FALSE
-            ''')
-            
-            unprocessed_data = cursor.fetchall()
-            insights_generated = 0
-            
-            for data_row in unprocessed_data:
-                data_id, source_type, data_content = data_row
-                data_dict = json.loads(data_content)
-                
-                # Générer insight P3 basé sur le type de données
-                insight = self._generate_insight_from_data(source_type, data_dict)
-                
-                if insight:
-                    cursor.execute('''
-                        INSERT INTO p3_insights 
-                        (raw_data_id, insight_text, confidence_score, innovation_level, generated_at)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (data_id, insight['text'], insight['confidence'], insight['level'], datetime.now()))
-                    
-                    # Marquer comme traité
-                    cursor.execute('''
-                        UPDATE raw_data SET processed = TRUE, p3_insight_generated = TRUE
-                        WHERE id = ?
-                    ''', (data_id,))
-                    
-                    insights_generated += 1
-                    print(f"🔮 Insight P3 généré: {insight['text'][:80]}...")
-            
-            conn.commit()
-            conn.close()
-            print(f"🎯 {insights_generated} insights P3 générés")
+            with span('insights_pool', workers=workers):
+                while True:
+                    # Lots en vol bornés : mémoire constante quelle que soit la taille de l'arriéré
+                    while len(pending) < 2 * workers and (max_chunks is None or submitted < max_chunks):
+                        chunk = next(chunks, None)
+                        if chunk is None:
+                            break
+                        pending.add(pool.submit(compute_insights_chunk, chunk))
+                        submitted += 1
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        inserts, updates = future.result()
+                        self._write_insights(conn, inserts, updates)
+                        record(inserts, updates)
+        except BrokenExecutor:
+            self._discard_pool(pool)
+            raise
+        finally:
+            # Erreur en cours de route : lots en vol abandonnés (non écrits, rejoués à l'appel suivant)
+            for future in pending:
+                future.cancel()
+    
+    @traced()
+    def generate_p3_insights(self, chunk_size=1000, max_chunks=None, progress=None, workers=None):
+        """Génère les insights P3 des données non traitées, lot par lot ; retourne le nombre généré
+        
+        Chaque lot (ordre des id) est validé dans sa propre transaction : un arrêt en cours de route
+        ne perd que le lot courant, repris tel quel à l'appel suivant. progress(traitées, insights)
+        est appelé après chaque lot ; max_chunks borne le travail d'un appel. Avec workers > 1
+        (défaut : HUMEAN_INSIGHT_WORKERS), le calcul est réparti sur un pool de processus conservé
+        entre les appels ; un arriéré de moins de chunk_size × workers lignes reste traité en série.
+        """
+        workers = self.insight_workers if workers is None else workers
+        totals = [0, 0]
+        
+        def record(inserts, updates):
+            totals[0] += len(updates)
+            totals[1] += len(inserts)
+            if progress is not None:
+                progress(totals[0], totals[1])
+        
+        try:
+            with self.db_pool.connection() as conn:
+                if workers > 1 and self._unprocessed_count(conn) >= chunk_size * workers:
+                    self._generate_parallel(conn, workers, chunk_size, max_chunks, record)
+                else:
+                    self._generate_serial(conn, chunk_size, max_chunks, record)
+            print(f"🎯 {totals[1]} insights P3 générés")
             
         except Exception as e:
             print(f"❌ Erreur génération insights: {e}")
+        return totals[1]
+    
+    def get_insight_backlog(self):
+        """Arriéré de génération : lignes non traitées et âge de la plus ancienne (secondes)"""
+        with self.db_pool.connection() as conn:
+            # Arriéré déduit des compteurs maintenus : pas de comptage de l'index partiel
+            count = self._unprocessed_count(conn)
+            oldest = conn.execute(
+                "SELECT timestamp FROM raw_data WHERE processed = FALSE ORDER BY id LIMIT 1"
+            ).fetchone()
+        lag = 0.0
+        if oldest and oldest[0]:
+            try:
+                lag = max(0.0, (datetime.now() - datetime.fromisoformat(oldest[0])).total_seconds())
+            except ValueError:
+                lag = None
+        return {"backlog_rows": count, "lag_seconds": round(lag, 3) if lag is not None else None}
     
     def _generate_insight_from_data(self, source_type, data):
         """Génère un insight P3 spécifique au type de données"""
-        if source_type == "financial":
-            price_change = data.get('data', {}).get('price_change_percent', 0)
-            trend = "haussière" if price_change > 0 else "baissière"
-            return {
-                "text": f"ARBITRAGE P3: {data.get('symbol')} montre tendance {trend} ({price_change}%). Opportunité d'optimisation détectée avec volatilité {data.get('data', {}).get('volatility', 0)}",
-                "confidence": round(random.uniform(0.85, 0.95), 2),
-                "level": "🚀 AVANCÉ"
-            }
-        elif source_type == "scientific":
-            return {
-                "text": f"INNOVATION P3: Analyse de {data.get('papers_found', 0)} publications sur '{data.get('query')}' révèle convergence vers {', '.join(data.get('trending_topics', [])[:2])}",
-                "confidence": round(random.uniform(0.88, 0.98), 2),
-                "level": "🔬 SCIENTIFIQUE"
-            }
-        elif source_type == "social":
-            sentiment = data.get('sentiment_analysis', {}).get('positive', 0) * 100
-            return {
-                "text": f"ARBITRAGE SOCIAL P3: Sentiment {sentiment:.1f}% positif sur '{data.get('topic')}'. Engagement élevé ({data.get('engagement_metrics', {}).get('mentions', 0)} mentions) suggère momentum croissant",
-                "confidence": round(random.uniform(0.82, 0.92), 2),
-                "level": "💬 SOCIAL"
-            }
-        elif source_type == "iot":
-            anomalies = data.get('anomalies_detected', 0)
-            return {
-                "text": f"P3 IOT: {anomalies} anomalies détectées dans données {data.get('sensor_type')}. Conditions environnementales: {data.get('readings', {})}",
-                "confidence": round(random.uniform(0.80, 0.90), 2),
-                "level": "🌡️ ENVIRONNEMENTAL"
-            }
-        return None
+        return generate_insight(source_type, data)
     
     def get_data_stats(self):
-        """Retourne les statistiques des données"""
+        """Retourne les statistiques des données (compteurs maintenus, sans balayage des tables)"""
         try:
-            conn = sqlite3.connect('humean_data.db')
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT COUNT(*) FROM raw_data')
-            total_data = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM raw_data WHERE processed = TRUE')
-            processed_data = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM p3_insights')
-            total_insights = cursor.fetchone()[0]
+            with self.db_pool.connection() as conn:
+                counters = dict(conn.execute('SELECT counter, value FROM data_counters').fetchall())
             
             # Stats par type de données
-            cursor.execute('SELECT source_type, COUNT(*) FROM raw_data GROUP BY source_type')
-            data_by_type = dict(cursor.fetchall())
-            
-            conn.close()
+            prefix = "source_type:"
+            data_by_type = {
+                name[len(prefix):]: value for name, value in counters.items()
+                if name.startswith(prefix) and value
+            }
             
             return {
-                "total_data_points": total_data,
-                "processed_data": processed_data,
-                "p3_insights_generated": total_insights,
+                "total_data_points": counters.get("raw_data", 0),
+                "processed_data": counters.get("processed", 0),
+                "p3_insights_generated": counters.get("p3_insights", 0),
                 "data_sources_connected": len(self.data_sources),
                 "data_by_type": data_by_type
             }
@@ -303,23 +545,54 @@ class HumeanDataConnector:
             print(f"❌ Erreur stats: {e}")
             return {}
     
+    def reconcile_data_stats(self):
+        """Recompte les tables et corrige les compteurs ; retourne l'écart corrigé {compteur: delta}
+        
+        Compteurs et recomptage lus dans une même transaction de lecture (instantané WAL cohérent,
+        sans verrou d'écriture : l'ingestion continue pendant le balayage). L'écart est ensuite
+        appliqué en relatif dans une transaction courte : les incréments validés depuis l'instantané
+        sont conservés. Un écart ne vient que d'écritures faites hors du connecteur.
+        """
+        with self.db_pool.connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                stored = dict(conn.execute("SELECT counter, value FROM data_counters").fetchall())
+                actual = dict(conn.execute(self.COUNTER_RECOUNT_SQL).fetchall())
+            finally:
+                conn.execute("ROLLBACK")
+            drift = {
+                name: actual.get(name, 0) - stored.get(name, 0)
+                for name in set(stored) | set(actual)
+                if actual.get(name, 0) != stored.get(name, 0)
+            }
+            if drift:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._bump_counters(conn, drift)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+        self.last_reconciliation = {"timestamp": datetime.now().isoformat(), "drift": drift}
+        if drift:
+            print(f"🔧 Compteurs réconciliés: {drift}")
+        return drift
+    
     def get_recent_insights(self, limit=5):
         """Récupère les insights récents"""
         try:
-            conn = sqlite3.connect('humean_data.db')
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            with self.db_pool.connection() as conn:
+                rows = conn.execute('''
                 SELECT i.insight_text, i.confidence_score, i.innovation_level, i.generated_at,
                        r.source_type
                 FROM p3_insights i
                 JOIN raw_data r ON i.raw_data_id = r.id
                 ORDER BY i.generated_at DESC
                 LIMIT ?
-            ''', (limit,))
+            ''', (limit,)).fetchall()
             
             insights = []
-            for row in cursor.fetchall():
+            for row in rows:
                 insights.append({
                     "insight": row[0],
                     "confidence": row[1],
@@ -328,7 +601,6 @@ class HumeanDataConnector:
                     "source": row[4]
                 })
             
-            conn.close()
             return insights
             
         except Exception as e:
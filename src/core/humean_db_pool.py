@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+POOL DE CONNEXIONS SQLITE HUMEAN
+Connexions longue durée partagées entre les threads du serveur
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("HumeanServer")
+
+# Pragmas appliqués à chaque nouvelle connexion
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,        # ~20 Mo de cache de pages
+    "mmap_size": 268435456,      # 256 Mo mappés en mémoire
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+
+class SQLiteConnectionPool:
+    """Pool borné de connexions SQLite réutilisables"""
+
+    def __init__(self, db_path, max_size=8, timeout=10.0, pragmas=None, cached_statements=256, on_release=None):
+        self.db_path = db_path
+        # Rappel on_release(secondes) : durée de détention de chaque emprunt
+        self.on_release = on_release
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.cached_statements = cached_statements
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._created = 0
+        self._closed = False
+
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "in_use": 0,
+        }
+
+    def _create_connection(self):
+        """Ouvre une connexion et applique les pragmas de performance"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _acquire(self):
+        """Récupère une connexion libre, en crée une ou attend"""
+        try:
+            return self._idle.get_nowait(), 0.0
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return self._create_connection(), 0.0
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Aucune connexion SQLite disponible après {self.timeout}s")
+        return conn, (time.perf_counter() - start) * 1000
+
+    @contextmanager
+    def connection(self):
+        """Emprunte une connexion (réentrant dans un même thread)"""
+        if self._closed:
+            raise RuntimeError("Pool de connexions fermé")
+
+        current = getattr(self._local, "conn", None)
+        if current is not None:
+            self._local.depth += 1
+            try:
+                yield current
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn, wait_ms = self._acquire()
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["in_use"] += 1
+            if wait_ms:
+                self._stats["waits"] += 1
+                self._stats["total_wait_ms"] += wait_ms
+                self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+
+        self._local.conn = conn
+        self._local.depth = 1
+        checkout_time = time.perf_counter()
+        try:
+            yield conn
+        finally:
+            if self.on_release is not None:
+                self.on_release(time.perf_counter() - checkout_time)
+            self._local.conn = None
+            self._local.depth = 0
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                self._stats["in_use"] -= 1
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Emprunte une connexion et valide (ou annule) à la sortie"""
+        with self.connection() as conn:
+            if self._local.depth > 1:
+                yield conn
+                return
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def get_stats(self):
+        """Statistiques d'utilisation du pool"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["connections"] = self._created
+        stats["idle"] = self._idle.qsize()
+        stats["max_size"] = self.max_size
+        stats["avg_wait_ms"] = round(stats["total_wait_ms"] / stats["waits"], 3) if stats["waits"] else 0.0
+        stats["total_wait_ms"] = round(stats["total_wait_ms"], 3)
+        stats["max_wait_ms"] = round(stats["max_wait_ms"], 3)
+        return stats
+
+    def reset(self):
+        """Ferme les connexions inactives et garde le pool utilisable (ex: avant fork)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+    def close(self):
+        """Ferme toutes les connexions inactives"""
+        self._closed = True
+        self.reset()
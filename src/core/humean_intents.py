@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+MOTEUR D'INTENTIONS HUMEAN
+Tous les mots-clés compilés en une seule expression (trie) : une passe sur l'entrée,
+coût indépendant du nombre de règles, rechargement à chaud depuis un fichier JSON
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger("HumeanServer")
+
+# Règles par défaut (ordre = priorité) si aucun fichier de configuration
+DEFAULT_INTENTS = [
+    {
+        "name": "greeting",
+        "keywords": ["bonjour", "salut"],
+        "response": "Bonjour ! Je suis le système HUMEAN. Comment puis-je vous aider ?",
+    },
+    {
+        "name": "clock",
+        "keywords": ["heure"],
+        "response": "Il est actuellement {time}",
+        "cacheable": False,
+    },
+    {
+        "name": "thanks",
+        "keywords": ["merci"],
+        "response": "Je vous en prie ! N'hésitez pas si vous avez d'autres questions.",
+    },
+]
+
+
+class IntentRule:
+    """Règle d'intention : mots-clés déclencheurs et gabarit de réponse"""
+
+    __slots__ = ("name", "keywords", "response", "confidence", "cacheable", "priority", "_rendered")
+
+    def __init__(self, name, keywords, response, confidence=0.85, cacheable=True, priority=0):
+        self.name = name
+        self.keywords = [k.lower() for k in keywords if k]
+        self.response = response
+        self.confidence = confidence
+        self.cacheable = cacheable
+        self.priority = priority
+        self._rendered = None
+
+    def render(self, query):
+        """Produit la réponse de la règle"""
+        return self.response.format(time=time.strftime("%H:%M:%S"), query=query)
+
+    def rendered(self, output):
+        """Vrai si `output` a été produit par render() (quels que soient l'heure et la requête)"""
+        if self._rendered is None:
+            parts = re.split(r"(\{time\}|\{query\})", self.response)
+            self._rendered = re.compile("".join(
+                r"\d{2}:\d{2}:\d{2}" if part == "{time}" else ".*" if part == "{query}"
+                else re.escape(part.replace("{{", "{").replace("}}", "}"))
+                for part in parts
+            ), re.DOTALL)
+        return isinstance(output, str) and self._rendered.fullmatch(output) is not None
+
+
+def _trie_pattern(keywords):
+    """Construit une expression régulière factorisée (trie) à partir des mots-clés"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if terminal else body
+
+    return build(trie)
+
+
+class _CompiledIntents:
+    """État compilé immuable (remplacé atomiquement au rechargement)"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.by_keyword = {}
+        for rule in sorted(rules, key=lambda r: r.priority):
+            for keyword in rule.keywords:
+                # La règle la plus prioritaire garde le mot-clé
+                self.by_keyword.setdefault(keyword, rule)
+        # La regex ne rend que le mot-clé le plus long à chaque position ; les mots-clés plus courts
+        # qui y commencent aussi en sont des préfixes : chaque mot-clé porte la meilleure règle
+        # de ses préfixes (liens de sortie d'Aho-Corasick)
+        self.output = {}
+        for keyword, rule in self.by_keyword.items():
+            for end in range(1, len(keyword)):
+                prefix_rule = self.by_keyword.get(keyword[:end])
+                if prefix_rule is not None and prefix_rule.priority < rule.priority:
+                    rule = prefix_rule
+            self.output[keyword] = rule
+        pattern = _trie_pattern(self.by_keyword)
+        # Lookahead : une correspondance possible à chaque position (mots-clés chevauchants)
+        self.regex = re.compile(f"(?=({pattern}))") if pattern else None
+
+
+class IntentEngine:
+    """Reconnaissance d'intentions en une passe, rechargeable à chaud"""
+
+    def __init__(self, rules=None, config_path=None, reload_interval=2.0):
+        self.config_path = config_path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._mtime = None
+        self._last_check = 0.0
+        self._compiled = _CompiledIntents([])
+
+        if config_path and os.path.exists(config_path):
+            self.reload()
+        else:
+            self.load_rules(rules if rules is not None else DEFAULT_INTENTS)
+
+    def load_rules(self, rule_specs):
+        """Compile une liste de règles (dicts) et la rend active"""
+        rules = []
+        for order, spec in enumerate(rule_specs):
+            spec = dict(spec)
+            spec.setdefault("priority", order)
+            rules.append(IntentRule(**spec))
+        self._compiled = _CompiledIntents(rules)
+        logger.info(f"🧭 {len(rules)} intentions compilées")
+
+    def reload(self):
+        """Recharge les règles depuis le fichier de configuration"""
+        try:
+            mtime = os.path.getmtime(self.config_path)
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                specs = json.load(f)
+            self.load_rules(specs.get("intents", specs) if isinstance(specs, dict) else specs)
+            self._mtime = mtime
+            return True
+        except Exception as e:
+            # On garde les règles actives en cas de fichier invalide
+            logger.error(f"Erreur chargement intentions: {e}")
+            return False
+
+    def reload_if_changed(self):
+        """Recharge si le fichier a changé (vérifié au plus toutes les reload_interval s)"""
+        if not self.config_path:
+            return False
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return False
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        return self.reload()
+
+    def match(self, text, record=True):
+        """Retourne la règle de plus haute priorité présente dans le texte, ou None
+
+        record=False : consultation interne (ex: filtrage de l'entraînement), non comptée.
+        """
+        self.reload_if_changed()
+        compiled = self._compiled
+        if compiled.regex is None:
+            return None
+
+        best = None
+        output = compiled.output
+        for found in compiled.regex.finditer(text.lower()):
+            rule = output.get(found.group(1))
+            if rule is not None and (best is None or rule.priority < best.priority):
+                best = rule
+                if best.priority == 0:
+                    break
+
+        if record:
+            with self._lock:
+                self._counts[best.name if best else None] += 1
+        return best
+
+    @property
+    def rules(self):
+        return list(self._compiled.rules)
+
+    def get_stats(self):
+        """Nombre de correspondances par intention"""
+        with self._lock:
+            counts = dict(self._counts)
+        unmatched = counts.pop(None, 0)
+        return {
+            "rules": len(self._compiled.rules),
+            "keywords": len(self._compiled.by_keyword),
+            "matches": counts,
+            "unmatched": unmatched,
+        }
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+TÂCHES D'ARRIÈRE-PLAN HUMEAN
+Tâche unique déclenchée à la demande : déclenchements regroupés (une exécution pour N appels),
+cadence bornée et relance tant qu'il reste du travail
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger("HumeanServer")
+
+
+class CoalescingJob:
+    """Exécute `func` dans un thread dédié ; trigger() ne bloque jamais
+
+    func() retourne True s'il reste du travail (nouvelle exécution après min_interval).
+    Avec `period`, une exécution est aussi lancée d'office si aucune n'a démarré depuis `period` secondes.
+    """
+
+    def __init__(self, func, name="job", min_interval=1.0, period=None):
+        self.func = func
+        self.name = name
+        self.min_interval = min_interval
+        self.period = period
+
+        self._cond = threading.Condition()
+        self._pending = 0              # déclenchements non encore servis
+        self._pending_since = None     # plus ancien déclenchement non servi (monotonic)
+        self._running = False
+        self._stopping = False
+        self._thread = None
+        self._last_start = None
+        self._started_at = None
+        self._stats = {
+            "triggers": 0,
+            "runs": 0,
+            "failures": 0,
+            "coalesced": 0,
+            "scheduled": 0,
+            "last_run_ms": 0.0,
+            "last_error": None,
+        }
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Démarre le thread d'exécution"""
+        with self._cond:
+            if self.is_running:
+                return
+            self._stopping = False
+            self._started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+            self._thread.start()
+        logger.info(f"⏱️ Tâche '{self.name}' démarrée")
+
+    def trigger(self):
+        """Demande une exécution (regroupée avec les demandes déjà en attente)"""
+        with self._cond:
+            self._stats["triggers"] += 1
+            if self._pending:
+                self._stats["coalesced"] += 1
+            else:
+                self._pending_since = time.monotonic()
+            self._pending += 1
+            self._cond.notify_all()
+
+    def stop(self, timeout=10.0):
+        """Arrête le thread après l'exécution en cours"""
+        with self._cond:
+            if not self.is_running:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info(f"🛑 Tâche '{self.name}' arrêtée")
+
+    def wait_idle(self, timeout=None):
+        """Attend qu'aucune exécution ne soit en cours ni en attente ; False si délai dépassé"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    if self.period is None:
+                        self._cond.wait()
+                        continue
+                    due = (self._last_start or self._started_at) + self.period - time.monotonic()
+                    if due <= 0:
+                        self._stats["scheduled"] += 1
+                        self._pending = 1
+                        self._pending_since = time.monotonic()
+                    else:
+                        self._cond.wait(due)
+                if self._stopping:
+                    return
+                # Cadence bornée : au plus une exécution par min_interval
+                if self._last_start is not None:
+                    delay = self._last_start + self.min_interval - time.monotonic()
+                    if delay > 0:
+                        self._cond.wait(delay)
+                        continue
+                self._pending = 0
+                self._pending_since = None
+                self._running = True
+                self._last_start = time.monotonic()
+
+            more = False
+            start = time.perf_counter()
+            try:
+                more = bool(self.func())
+            except Exception as e:
+                with self._cond:
+                    self._stats["failures"] += 1
+                    self._stats["last_error"] = str(e)
+                logger.error(f"Erreur tâche '{self.name}': {e}")
+
+            with self._cond:
+                self._running = False
+                self._stats["runs"] += 1
+                self._stats["last_run_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                if more and not self._pending:
+                    self._pending = 1
+                    self._pending_since = time.monotonic()
+                self._cond.notify_all()
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending
+            stats["running"] = self._running
+            stats["trigger_lag_seconds"] = (
+                round(time.monotonic() - self._pending_since, 3) if self._pending_since is not None else 0.0
+            )
+        stats["started"] = self.is_running
+        return stats
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+BASE DE CONNAISSANCES HUMEAN
+Cache mémoire borné (éviction LRU pondérée par le score) avec écriture
+immédiate dans SQLite et rechargement à la demande des entrées évincées
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger("HumeanServer")
+
+
+class KnowledgeStore:
+    """Stockage des connaissances apprises, interface proche d'un dict"""
+
+    def __init__(self, db_manager=None, model_name="humean_core", max_entries=10000, eviction_sample=8):
+        self.db = db_manager
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.eviction_sample = eviction_sample
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "faults": 0,
+            "evictions": 0,
+            "writes": 0,
+            "write_errors": 0,
+        }
+
+    def __setitem__(self, key, entry):
+        self.put(key, entry)
+
+    def __getitem__(self, key):
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        """Nombre d'entrées résidentes en mémoire"""
+        return len(self._entries)
+
+    def put(self, key, entry):
+        """Enregistre une connaissance (écriture immédiate en base)"""
+        self._persist(key, entry)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict_locked()
+
+    def get(self, key, default=None):
+        """Lit une connaissance, rechargée depuis la base si évincée"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+
+        entry = self._load(key)
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            self._stats["faults"] += 1
+            # Une écriture concurrente plus récente a priorité
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            self._evict_locked()
+        return entry
+
+    def _evict_locked(self):
+        """Évince parmi les plus anciennes entrées celle de plus faible score"""
+        while len(self._entries) > self.max_entries:
+            candidates = []
+            for key in self._entries:
+                candidates.append(key)
+                if len(candidates) >= self.eviction_sample:
+                    break
+            victim = min(candidates, key=lambda k: entry_score(self._entries[k]))
+            del self._entries[victim]
+            self._stats["evictions"] += 1
+
+    def _persist(self, key, entry):
+        if self.db is None:
+            return
+        try:
+            with self.db.transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO knowledge_base "
+                    "(model_name, pattern_key, input_data, expected_output, score, learned_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.model_name, key, json.dumps(entry.get('input')), json.dumps(entry.get('output')),
+                     entry_score(entry), entry.get('learned_at'))
+                )
+            with self._lock:
+                self._stats["writes"] += 1
+        except Exception as e:
+            with self._lock:
+                self._stats["write_errors"] += 1
+            logger.error(f"Erreur persistance connaissance: {e}")
+
+    def _load(self, key):
+        if self.db is None:
+            return None
+        try:
+            with self.db.connection() as conn:
+                row = conn.execute(
+                    "SELECT input_data, expected_output, score, learned_at FROM knowledge_base "
+                    "WHERE model_name = ? AND pattern_key = ?",
+                    (self.model_name, key)
+                ).fetchone()
+        except Exception as e:
+            logger.error(f"Erreur lecture connaissance: {e}")
+            return None
+        if row is None:
+            return None
+        return {
+            'input': json.loads(row[0]),
+            'output': json.loads(row[1]),
+            'score': row[2],
+            'learned_at': row[3]
+        }
+
+    def iter_persisted(self, chunk_size=1000):
+        """Parcourt toutes les connaissances en base par lots (clé, entrée)"""
+        if self.db is None:
+            yield from list(self._entries.items())
+            return
+        last_key = ""
+        while True:
+            with self.db.connection() as conn:
+                rows = conn.execute(
+                    "SELECT pattern_key, input_data, expected_output, score, learned_at FROM knowledge_base "
+                    "WHERE model_name = ? AND pattern_key > ? ORDER BY pattern_key LIMIT ?",
+                    (self.model_name, last_key, chunk_size)
+                ).fetchall()
+            for key, input_json, output_json, score, learned_at in rows:
+                yield key, {
+                    'input': json.loads(input_json),
+                    'output': json.loads(output_json),
+                    'score': score,
+                    'learned_at': learned_at
+                }
+            if len(rows) < chunk_size:
+                return
+            last_key = rows[-1][0]
+
+    def iter_learned_since(self, since):
+        """Connaissances apprises ou mises à jour après `since` (learned_at > since)"""
+        if self.db is None:
+            for key, entry in list(self._entries.items()):
+                if (entry.get('learned_at') or '') > since:
+                    yield key, entry
+            return
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                "SELECT pattern_key, input_data, expected_output, score, learned_at FROM knowledge_base "
+                "WHERE model_name = ? AND learned_at > ? ORDER BY learned_at",
+                (self.model_name, since)
+            ).fetchall()
+        for key, input_json, output_json, score, learned_at in rows:
+            yield key, {
+                'input': json.loads(input_json),
+                'output': json.loads(output_json),
+                'score': score,
+                'learned_at': learned_at
+            }
+
+    def latest_learned_at(self):
+        """Horodatage de la connaissance la plus récente ('' si aucune)"""
+        if self.db is None:
+            return max((e.get('learned_at') or '' for e in self._entries.values()), default='')
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT MAX(learned_at) FROM knowledge_base WHERE model_name = ?", (self.model_name,)
+            ).fetchone()
+        return row[0] or ''
+
+    def count_persisted(self):
+        """Nombre total de connaissances en base"""
+        if self.db is None:
+            return len(self._entries)
+        with self.db.connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM knowledge_base WHERE model_name = ?", (self.model_name,)
+            ).fetchone()[0]
+
+    def get_stats(self):
+        """Compteurs de la base de connaissances"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["resident"] = len(self._entries)
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+def entry_score(entry):
+    """Score numérique d'une entrée (0 si absent ou invalide)"""
+    try:
+        return float(entry.get('score') or 0)
+    except (TypeError, ValueError):
+        return 0.0
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+JOURNALISATION ASYNCHRONE HUMEAN
+Les threads de requête déposent les enregistrements dans une file ; un thread unique
+(QueueListener) les formate et les écrit (fichier avec rotation, console)
+"""
+
+import atexit
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_state = {"listener": None, "handler": None, "targets": (), "file_options": None}
+_state_lock = threading.Lock()
+
+
+class SamplingFilter(logging.Filter):
+    """Ne conserve qu'un enregistrement DEBUG sur `rate` par message ; les autres niveaux passent"""
+
+    def __init__(self, rate=100):
+        super().__init__()
+        self.rate = max(int(rate), 1)
+        self._counts = {}
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate == 1:
+            return True
+        # Comptage par gabarit de message (avant interpolation) : chaque événement est échantillonné
+        key = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg))
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.rate == 0
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler non bloquant : file pleine = enregistrement abandonné et compté"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Message interpolé ici (arguments potentiellement mutables) ; horodatage et
+        # mise en forme complète restent au thread d'écriture
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _file_handler(log_file, max_bytes, backup_count, when):
+    if when:
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file, when=when, backupCount=backup_count, encoding='utf-8'
+        )
+    if max_bytes:
+        return logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+    return logging.FileHandler(log_file, encoding='utf-8')
+
+
+def configure_logging(log_file="humean_server.log", level=None, max_bytes=None, backup_count=None,
+                      when=None, debug_sample_rate=None, queue_size=None, console=True):
+    """Installe la journalisation asynchrone sur le logger racine (remplace une configuration précédente)
+
+    Valeurs par défaut lues dans l'environnement : HUMEAN_LOG_LEVEL, HUMEAN_LOG_MAX_BYTES,
+    HUMEAN_LOG_BACKUPS, HUMEAN_LOG_ROTATE_WHEN (prioritaire sur la taille), HUMEAN_LOG_DEBUG_SAMPLE,
+    HUMEAN_LOG_QUEUE_SIZE.
+    """
+    env = os.environ
+    if level is None:
+        level = env.get('HUMEAN_LOG_LEVEL', 'INFO')
+    if max_bytes is None:
+        max_bytes = int(env.get('HUMEAN_LOG_MAX_BYTES', 10 * 1024 * 1024))
+    if backup_count is None:
+        backup_count = int(env.get('HUMEAN_LOG_BACKUPS', 5))
+    if when is None:
+        when = env.get('HUMEAN_LOG_ROTATE_WHEN') or None
+    if debug_sample_rate is None:
+        debug_sample_rate = int(env.get('HUMEAN_LOG_DEBUG_SAMPLE', 100))
+    if queue_size is None:
+        queue_size = int(env.get('HUMEAN_LOG_QUEUE_SIZE', 10000))
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    targets = []
+    file_options = (log_file, max_bytes, backup_count, when) if log_file else None
+    if log_file:
+        targets.append(_file_handler(*file_options))
+    if console:
+        targets.append(logging.StreamHandler())
+    for target in targets:
+        target.setFormatter(formatter)
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    # Échantillonnage avant la file : les événements écartés ne coûtent ni copie ni écriture
+    handler.addFilter(SamplingFilter(debug_sample_rate))
+
+    with _state_lock:
+        _stop_locked()
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(handler)
+        listener = logging.handlers.QueueListener(handler.queue, *targets, respect_handler_level=True)
+        listener.start()
+        _state.update(listener=listener, handler=handler, targets=tuple(targets), file_options=file_options)
+    return handler
+
+
+def _stop_locked():
+    listener, handler = _state["listener"], _state["handler"]
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        # Vide la file avant de rendre la main
+        listener.stop()
+    for target in _state["targets"]:
+        target.close()
+    _state.update(listener=None, handler=None, targets=(), file_options=None)
+
+
+def stop_logging():
+    """Écrit les enregistrements en attente puis arrête le thread d'écriture"""
+    with _state_lock:
+        _stop_locked()
+
+
+def use_process_log_file(suffix):
+    """Processus fils (worker pre-fork) : fichier de journal propre, ex. humean_server.worker1.log
+
+    Les gestionnaires à rotation ne sont pas multi-processus : deux écrivains sur le même
+    fichier se marchent dessus à la rotation. Retourne le chemin utilisé (None sans fichier).
+    """
+    with _state_lock:
+        listener, handler, options = _state["listener"], _state["handler"], _state["file_options"]
+        if listener is None or options is None:
+            return None
+        listener.stop()
+        log_file, max_bytes, backup_count, when = options
+        root, ext = os.path.splitext(log_file)
+        path = f"{root}.{suffix}{ext}"
+        targets = []
+        for target in _state["targets"]:
+            if isinstance(target, logging.FileHandler):
+                # Ferme la copie héritée du descripteur ; le fichier du maître reste ouvert chez lui
+                target.close()
+                replacement = _file_handler(path, max_bytes, backup_count, when)
+                replacement.setFormatter(target.formatter)
+                replacement.setLevel(target.level)
+                target = replacement
+            targets.append(target)
+        listener = logging.handlers.QueueListener(handler.queue, *targets, respect_handler_level=True)
+        listener.start()
+        _state.update(listener=listener, targets=tuple(targets),
+                      file_options=(path, max_bytes, backup_count, when))
+    return path
+
+
+def flush_logging():
+    """Attend que tous les enregistrements déjà en file soient écrits"""
+    listener = _state["listener"]
+    if listener is not None and listener._thread is not None:
+        listener.queue.join()
+
+
+def get_logging_stats():
+    handler = _state["handler"]
+    if handler is None:
+        return {"async": False}
+    return {
+        "async": True,
+        "queued": handler.queue.qsize(),
+        "dropped": handler.dropped,
+        "handlers": [type(target).__name__ for target in _state["targets"]],
+    }
+
+
+def _restart_in_child():
+    """Après fork : le thread d'écriture n'existe pas dans l'enfant, on en relance un"""
+    listener, handler = _state["listener"], _state["handler"]
+    if listener is None:
+        return
+    global _state_lock
+    _state_lock = threading.Lock()
+    # File neuve : l'ancienne a pu être copiée avec un verrou tenu par le thread du parent
+    handler.queue = queue.Queue(maxsize=handler.queue.maxsize)
+    listener = logging.handlers.QueueListener(handler.queue, *_state["targets"], respect_handler_level=True)
+    listener.start()
+    _state["listener"] = listener
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_in_child)
+atexit.register(stop_logging)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+MÉTRIQUES HUMEAN
+Compteurs, jauges et histogrammes par route exposés au format texte Prometheus sur /metrics
+"""
+
+import bisect
+import threading
+import time
+
+from flask import Response, g, request
+
+# Bornes (secondes) adaptées à des requêtes de la milliseconde à quelques secondes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_request_state = threading.local()
+
+
+def record_db_time(seconds):
+    """Ajoute du temps base de données à la requête en cours (appelé par le pool)"""
+    if getattr(_request_state, "active", False):
+        _request_state.db_seconds += seconds
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, self.labels, key, value) for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values, value):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, *label_values, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        samples = []
+        labels = self.labels + ("le",)
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append((self.name + "_bucket", labels, key + (_format_value(float(bound)),), cumulative))
+            samples.append((self.name + "_sum", self.labels, key, round(total, 6)))
+            samples.append((self.name + "_count", self.labels, key, count))
+        return samples
+
+
+class MetricsRegistry:
+    """Registre des métriques + collecteurs évalués au moment de la lecture"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """collector() -> liste de (nom, aide, type, valeur) lus à chaque export"""
+        self._collectors.append(collector)
+
+    def render(self):
+        """Export au format texte Prometheus (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, label_names, label_values, value in metric.samples():
+                lines.append(f"{name}{_format_labels(label_names, label_values)} {_format_value(value)}")
+        for collector in self._collectors:
+            try:
+                collected = collector()
+            except Exception:
+                continue
+            for name, help_text, kind, value in collected:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class FlaskMetrics:
+    """Instrumentation de toutes les routes d'une application Flask"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.requests = r.counter("humean_http_requests_total", "Requêtes HTTP traitées",
+                                  ("method", "route", "status"))
+        self.latency = r.histogram("humean_http_request_duration_seconds", "Latence des requêtes HTTP",
+                                   ("method", "route"))
+        self.db_time = r.histogram("humean_http_request_db_seconds", "Temps base de données par requête",
+                                   ("route",))
+        self.in_flight = r.gauge("humean_http_requests_in_flight", "Requêtes HTTP en cours", ("route",))
+        self.exceptions = r.counter("humean_http_exceptions_total", "Exceptions non gérées", ("route",))
+
+    def init_app(self, app):
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.teardown_request(self._teardown)
+        app.add_url_rule('/metrics', 'metrics', self._serve)
+        app.extensions['humean_metrics'] = self
+
+    @staticmethod
+    def _route():
+        rule = request.url_rule
+        return rule.rule if rule is not None else "<unmatched>"
+
+    def _before(self):
+        route = self._route()
+        g._metrics_start = time.perf_counter()
+        g._metrics_route = route
+        g._metrics_recorded = False
+        _request_state.active = True
+        _request_state.db_seconds = 0.0
+        self.in_flight.inc(route)
+
+    def _after(self, response):
+        route = getattr(g, "_metrics_route", None)
+        if route is None:
+            return response
+        elapsed = time.perf_counter() - g._metrics_start
+        self.requests.inc(request.method, route, str(response.status_code))
+        self.latency.observe(request.method, route, value=elapsed)
+        self.db_time.observe(route, value=getattr(_request_state, "db_seconds", 0.0))
+        g._metrics_recorded = True
+        return response
+
+    def _teardown(self, error=None):
+        route = getattr(g, "_metrics_route", None)
+        if route is None:
+            return
+        if not g._metrics_recorded:
+            # Exception non interceptée : after_request n'a pas été appelé
+            self.requests.inc(request.method, route, "500")
+            self.latency.observe(request.method, route, value=time.perf_counter() - g._metrics_start)
+        if error is not None:
+            self.exceptions.inc(route)
+        self.in_flight.dec(route)
+        g._metrics_route = None
+        _request_state.active = False
+
+    def _serve(self):
+        return Response(self.registry.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
+def install_metrics(app, registry=None):
+    """Installe l'instrumentation une seule fois par application"""
+    existing = app.extensions.get('humean_metrics')
+    if existing is not None:
+        return existing
+    metrics = FlaskMetrics(registry)
+    metrics.init_app(app)
+    return metrics
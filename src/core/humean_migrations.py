@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+MIGRATIONS DU SCHÉMA HUMEAN
+Schéma versionné via PRAGMA user_version, appliqué une seule fois par version
+"""
+
+import logging
+
+logger = logging.getLogger("HumeanServer")
+
+# (version, description, instructions SQL) - ne jamais modifier une migration publiée
+MIGRATIONS = [
+    (1, "Schéma initial", [
+        '''
+        CREATE TABLE IF NOT EXISTS ai_models (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            version TEXT NOT NULL,
+            model_data BLOB,
+            accuracy REAL,
+            training_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_active BOOLEAN DEFAULT TRUE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS training_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            input_data TEXT NOT NULL,
+            expected_output TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS performance_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            model_name TEXT NOT NULL,
+            metric_name TEXT NOT NULL,
+            metric_value REAL NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS raw_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source_type TEXT,
+            data_content TEXT,
+            timestamp DATETIME,
+            processed BOOLEAN DEFAULT FALSE,
+            p3_insight_generated BOOLEAN DEFAULT FALSE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS p3_insights (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            raw_data_id INTEGER,
+            insight_text TEXT,
+            confidence_score REAL,
+            innovation_level TEXT,
+            generated_at DATETIME,
+            FOREIGN KEY (raw_data_id) REFERENCES raw_data (id)
+        )
+        ''',
+    ]),
+    (2, "Index des chemins d'accès principaux", [
+        # get_training_data : WHERE model_name = ? ORDER BY timestamp DESC
+        "CREATE INDEX IF NOT EXISTS idx_training_data_model_ts ON training_data (model_name, timestamp)",
+        # Lecture des métriques par modèle et par période
+        "CREATE INDEX IF NOT EXISTS idx_performance_logs_model_metric_ts "
+        "ON performance_logs (model_name, metric_name, timestamp)",
+        # generate_p3_insights : file des données non traitées uniquement
+        "CREATE INDEX IF NOT EXISTS idx_raw_data_unprocessed ON raw_data (id) WHERE processed = FALSE",
+        "CREATE INDEX IF NOT EXISTS idx_raw_data_source_type ON raw_data (source_type)",
+        # get_recent_insights : ORDER BY generated_at DESC + jointure raw_data
+        "CREATE INDEX IF NOT EXISTS idx_p3_insights_generated_at ON p3_insights (generated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_p3_insights_raw_data_id ON p3_insights (raw_data_id)",
+    ]),
+    (3, "Base de connaissances persistante", [
+        '''
+        CREATE TABLE IF NOT EXISTS knowledge_base (
+            model_name TEXT NOT NULL,
+            pattern_key TEXT NOT NULL,
+            input_data TEXT,
+            expected_output TEXT,
+            score REAL,
+            learned_at TIMESTAMP,
+            PRIMARY KEY (model_name, pattern_key)
+        ) WITHOUT ROWID
+        ''',
+    ]),
+    (4, "Points de reprise des traitements incrémentaux", [
+        '''
+        CREATE TABLE IF NOT EXISTS improvement_state (
+            name TEXT PRIMARY KEY,
+            watermark INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+        ''',
+    ]),
+    (5, "Instantanés de modèles versionnés", [
+        '''
+        CREATE TABLE IF NOT EXISTS model_snapshots (
+            model_name TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            path TEXT NOT NULL,
+            size_bytes INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (model_name, version)
+        ) WITHOUT ROWID
+        ''',
+        # Connaissances apprises après un instantané
+        "CREATE INDEX IF NOT EXISTS idx_knowledge_base_model_learned_at ON knowledge_base (model_name, learned_at)",
+    ]),
+    (6, "Agrégats temporels des métriques de performance", [
+        '''
+        CREATE TABLE IF NOT EXISTS performance_rollups (
+            model_name TEXT NOT NULL,
+            metric_name TEXT NOT NULL,
+            resolution INTEGER NOT NULL,
+            bucket_start INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            total REAL NOT NULL,
+            min_value REAL,
+            max_value REAL,
+            sketch BLOB,
+            PRIMARY KEY (model_name, metric_name, resolution, bucket_start)
+        ) WITHOUT ROWID
+        ''',
+        # Rétention : suppression par niveau et ancienneté
+        "CREATE INDEX IF NOT EXISTS idx_performance_rollups_resolution_start "
+        "ON performance_rollups (resolution, bucket_start)",
+    ]),
+    (7, "File des données non traitées par type de source", [
+        # Génération parallèle des insights : partitions (source_type, id) des lignes non traitées
+        "CREATE INDEX IF NOT EXISTS idx_raw_data_unprocessed_source "
+        "ON raw_data (source_type, id) WHERE processed = FALSE",
+    ]),
+    (8, "Compteurs maintenus des données externes", [
+        # get_data_stats en O(1) : compteurs 'raw_data', 'processed', 'p3_insights' et
+        # 'source_type:<type>', tenus à jour par le connecteur dans la transaction de chaque écriture
+        '''
+        CREATE TABLE IF NOT EXISTS data_counters (
+            counter TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        ''',
+        # Amorçage depuis les données existantes
+        "INSERT OR REPLACE INTO data_counters (counter, value) "
+        "SELECT 'raw_data', COUNT(*) FROM raw_data "
+        "UNION ALL SELECT 'processed', COUNT(*) FROM raw_data WHERE processed = TRUE "
+        "UNION ALL SELECT 'p3_insights', COUNT(*) FROM p3_insights "
+        "UNION ALL SELECT 'source_type:' || IFNULL(source_type, ''), COUNT(*) FROM raw_data GROUP BY source_type",
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Version courante du schéma"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn):
+    """Applique les migrations manquantes, chacune dans sa transaction"""
+    current = get_schema_version(conn)
+    applied = []
+
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Une autre connexion a pu migrer entre-temps
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+        logger.info(f"🗄️ Migration {version} appliquée: {description}")
+
+    return applied
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+APPRENTISSAGE EN LIGNE HUMEAN
+Modèle linéaire sur caractéristiques hachées (requête × réponse), entraîné par SGD
+en mini-lots sur les nouvelles données d'entraînement et utilisé pour classer les réponses candidates
+"""
+
+import json
+import threading
+import zlib
+
+import numpy as np
+
+from src.core.humean_snapshots import load_snapshot_bytes, serialize
+from src.core.humean_vector_index import HashingEncoder
+
+# Multiplicateur de Knuth : disperse les indices de la requête avant croisement
+_MIX = np.uint64(0x9E3779B1)
+_QUERY_SPACE = 1 << 20
+
+
+def response_key(output):
+    """Clé stable d'une réponse (toute valeur JSON)"""
+    return json.dumps(output, sort_keys=True, ensure_ascii=False)
+
+
+def _hash(key):
+    return zlib.crc32(key.encode("utf-8"))
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+
+class OnlineLearner:
+    """Régression logistique P(réponse | requête) avec échantillonnage négatif"""
+
+    def __init__(self, dim=1 << 18, learning_rate=0.5, l2=1e-6, negatives=4, batch_size=64,
+                 max_responses=2048, min_count=2, seed=0):
+        self.dim = dim
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.negatives = negatives
+        # Correction du logit : chaque positif est vu face à `negatives` négatifs tirés
+        self._logit_offset = float(np.log(max(negatives, 1)))
+        self.batch_size = batch_size
+        self.max_responses = max_responses
+        # Une réponse vue une seule fois n'est pas proposée (écho d'une requête unique)
+        self.min_count = min_count
+        self.encoder = HashingEncoder(_QUERY_SPACE)
+        self.weights = np.zeros(dim, dtype=np.float32)
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._responses = {}     # clé -> [sortie, occurrences] (None : encore dans l'instantané)
+        self._snapshot_vocabulary = None
+        self._candidates = None  # instantané (hachages, sorties) lu sans verrou
+        self._stats = {"updates": 0, "examples": 0, "predictions": 0}
+
+    def __len__(self):
+        if self._responses is None:
+            return len(self._snapshot_vocabulary[0])
+        return len(self._responses)
+
+    @property
+    def is_trained(self):
+        return self._stats["updates"] > 0
+
+    def _cross(self, indices, response_hashes):
+        """Indices croisés requête × réponse -> matrice (réponses, nnz)"""
+        mixed = indices.astype(np.uint64) * _MIX
+        crossed = mixed[None, :] ^ response_hashes.astype(np.uint64)[:, None]
+        return (crossed % np.uint64(self.dim)).astype(np.intp)
+
+    def _register(self, key, output):
+        entry = self._responses.get(key)
+        if entry is None:
+            if len(self._responses) >= self.max_responses:
+                # Évince la réponse la plus rare
+                rarest = min(self._responses, key=lambda k: self._responses[k][1])
+                del self._responses[rarest]
+            entry = self._responses[key] = [output, 0]
+        entry[1] += 1
+
+    def _refresh_candidates(self):
+        keys = [k for k, (_, count) in self._responses.items() if count >= self.min_count]
+        hashes = np.fromiter((_hash(k) for k in keys), dtype=np.uint64, count=len(keys))
+        self._candidates = (hashes, [self._responses[k][0] for k in keys])
+
+    def _materialize_locked(self):
+        """Premier entraînement après chargement d'un instantané : copie des vues en lecture seule"""
+        if self._responses is None:
+            outputs, counts = self._snapshot_vocabulary
+            self._responses = {
+                response_key(output): [output, count] for output, count in zip(outputs, counts.tolist())
+            }
+            self._snapshot_vocabulary = None
+        if not self.weights.flags.writeable:
+            self.weights = self.weights.copy()
+
+    def partial_fit(self, pairs):
+        """Entraîne sur des paires (requête texte, réponse) ; retourne le nombre d'exemples"""
+        pairs = [(q, o) for q, o in pairs if isinstance(q, str) and o is not None]
+        if not pairs:
+            return 0
+        with self._lock:
+            self._materialize_locked()
+            encoded = []
+            for query, output in pairs:
+                key = response_key(output)
+                self._register(key, output)
+                indices, values = self.encoder.features(query)
+                if len(indices):
+                    encoded.append((indices, values, _hash(key)))
+            if encoded:
+                pool = np.fromiter((_hash(k) for k in self._responses), dtype=np.uint64,
+                                   count=len(self._responses))
+                for start in range(0, len(encoded), self.batch_size):
+                    self._sgd_step(encoded[start:start + self.batch_size], pool)
+            self._refresh_candidates()
+            self._stats["examples"] += len(encoded)
+        return len(encoded)
+
+    def _sgd_step(self, batch, pool):
+        """Un pas de SGD : un positif et `negatives` réponses tirées au hasard par requête"""
+        flat_idx, flat_val, example, labels = [], [], [], []
+        row = 0
+        for indices, vals, positive in batch:
+            hashes = [positive]
+            if len(pool) > 1 and self.negatives:
+                sampled = pool[self._rng.integers(0, len(pool), self.negatives)]
+                hashes.extend(int(h) for h in sampled if int(h) != positive)
+            hashes = np.asarray(hashes, dtype=np.uint64)
+            bias = (hashes % np.uint64(self.dim)).astype(np.intp)[:, None]
+            crossed = np.hstack([self._cross(indices, hashes), bias])
+            # Un exemple par réponse : mêmes valeurs de requête + biais de réponse
+            flat_idx.append(crossed.ravel())
+            flat_val.append(np.tile(np.append(vals, np.float32(1.0)), len(hashes)))
+            example.append(np.repeat(np.arange(row, row + len(hashes)), crossed.shape[1]))
+            labels.append(np.r_[1.0, np.zeros(len(hashes) - 1)])
+            row += len(hashes)
+
+        flat_idx = np.concatenate(flat_idx)
+        flat_val = np.concatenate(flat_val)
+        example = np.concatenate(example)
+        y = np.concatenate(labels)
+
+        z = np.bincount(example, weights=self.weights[flat_idx] * flat_val, minlength=row)
+        error = _sigmoid(z) - y
+        grad = error[example] * flat_val + self.l2 * self.weights[flat_idx]
+        np.subtract.at(self.weights, flat_idx, (self.learning_rate * grad).astype(np.float32))
+        self._stats["updates"] += 1
+
+    def _score(self, query):
+        """(sorties, logits, part du logit due à la requête) de toutes les réponses candidates"""
+        snapshot = self._candidates
+        if snapshot is None or not len(snapshot[0]):
+            return None
+        hashes, outputs = snapshot
+        indices, values = self.encoder.features(query)
+        if not len(indices):
+            return None
+        self._stats["predictions"] += 1
+        evidence = self.weights[self._cross(indices, hashes)] @ values
+        scores = evidence + self.weights[(hashes % np.uint64(self.dim)).astype(np.intp)] + self._logit_offset
+        return outputs, scores, evidence
+
+    def rank(self, query, k=3):
+        """Réponses candidates classées par probabilité décroissante : [(sortie, proba)]"""
+        scored = self._score(query)
+        if scored is None:
+            return []
+        outputs, scores, _ = scored
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(outputs[i], float(_sigmoid(scores[i]))) for i in top]
+
+    def predict(self, query, threshold=0.5, min_evidence=0.5):
+        """Meilleure réponse si sa probabilité atteint le seuil, sinon None
+
+        min_evidence écarte les requêtes inconnues, classées sur la seule fréquence des réponses.
+        """
+        scored = self._score(query)
+        if scored is None:
+            return None
+        outputs, scores, evidence = scored
+        best = int(np.argmax(scores))
+        probability = float(_sigmoid(scores[best]))
+        if probability < threshold or evidence[best] < min_evidence:
+            return None
+        return outputs[best], probability
+
+    def export_state(self, prefix=""):
+        """(tableaux, tables de chaînes, métadonnées) pour un instantané"""
+        with self._lock:
+            self._materialize_locked()
+            keys = list(self._responses)
+            counts = np.fromiter((self._responses[k][1] for k in keys), dtype=np.int64, count=len(keys))
+            candidates = np.flatnonzero(counts >= self.min_count)
+            hashes = np.fromiter((_hash(keys[i]) for i in candidates), dtype=np.uint64, count=len(candidates))
+            arrays = {
+                prefix + "weights": self.weights.copy(),
+                prefix + "response_counts": counts,
+                prefix + "candidate_index": candidates.astype(np.int64),
+                prefix + "candidate_hashes": hashes,
+            }
+            metadata = {"dim": self.dim, "updates": self._stats["updates"], "examples": self._stats["examples"]}
+        return arrays, {prefix + "responses": [self._responses[k][0] for k in keys]}, metadata
+
+    def load_snapshot(self, snapshot, prefix="", metadata=None):
+        """Poids et vocabulaire adossés aux vues de l'instantané (copiés au premier entraînement)"""
+        metadata = metadata if metadata is not None else snapshot.metadata
+        weights = snapshot.array(prefix + "weights")
+        if weights.shape != (self.dim,):
+            raise ValueError(f"Dimension incompatible: {weights.shape[0]} != {self.dim}")
+        outputs = snapshot.strings(prefix + "responses")
+        candidates = outputs.subset(snapshot.array(prefix + "candidate_index"))
+        with self._lock:
+            self.weights = weights
+            self._responses = None
+            self._snapshot_vocabulary = (outputs, snapshot.array(prefix + "response_counts"))
+            self._candidates = (snapshot.array(prefix + "candidate_hashes"), candidates)
+            self._stats["updates"] = int(metadata.get("updates", 0))
+            self._stats["examples"] = int(metadata.get("examples", 0))
+
+    def to_bytes(self):
+        """État sérialisé (format d'instantané) pour un redémarrage à chaud"""
+        arrays, strings, metadata = self.export_state()
+        return serialize(arrays, strings, metadata)
+
+    def load_bytes(self, data):
+        """Restaure un état produit par to_bytes (dimension identique requise)"""
+        self.load_snapshot(load_snapshot_bytes(data))
+
+    def get_stats(self):
+        stats = dict(self._stats)
+        stats["responses"] = len(self)
+        stats["candidates"] = len(self._candidates[0]) if self._candidates is not None else 0
+        stats["dim"] = self.dim
+        return stats
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+SERVEUR PRE-FORK HUMEAN
+Le maître précharge l'application (pages partagées en copie sur écriture), ouvre le
+socket d'écoute puis forke N workers qu'il supervise et relance en cas de crash.
+Seul le worker 0 exécute la boucle d'auto-amélioration. L'état appris passe par la base :
+chaque worker relit poids, connaissances (feedback) et instantané actif publiés par les
+autres au plus toutes les HUMEAN_MODEL_SYNC_INTERVAL secondes.
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from src.core.humean_logging import stop_logging, use_process_log_file
+
+logger = logging.getLogger("HumeanServer")
+
+
+class PreforkServer:
+    """Maître pre-fork : socket partagé, workers supervisés"""
+
+    def __init__(self, app, host="127.0.0.1", port=5000, workers=None, backlog=1024,
+                 restart_delay=1.0, max_restart_delay=30.0):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.backlog = backlog
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+
+        self.socket = None
+        self._children = {}       # pid -> index du worker
+        self._started_at = {}     # index -> instant du dernier démarrage
+        self._failures = {}       # index -> crashs rapides consécutifs
+        self._stopping = False
+        self.restarts = 0
+
+    def _components(self):
+        return self.app.extensions.get('humean_components')
+
+    def bind(self):
+        """Ouvre le socket d'écoute partagé par tous les workers"""
+        self.socket = socket.create_server((self.host, self.port), backlog=self.backlog, reuse_port=False)
+        self.socket.set_inheritable(True)
+        self.port = self.socket.getsockname()[1]
+        return self.port
+
+    def preload(self):
+        """Charge modèle et index dans le maître pour partager les pages après fork"""
+        components = self._components()
+        if components is not None:
+            components.warm_up()
+            # Les connexions SQLite ne doivent jamais traverser un fork
+            components.db_manager.pool.reset()
+        # Objets préchargés exclus du GC : évite de salir les pages partagées
+        gc.collect()
+        gc.freeze()
+
+    def serve_forever(self):
+        """Démarre les workers et les supervise jusqu'à SIGTERM/SIGINT"""
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Le mode pre-fork nécessite os.fork (POSIX)")
+        if self.socket is None:
+            self.bind()
+        self.preload()
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        logger.info(f"🧬 Maître pre-fork {os.getpid()} : {self.workers} workers sur http://{self.host}:{self.port}")
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            index = self._children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            logger.warning(f"⚠️ Worker {index} (pid {pid}) arrêté (statut {status}), relance")
+            self.restarts += 1
+            self._respawn(index)
+
+        self.socket.close()
+        logger.info("🛑 Serveur pre-fork arrêté")
+
+    def _respawn(self, index):
+        """Relance avec délai croissant si le worker crashe dès son démarrage"""
+        lived = time.monotonic() - self._started_at.get(index, 0)
+        if lived < 5.0:
+            self._failures[index] = self._failures.get(index, 0) + 1
+        else:
+            self._failures[index] = 0
+        if self._failures[index]:
+            delay = min(self.restart_delay * 2 ** (self._failures[index] - 1), self.max_restart_delay)
+            time.sleep(delay)
+        if not self._stopping:
+            self._spawn(index)
+
+    def _spawn(self, index):
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            self._started_at[index] = time.monotonic()
+            return
+        # Processus worker : ne revient jamais. Le gestionnaire hérité du maître
+        # enverrait SIGTERM aux autres workers : comportement par défaut jusqu'au démarrage
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 0
+        try:
+            self._run_worker(index)
+        except BaseException:
+            logger.exception(f"Erreur worker {index}")
+            code = 1
+        finally:
+            # os._exit saute atexit : enregistrements en file écrits avant la sortie
+            stop_logging()
+            os._exit(code)
+
+    def _run_worker(self, index):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        # Un fichier par worker (nom stable d'une relance à l'autre) : un seul écrivain par fichier
+        use_process_log_file(f"worker{index}")
+        components = self._components()
+        if components is not None:
+            # Une seule boucle d'auto-amélioration pour tout le groupe
+            components.run_improvement_loop = index == 0
+            components.ensure_started()
+
+        server = make_server(self.host, self.port, self.app, threaded=True, fd=self.socket.fileno())
+
+        def stop(signum, frame):
+            # shutdown() bloque jusqu'à la sortie de serve_forever : hors du thread principal
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, stop)
+        logger.info(f"👷 Worker {index} prêt (pid {os.getpid()})")
+        server.serve_forever()
+        if components is not None:
+            components.shutdown()
+
+    def _handle_stop(self, signum, frame):
+        if self._stopping:
+            return
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def run_prefork(app, host="127.0.0.1", port=5000, workers=None):
+    """Lance le serveur pre-fork (repli mono-processus si fork indisponible)"""
+    server = PreforkServer(app, host=host, port=port, workers=workers)
+    if not hasattr(os, "fork"):
+        logger.warning("⚠️ os.fork indisponible : démarrage mono-processus")
+        app.run(host=host, port=port, threaded=True)
+        return
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+CACHE DE RÉPONSES HUMEAN
+LRU borné avec expiration (TTL) et coalescence des calculs concurrents (singleflight)
+"""
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Forme canonique d'une requête : minuscules, espaces réduits, ponctuation finale retirée"""
+    return _WHITESPACE.sub(" ", str(query).lower()).strip(" \t\n!?.,;:")
+
+
+def make_cache_key(query, context=None):
+    """Clé de cache : requête normalisée + contexte sérialisé de façon stable"""
+    if not context:
+        return normalize_query(query)
+    return normalize_query(query) + "\x1f" + json.dumps(context, sort_keys=True, default=str)
+
+
+class _InFlight:
+    """Calcul en cours partagé entre les appelants d'une même clé"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ResponseCache:
+    """Cache LRU/TTL thread-safe avec singleflight"""
+
+    def __init__(self, max_size=1024, ttl=300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        # Incrémentée par clear() : un calcul commencé avant n'est pas mis en cache
+        self._generation = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+
+    def get(self, key):
+        """Retourne la valeur en cache ou None"""
+        with self._lock:
+            return self._get_locked(key)
+
+    def _get_locked(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self._stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Ajoute une valeur et évince la moins récemment utilisée si plein"""
+        with self._lock:
+            self._put_locked(key, value)
+
+    def _put_locked(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get_or_compute(self, key, compute, should_cache=None):
+        """Valeur en cache, ou calcul unique partagé entre appelants concurrents"""
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                self._stats["hits"] += 1
+                return value
+            call = self._inflight.get(key)
+            if call is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                self._stats["misses"] += 1
+                call = self._inflight[key] = _InFlight()
+                leader = True
+            generation = self._generation
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = compute()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if (call.error is None and generation == self._generation
+                        and (should_cache is None or should_cache(call.result))):
+                    self._put_locked(key, call.result)
+                if self._inflight.get(key) is call:
+                    del self._inflight[key]
+            call.event.set()
+        return call.result
+
+    def invalidate(self, key):
+        """Retire une entrée (ex: connaissance mise à jour)"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def record_bypass(self):
+        """Compte une requête volontairement non mise en cache"""
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self):
+        """Vide le cache (nouvelle génération : les calculs en cours ne seront pas conservés)"""
+        with self._lock:
+            self._entries.clear()
+            # Les appelants suivants recalculent au lieu de rejoindre un calcul antérieur
+            self._inflight.clear()
+            self._generation += 1
+
+    def get_stats(self):
+        """Compteurs du cache"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["generation"] = self._generation
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["max_size"] = self.max_size
+        stats["ttl_seconds"] = self.ttl
+        stats["hit_ratio"] = round((stats["hits"] + stats["coalesced"]) / lookups, 4) if lookups else 0.0
+        return stats
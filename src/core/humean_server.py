@@ -4,80 +4,75 @@ Serveur HUMEAN - Système d'IA Évolutif
 Script principal du serveur backend
 """
 
+import atexit
+import base64
 import os
 import sys
 import json
 import logging
-import sqlite3
 import threading
 import time
-from datetime import datetime
-from flask import Flask, request, jsonify, render_template, send_file
+from datetime import datetime, timedelta
+from flask import Blueprint, Flask, Response, current_app, request, jsonify, render_template, send_file
 from flask_cors import CORS
-import numpy as np
 import hashlib
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("humean_server.log"),
-        logging.StreamHandler()
-    ]
-)
+from src.core.humean_db_pool import SQLiteConnectionPool
+from src.core.humean_migrations import apply_migrations
+from src.core.humean_response_cache import ResponseCache, make_cache_key
+from src.core.humean_intents import IntentEngine
+from src.core.humean_knowledge import KnowledgeStore, entry_score
+from src.core.humean_admission import install_admission_control
+from src.core.humean_logging import configure_logging as configure_async_logging, get_logging_stats
+from src.core.humean_metrics import install_metrics, record_db_time
+from src.core.humean_tracing import add_timing, install_tracing, span, traced
+from src.core.humean_write_behind import WriteBehindQueue
+
 logger = logging.getLogger("HumeanServer")
 
+def record_db_release(seconds):
+    """Temps de connexion SQLite : métriques Prometheus et étape 'db' de la trace en cours"""
+    record_db_time(seconds)
+    add_timing('db', seconds)
+
+def configure_logging(log_file="humean_server.log"):
+    """Configuration du logging (appelée au démarrage, jamais à l'import)"""
+    # Écriture et rotation par un thread dédié : les requêtes ne font que mettre en file
+    return configure_async_logging(log_file)
+
+# Règles d'intentions éditables (rechargées à chaud)
+DEFAULT_INTENTS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'humean_intents.json'
+)
+
 class HumeanDatabase:
     """Gestionnaire de base de données HUMEAN"""
     
-    def __init__(self, db_path="humean_data.db"):
+    def __init__(self, db_path="humean_data.db", pool_size=None):
         self.db_path = db_path
+        if pool_size is None:
+            pool_size = int(os.environ.get('HUMEAN_DB_POOL_SIZE', 8))
+        self.pool = SQLiteConnectionPool(db_path, max_size=pool_size, on_release=record_db_release)
         self.init_database()
     
+    def connection(self):
+        """Emprunte une connexion du pool"""
+        return self.pool.connection()
+    
+    def transaction(self):
+        """Emprunte une connexion du pool dans une transaction"""
+        return self.pool.transaction()
+    
+    def get_pool_stats(self):
+        """Statistiques du pool de connexions"""
+        return self.pool.get_stats()
+    
     def init_database(self):
-        """Initialise la structure de la base de données"""
+        """Initialise la structure de la base de données (migrations versionnées)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Table des modèles IA
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ai_models (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    version TEXT NOT NULL,
-                    model_data BLOB,
-                    accuracy REAL,
-                    training_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_active BOOLEAN DEFAULT TRUE
-                )
-            ''')
-            
-            # Table des données d'entraînement
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS training_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    input_data TEXT NOT NULL,
-                    expected_output TEXT NOT NULL,
-                    model_name TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Table de l'historique des performances
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS performance_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    model_name TEXT NOT NULL,
-                    metric_name TEXT NOT NULL,
-                    metric_value REAL NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            with self.connection() as conn:
+                apply_migrations(conn)
             logger.info("✅ Base de données HUMEAN initialisée")
             
         except Exception as e:
@@ -86,37 +81,81 @@ class HumeanDatabase:
 class DataConnector:
     """Connecteur de données unifié"""
     
+    TRAINING_INSERT_SQL = "INSERT INTO training_data (input_data, expected_output, model_name) VALUES (?, ?, ?)"
+    
     def __init__(self, db_manager):
         self.db = db_manager
+        self.training_writer = None
         logger.info("✅ Connecteur de données intégré")
     
+    def enable_write_behind(self, max_batch=500, flush_interval=0.5, max_queue=10000, block_timeout=0.0):
+        """Active l'écriture différée des données d'entraînement"""
+        if self.training_writer is None:
+            self.training_writer = WriteBehindQueue(
+                self.db,
+                self.TRAINING_INSERT_SQL,
+                max_batch=max_batch,
+                flush_interval=flush_interval,
+                max_queue=max_queue,
+                block_timeout=block_timeout,
+                name="training-writer"
+            )
+        self.training_writer.start()
+    
+    def shutdown(self):
+        """Vide la file d'écriture différée"""
+        if self.training_writer is not None:
+            self.training_writer.stop()
+    
     def store_training_data(self, input_data, expected_output, model_name):
         """Stocke les données d'entraînement"""
         try:
-            conn = sqlite3.connect(self.db.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO training_data (input_data, expected_output, model_name) VALUES (?, ?, ?)",
-                (json.dumps(input_data), json.dumps(expected_output), model_name)
-            )
-            conn.commit()
-            conn.close()
+            with self.db.transaction() as conn:
+                conn.execute(
+                    self.TRAINING_INSERT_SQL,
+                    (json.dumps(input_data), json.dumps(expected_output), model_name)
+                )
             return True
         except Exception as e:
             logger.error(f"Erreur stockage données: {e}")
             return False
     
+    def store_training_data_many(self, rows, model_name):
+        """Stocke un lot de paires (entrée, sortie) dans une seule transaction"""
+        try:
+            with self.db.transaction() as conn:
+                conn.executemany(
+                    self.TRAINING_INSERT_SQL,
+                    [(json.dumps(input_data), json.dumps(expected_output), model_name)
+                     for input_data, expected_output in rows]
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Erreur stockage lot données: {e}")
+            return False
+    
+    def queue_training_data(self, input_data, expected_output, model_name):
+        """Met en file les données d'entraînement (écriture synchrone si inactive)"""
+        if self.training_writer is None or not self.training_writer.is_running:
+            return self.store_training_data(input_data, expected_output, model_name)
+        return self.training_writer.submit(
+            (json.dumps(input_data), json.dumps(expected_output), model_name)
+        )
+    
+    def get_writer_stats(self):
+        """Statistiques de l'écriture différée"""
+        if self.training_writer is None:
+            return {'running': False}
+        return self.training_writer.get_stats()
+    
     def get_training_data(self, model_name, limit=1000):
         """Récupère les données d'entraînement"""
         try:
-            conn = sqlite3.connect(self.db.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT input_data, expected_output FROM training_data WHERE model_name = ? ORDER BY timestamp DESC LIMIT ?",
-                (model_name, limit)
-            )
-            data = cursor.fetchall()
-            conn.close()
+            with self.db.connection() as conn:
+                data = conn.execute(
+                    "SELECT input_data, expected_output FROM training_data WHERE model_name = ? ORDER BY timestamp DESC LIMIT ?",
+                    (model_name, limit)
+                ).fetchall()
             
             training_pairs = []
             for input_json, output_json in data:
@@ -128,74 +167,636 @@ class DataConnector:
         except Exception as e:
             logger.error(f"Erreur récupération données: {e}")
             return []
+    
+    def get_training_data_page(self, model_name, limit=100, cursor=None):
+        """Page de données d'entraînement (pagination par curseur timestamp/id)"""
+        rows = list(self.iter_training_rows(model_name, cursor=cursor, limit=limit))
+        page = [
+            {'input': json.loads(input_json), 'output': json.loads(output_json)}
+            for _, _, input_json, output_json in rows
+        ]
+        next_cursor = None
+        if rows and len(rows) == limit:
+            row_id, timestamp = rows[-1][0], rows[-1][1]
+            next_cursor = encode_cursor(timestamp, row_id)
+        return page, next_cursor
+    
+    def iter_training_rows(self, model_name, cursor=None, limit=None, chunk_size=1000):
+        """Parcourt les lignes brutes (id, timestamp, input JSON, output JSON) par lots"""
+        position = decode_cursor(cursor) if cursor else None
+        remaining = limit
+        
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            # La connexion est rendue au pool entre deux lots
+            with self.db.connection() as conn:
+                if position is None:
+                    chunk = conn.execute(
+                        "SELECT id, timestamp, input_data, expected_output FROM training_data "
+                        "WHERE model_name = ? ORDER BY timestamp DESC, id DESC LIMIT ?",
+                        (model_name, size)
+                    ).fetchall()
+                else:
+                    chunk = conn.execute(
+                        "SELECT id, timestamp, input_data, expected_output FROM training_data "
+                        "WHERE model_name = ? AND (timestamp, id) < (?, ?) "
+                        "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                        (model_name, position[0], position[1], size)
+                    ).fetchall()
+            
+            yield from chunk
+            if len(chunk) < size:
+                return
+            position = (chunk[-1][1], chunk[-1][0])
+            if remaining is not None:
+                remaining -= len(chunk)
+
+    def get_training_rows_since(self, last_id, limit=500):
+        """Lignes ajoutées après l'identifiant last_id, par id croissant (clé primaire)"""
+        with self.db.connection() as conn:
+            return conn.execute(
+                "SELECT id, model_name, input_data, expected_output FROM training_data "
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, limit)
+            ).fetchall()
+    
+    def get_watermark(self, name):
+        """Dernier identifiant traité par un traitement incrémental (0 si jamais exécuté)"""
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT watermark FROM improvement_state WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else 0
+    
+    def save_watermark(self, name, watermark):
+        """Enregistre le point de reprise d'un traitement incrémental"""
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO improvement_state (name, watermark, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP) "
+                "ON CONFLICT(name) DO UPDATE SET watermark = excluded.watermark, updated_at = excluded.updated_at",
+                (name, watermark)
+            )
+    
+    def log_performance(self, model_name, metrics):
+        """Enregistre des métriques {nom: valeur} dans performance_logs"""
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO performance_logs (model_name, metric_name, metric_value) VALUES (?, ?, ?)",
+                [(model_name, name, float(value)) for name, value in metrics.items()]
+            )
+
+def encode_cursor(timestamp, row_id):
+    """Curseur opaque de pagination"""
+    return base64.urlsafe_b64encode(f"{timestamp}|{row_id}".encode()).decode()
+
+def decode_cursor(cursor):
+    """Décode un curseur de pagination -> (timestamp, id)"""
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+        return timestamp, int(row_id)
+    except Exception:
+        raise ValueError("Curseur de pagination invalide")
+
+FALLBACK_RESPONSE = "J'ai analysé votre requête : '{query}'. En mode d'apprentissage, je peux traiter diverses demandes."
+
+def is_fallback_response(output):
+    """Réponse par défaut générée par le modèle : rien à en apprendre"""
+    prefix, _, suffix = FALLBACK_RESPONSE.partition("{query}")
+    return isinstance(output, str) and output.startswith(prefix) and output.endswith(suffix)
 
 class SelfImprovingSystem:
     """Système d'auto-amélioration de l'IA"""
     
-    def __init__(self, data_connector):
+    WATERMARK_NAME = "training_data"
+    
+    def __init__(self, data_connector, batch_size=500, max_batches=20, min_interval=5.0, max_interval=300.0):
         self.data_connector = data_connector
+        self.batch_size = batch_size
+        # Borne le coût d'un cycle : le reste du retard est traité au cycle suivant
+        self.max_batches = max_batches
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.processors = []
+        self.maintenance_tasks = []
         self.improvement_thread = None
         self.is_running = False
+        self._stop_event = threading.Event()
+        self._cycle_lock = threading.Lock()
+        self._last_cycle_at = None
+        self._stats = {
+            'cycles': 0,
+            'rows_processed': 0,
+            'last_cycle_rows': 0,
+            'last_cycle_ms': 0.0,
+            'ingest_rate': 0.0,
+            'errors': 0,
+        }
         logger.info("✅ Système d'auto-amélioration chargé")
     
+    def add_processor(self, processor):
+        """Enregistre processor(rows) appelé sur chaque lot de nouvelles lignes"""
+        self.processors.append(processor)
+    
+    def add_maintenance_task(self, task):
+        """Enregistre task() exécutée à la fin de chaque cycle (agrégation, rétention...)"""
+        self.maintenance_tasks.append(task)
+    
     def start_continuous_learning(self):
         """Démarre l'apprentissage continu en arrière-plan"""
         if self.is_running:
             return
         
         self.is_running = True
+        self._stop_event.clear()
         self.improvement_thread = threading.Thread(target=self._improvement_loop)
         self.improvement_thread.daemon = True
         self.improvement_thread.start()
         logger.info("🔄 Boucle d'amélioration démarrée")
     
+    def stop(self):
+        """Arrête la boucle d'amélioration à la fin du cycle courant"""
+        self.is_running = False
+        self._stop_event.set()
+    
     def _improvement_loop(self):
         """Boucle principale d'amélioration"""
         while self.is_running:
+            if self._stop_event.wait(self.interval):
+                break
             try:
-                # Simulation d'amélioration périodique
-                time.sleep(300)  # Toutes les 5 minutes
-                self._run_improvement_cycle()
+                result = self._run_improvement_cycle()
+                self.interval = self._next_interval(result)
             except Exception as e:
+                self._stats['errors'] += 1
                 logger.error(f"Erreur boucle amélioration: {e}")
-                time.sleep(60)
+                self.interval = self.max_interval
+            self._run_maintenance()
+    
+    def _run_maintenance(self):
+        """Tâches de maintenance indépendantes : une erreur n'arrête pas les suivantes"""
+        for task in self.maintenance_tasks:
+            try:
+                task()
+            except Exception as e:
+                self._stats['errors'] += 1
+                logger.error(f"Erreur maintenance: {e}")
+    
+    def _next_interval(self, result):
+        """Intervalle adapté au débit d'ingestion observé"""
+        if result['backlog']:
+            return self.min_interval
+        rate = self._stats['ingest_rate']
+        if rate <= 0:
+            return min(self.interval * 2, self.max_interval)
+        # Vise des cycles d'environ un lot complet de nouvelles lignes
+        return max(self.min_interval, min(self.max_interval, self.batch_size / rate))
     
     def _run_improvement_cycle(self):
-        """Exécute un cycle d'amélioration"""
-        logger.info("🔧 Cycle d'amélioration en cours...")
-        # Ici serait implémentée la logique d'optimisation des modèles
-        time.sleep(2)
-        logger.info("✅ Cycle d'amélioration terminé")
+        """Traite les lignes ajoutées depuis le dernier point de reprise"""
+        with self._cycle_lock:
+            start = time.perf_counter()
+            watermark = self.data_connector.get_watermark(self.WATERMARK_NAME)
+            rows_processed = 0
+            backlog = False
+            
+            for _ in range(self.max_batches):
+                raw_rows = self.data_connector.get_training_rows_since(watermark, self.batch_size)
+                if not raw_rows:
+                    break
+                rows = []
+                for row_id, model_name, input_json, output_json in raw_rows:
+                    try:
+                        rows.append({'id': row_id, 'model_name': model_name,
+                                     'input': json.loads(input_json), 'output': json.loads(output_json)})
+                    except ValueError:
+                        continue
+                for processor in self.processors:
+                    processor(rows)
+                watermark = raw_rows[-1][0]
+                # Point de reprise après chaque lot : un crash ne retraite qu'un lot
+                self.data_connector.save_watermark(self.WATERMARK_NAME, watermark)
+                rows_processed += len(raw_rows)
+                backlog = len(raw_rows) == self.batch_size
+            
+            duration_ms = (time.perf_counter() - start) * 1000
+            now = time.monotonic()
+            if self._last_cycle_at is not None and not backlog:
+                elapsed = max(now - self._last_cycle_at, 1e-3)
+                # Moyenne glissante du débit d'ingestion (lignes/s)
+                rate = rows_processed / elapsed
+                previous = self._stats['ingest_rate']
+                self._stats['ingest_rate'] = rate if previous == 0 else 0.7 * previous + 0.3 * rate
+            self._last_cycle_at = now
+            
+            self._stats['cycles'] += 1
+            self._stats['rows_processed'] += rows_processed
+            self._stats['last_cycle_rows'] = rows_processed
+            self._stats['last_cycle_ms'] = round(duration_ms, 3)
+            self.data_connector.log_performance('self_improvement', {
+                'cycle_duration_ms': duration_ms,
+                'cycle_rows': rows_processed,
+            })
+            if rows_processed:
+                logger.info(f"🔧 Cycle d'amélioration: {rows_processed} lignes en {duration_ms:.1f} ms")
+            return {'rows': rows_processed, 'duration_ms': duration_ms, 'watermark': watermark, 'backlog': backlog}
+    
+    def get_stats(self):
+        """Statistiques des cycles incrémentaux"""
+        stats = dict(self._stats)
+        stats['ingest_rate'] = round(stats['ingest_rate'], 3)
+        stats['interval'] = round(self.interval, 3)
+        stats['running'] = self.is_running
+        return stats
 
 class AdvancedAIModel:
     """Modèle IA avancé avec capacités d'apprentissage"""
     
-    def __init__(self, model_name="humean_core"):
+    def __init__(self, model_name="humean_core", cache_size=1024, cache_ttl=300.0, intents_file=None,
+                 db_manager=None, knowledge_max_entries=10000, vector_dim=256, similarity_threshold=0.8,
+                 learner_dim=1 << 18, learner_threshold=0.5, snapshot_dir=None, snapshot_interval=0,
+                 persist_every=10, persist_interval=30.0, sync_interval=0.0):
         self.model_name = model_name
-        self.knowledge_base = {}
+        self.db_manager = db_manager
+        self.knowledge_base = KnowledgeStore(db_manager, model_name, max_entries=knowledge_max_entries)
         self.patterns = {}
+        self.response_cache = ResponseCache(max_size=cache_size, ttl=cache_ttl)
+        self.intent_engine = IntentEngine(config_path=intents_file)
+        self.similarity_threshold = similarity_threshold
+        self.learner_dim = learner_dim
+        self.learner_threshold = learner_threshold
+        # Import différé : NumPy n'est chargé qu'à la création du modèle
+        from src.core.humean_vector_index import VectorIndex
+        from src.core.humean_online_learner import OnlineLearner
+        # (index vectoriel, modèle en ligne) remplacés ensemble par une seule affectation
+        # Index vectoriel borné comme la base de connaissances (même capacité, même éviction)
+        vector_index = VectorIndex(dim=vector_dim, threshold=similarity_threshold, max_entries=knowledge_max_entries,
+                                   eviction_sample=self.knowledge_base.eviction_sample)
+        self._state = (vector_index, OnlineLearner(dim=learner_dim))
+        # Sérialise les écritures (feedback, entraînement, instantanés) ; jamais pris par les requêtes
+        self._update_lock = threading.RLock()
+        self.snapshot_store = None
+        self.snapshot_version = None
+        self.snapshot_interval = snapshot_interval
+        self._last_snapshot_at = time.monotonic()
+        # Poids appris écrits tous les persist_every lots ou toutes les persist_interval s
+        self.persist_every = persist_every
+        self.persist_interval = persist_interval
+        self._unsaved_batches = 0
+        self._last_persist_at = time.monotonic()
+        # Version des poids en base déjà chargée ou écrite par ce processus
+        self._learner_version = 0
+        # Connaissances déjà indexées (learned_at) et instantané actif publié déjà appliqué
+        self._knowledge_cursor = ''
+        self._synced_snapshot = None
+        # Workers pre-fork : relecture de l'état partagé au plus toutes les sync_interval s (0 = jamais)
+        self.sync_interval = sync_interval
+        self._last_sync_at = time.monotonic()
+        self._sync_lock = threading.Lock()
+        if db_manager is not None:
+            from src.core.humean_snapshots import SnapshotStore
+            if snapshot_dir is None:
+                snapshot_dir = os.path.join(os.path.dirname(os.path.abspath(db_manager.db_path)), 'snapshots')
+            self.snapshot_store = SnapshotStore(db_manager, snapshot_dir)
+            self._restore_state()
         logger.info(f"🧠 Modèle {model_name} initialisé")
     
+    @property
+    def vector_index(self):
+        return self._state[0]
+    
+    @property
+    def learner(self):
+        return self._state[1]
+    
+    def _restore_state(self):
+        """Instantané actif publié (sinon le plus récent) projeté en mémoire ou, à défaut, réindexation complète"""
+        try:
+            self._synced_snapshot = self._published_versions()[1]
+            restored = self.load_snapshot(self._synced_snapshot) is not None
+            if not restored and self._synced_snapshot is not None:
+                restored = self.load_snapshot() is not None
+        except Exception as e:
+            logger.error(f"Erreur chargement instantané: {e}")
+            restored = False
+        if not restored:
+            self._load_learned_vectors()
+        self._load_learner_state()
+        # Poids déjà couverts par l'instantané : pas de rechargement à la première synchronisation
+        self._learner_version = max(self._learner_version, self.learner.get_stats()['updates'])
+        self._knowledge_cursor = self.knowledge_base.latest_learned_at()
+    
+    def _load_learned_vectors(self):
+        """Indexe les connaissances déjà apprises (sans les charger en mémoire)"""
+        try:
+            for key, entry in self.knowledge_base.iter_persisted():
+                self._index_knowledge(key, entry)
+            logger.info(f"🧮 {len(self.vector_index)} connaissances indexées")
+        except Exception as e:
+            logger.error(f"Erreur indexation connaissances: {e}")
+    
+    def _index_knowledge(self, key, entry, vector_index=None):
+        """Ajoute une connaissance textuelle à l'index vectoriel"""
+        if vector_index is None:
+            vector_index = self.vector_index
+        if isinstance(entry['input'], str) and entry['output'] is not None:
+            vector_index.add(key, entry['input'], entry['output'], entry_score(entry))
+    
+    def save_snapshot(self, keep=3):
+        """Instantané versionné de l'état appris (vecteurs + modèle en ligne) ; retourne la version"""
+        with self._update_lock:
+            vector_index, learner = self._state
+            vector_arrays, vector_strings = vector_index.export_state('vectors.')
+            learner_arrays, learner_strings, learner_metadata = learner.export_state('learner.')
+            version = self.snapshot_store.save(
+                self.model_name,
+                {**vector_arrays, **learner_arrays},
+                {**vector_strings, **learner_strings},
+                {
+                    # Connaissances postérieures réindexées au chargement
+                    'knowledge_watermark': self.knowledge_base.latest_learned_at(),
+                    'learner': learner_metadata,
+                }
+            )
+            self.snapshot_version = version
+            self._last_snapshot_at = time.monotonic()
+            self._publish_snapshot(version)
+        if keep:
+            self.snapshot_store.prune(self.model_name, keep=keep)
+        return version
+    
+    def load_snapshot(self, version=None):
+        """Charge un instantané (le plus récent si None) et l'active sans bloquer les requêtes"""
+        from src.core.humean_online_learner import OnlineLearner
+        from src.core.humean_vector_index import VectorIndex
+        
+        snapshot = self.snapshot_store.open(self.model_name, version)
+        if snapshot is None:
+            return None
+        vector_index = VectorIndex.from_snapshot(snapshot, 'vectors.', threshold=self.similarity_threshold,
+                                                 max_entries=self.knowledge_base.max_entries,
+                                                 eviction_sample=self.knowledge_base.eviction_sample)
+        learner = OnlineLearner(dim=self.learner_dim)
+        learner.load_snapshot(snapshot, 'learner.', snapshot.metadata.get('learner', {}))
+        with self._update_lock:
+            watermark = snapshot.metadata.get('knowledge_watermark')
+            if watermark:
+                for key, entry in self.knowledge_base.iter_learned_since(watermark):
+                    self._index_knowledge(key, entry, vector_index)
+            self._state = (vector_index, learner)
+            self.snapshot_version = snapshot.metadata['version']
+        self.response_cache.clear()
+        logger.info(f"📸 Instantané v{self.snapshot_version} actif ({len(vector_index)} connaissances)")
+        return self.snapshot_version
+    
+    def activate_snapshot(self, version):
+        """Active une version d'instantané dans ce processus et la publie pour les autres workers"""
+        with self._update_lock:
+            if self.load_snapshot(version) is None:
+                return None
+            self._publish_snapshot(version)
+            # Poids en base plus récents que l'instantané : ne pas annuler le retour arrière
+            self._learner_version = max(self._learner_version, self._published_versions()[0])
+        return version
+    
+    @property
+    def snapshot_state_name(self):
+        return f"{self.model_name}:active_snapshot"
+    
+    def _publish_snapshot(self, version):
+        """Instantané actif du groupe de workers (improvement_state)"""
+        if self.db_manager is None:
+            return
+        with self.db_manager.transaction() as conn:
+            conn.execute(
+                "INSERT INTO improvement_state (name, watermark, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP) "
+                "ON CONFLICT(name) DO UPDATE SET watermark = excluded.watermark, updated_at = excluded.updated_at",
+                (self.snapshot_state_name, version)
+            )
+        self._synced_snapshot = version
+    
+    def _published_versions(self):
+        """(version des poids appris en base, instantané actif publié ou None)"""
+        with self.db_manager.connection() as conn:
+            learner = conn.execute(
+                "SELECT version FROM ai_models WHERE name = ?", (self.learner_model_name,)
+            ).fetchone()
+            snapshot = conn.execute(
+                "SELECT watermark FROM improvement_state WHERE name = ?", (self.snapshot_state_name,)
+            ).fetchone()
+        return (int(learner[0]) if learner else 0), (snapshot[0] if snapshot else None)
+    
+    @property
+    def learner_model_name(self):
+        return f"{self.model_name}:learner"
+    
+    def _load_learner_state(self):
+        """Reprend l'apprentissage à partir des derniers poids enregistrés (si plus récents)"""
+        try:
+            with self.db_manager.connection() as conn:
+                row = conn.execute(
+                    "SELECT version, model_data FROM ai_models WHERE name = ?", (self.learner_model_name,)
+                ).fetchone()
+            if row and row[1] and int(row[0]) > self.learner.get_stats()['updates']:
+                self.learner.load_bytes(row[1])
+                self._learner_version = int(row[0])
+                logger.info(f"🎓 Apprentissage repris: {len(self.learner)} réponses connues")
+        except Exception as e:
+            logger.error(f"Erreur chargement poids appris: {e}")
+    
+    def _save_learner_state(self):
+        """Enregistre les poids appris dans ai_models"""
+        # Croissante même après un retour arrière sur un instantané : les autres workers rechargent
+        version = max(self.learner.get_stats()['updates'], self._learner_version + 1)
+        with self.db_manager.transaction() as conn:
+            conn.execute(
+                "INSERT INTO ai_models (name, version, model_data, training_date) VALUES (?, ?, ?, CURRENT_TIMESTAMP) "
+                "ON CONFLICT(name) DO UPDATE SET version = excluded.version, model_data = excluded.model_data, "
+                "training_date = excluded.training_date",
+                (self.learner_model_name, str(version), self.learner.to_bytes())
+            )
+        self._learner_version = version
+        self._unsaved_batches = 0
+        self._last_persist_at = time.monotonic()
+    
+    def flush_learner_state(self):
+        """Écrit les poids appris non encore enregistrés (arrêt du serveur)"""
+        with self._update_lock:
+            if self._unsaved_batches and self.db_manager is not None:
+                self._save_learner_state()
+    
+    def _is_volatile_answer(self, text, output):
+        """Réponse produite par une intention dépendant de l'instant (heure) : rien de stable à apprendre"""
+        intent = self.intent_engine.match(text, record=False)
+        return intent is not None and not intent.cacheable and intent.rendered(output)
+    
+    def train_from_rows(self, rows):
+        """Entraîne le modèle en ligne sur un lot de nouvelles lignes training_data"""
+        pairs = [
+            (row['input'], row['output']) for row in rows
+            if row['model_name'] == self.model_name and isinstance(row['input'], str)
+            and not is_fallback_response(row['output']) and not self._is_volatile_answer(row['input'], row['output'])
+        ]
+        with self._update_lock:
+            trained = self.learner.partial_fit(pairs)
+            if trained and self.db_manager is not None:
+                # Blob de poids (~1 Mo) réécrit par paliers, pas à chaque lot
+                self._unsaved_batches += 1
+                if (self._unsaved_batches >= self.persist_every
+                        or time.monotonic() - self._last_persist_at >= self.persist_interval):
+                    self._save_learner_state()
+                if self.snapshot_interval and time.monotonic() - self._last_snapshot_at >= self.snapshot_interval:
+                    self.save_snapshot()
+        return trained
+    
+    def sync_if_due(self):
+        """Relit l'état partagé écrit par les autres processus, au plus toutes les sync_interval s"""
+        if not self.sync_interval or self.db_manager is None:
+            return False
+        if time.monotonic() - self._last_sync_at < self.sync_interval:
+            return False
+        # Un seul thread synchronise ; les autres requêtes continuent avec l'état courant
+        if not self._sync_lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_sync_at = time.monotonic()
+            return self.sync_shared_state()
+        except Exception as e:
+            logger.error(f"Erreur synchronisation du modèle: {e}")
+            return False
+        finally:
+            self._sync_lock.release()
+    
+    # Recouvrement de la relecture des connaissances : écritures concurrentes validées dans le désordre
+    KNOWLEDGE_SYNC_OVERLAP = timedelta(seconds=5)
+    
+    def sync_shared_state(self):
+        """Applique l'état écrit par les autres workers : instantané activé, poids appris, connaissances
+        
+        Retourne True si l'état servi a changé.
+        """
+        learner_version, active_snapshot = self._published_versions()
+        changed = False
+        if active_snapshot is not None and active_snapshot != self._synced_snapshot:
+            self._synced_snapshot = active_snapshot
+            if active_snapshot != self.snapshot_version and self.load_snapshot(active_snapshot) is not None:
+                self._learner_version = max(self._learner_version, learner_version)
+                changed = True
+        if learner_version > self._learner_version:
+            changed = self._reload_learner() or changed
+        changed = self._sync_knowledge() or changed
+        if changed:
+            self.response_cache.clear()
+        return changed
+    
+    def _reload_learner(self):
+        """Charge les poids enregistrés par le worker d'entraînement"""
+        from src.core.humean_online_learner import OnlineLearner
+        
+        with self.db_manager.connection() as conn:
+            row = conn.execute(
+                "SELECT version, model_data FROM ai_models WHERE name = ?", (self.learner_model_name,)
+            ).fetchone()
+        if not row or not row[1]:
+            return False
+        # Nouveau modèle construit hors verrou puis publié par une seule affectation
+        learner = OnlineLearner(dim=self.learner_dim)
+        learner.load_bytes(row[1])
+        with self._update_lock:
+            self._state = (self.vector_index, learner)
+            self._learner_version = int(row[0])
+        logger.info(f"🔄 Poids appris v{row[0]} rechargés")
+        return True
+    
+    def _sync_knowledge(self):
+        """Indexe les connaissances apprises par les autres workers (feedback)"""
+        latest = self.knowledge_base.latest_learned_at()
+        if not latest or latest <= self._knowledge_cursor:
+            return False
+        since = self._knowledge_cursor
+        if since:
+            since = (datetime.fromisoformat(since) - self.KNOWLEDGE_SYNC_OVERLAP).isoformat()
+        count = 0
+        with self._update_lock:
+            for key, entry in self.knowledge_base.iter_learned_since(since):
+                self._index_knowledge(key, entry)
+                count += 1
+            self._knowledge_cursor = latest
+        logger.debug("Connaissances synchronisées: %s", count)
+        return count > 0
+    
     def process_query(self, input_data, context=None):
-        """Traite une requête et génère une réponse"""
+        """Traite une requête et génère une réponse (avec cache de réponses)"""
+        self.sync_if_due()
+        if not isinstance(input_data, str):
+            self.response_cache.record_bypass()
+            return self._compute_response(input_data, context)
+        
+        with span('intent_match'):
+            intent = self.intent_engine.match(input_data)
+        # Les intentions dépendant de l'instant (heure) ne sont jamais mises en cache
+        if intent is not None and not intent.cacheable:
+            self.response_cache.record_bypass()
+            return self._compute_response(input_data, context, intent)
+        
+        # Gabarit reprenant la requête : la réponse dépend de l'orthographe exacte, pas de la clé normalisée
+        if intent is not None and '{query}' in intent.response:
+            self.response_cache.record_bypass()
+            return self._compute_response(input_data, context, intent)
+        
+        key = make_cache_key(input_data, context)
+        result = self.response_cache.get_or_compute(
+            key,
+            lambda: self._compute_response(input_data, context, intent),
+            # Réponse par défaut : reprend la requête brute et sera remplacée dès le premier feedback
+            should_cache=lambda r: r['confidence'] > 0 and not is_fallback_response(r['response'])
+        )
+        # Copie pour ne pas exposer l'entrée partagée du cache
+        return dict(result, timestamp=datetime.now().isoformat())
+    
+    def process_batch(self, items, default_context=None):
+        """Traite un lot de requêtes ; une erreur n'affecte que son élément"""
+        results = []
+        for item in items:
+            try:
+                if isinstance(item, dict):
+                    if 'query' not in item:
+                        raise ValueError("Champ 'query' manquant")
+                    query, context = item['query'], item.get('context', default_context)
+                else:
+                    query, context = item, default_context
+                results.append(self.process_query(query, context))
+            except Exception as e:
+                results.append({'error': str(e)})
+        return results
+    
+    @traced('compute')
+    def _compute_response(self, input_data, context=None, intent=None):
+        """Calcule la réponse du modèle (sans cache)"""
         try:
             # Simulation de traitement IA
+            vector_index, learner = self._state
             if isinstance(input_data, str):
-                input_lower = input_data.lower()
-                
-                # Réponses contextuelles de base
-                if "bonjour" in input_lower or "salut" in input_lower:
-                    response = "Bonjour ! Je suis le système HUMEAN. Comment puis-je vous aider ?"
-                elif "heure" in input_lower:
-                    current_time = datetime.now().strftime("%H:%M:%S")
-                    response = f"Il est actuellement {current_time}"
-                elif "merci" in input_lower:
-                    response = "Je vous en prie ! N'hésitez pas si vous avez d'autres questions."
+                # Réponses contextuelles issues du moteur d'intentions
+                source = intent.name if intent is not None else None
+                if intent is not None:
+                    response = intent.render(input_data)
+                    confidence = intent.confidence
+                elif (learned := vector_index.best_answer(input_data)) is not None:
+                    # Réponse apprise la mieux notée parmi les requêtes similaires
+                    response = learned['output']
+                    confidence = round(learned['similarity'], 3)
+                    source = 'learned'
+                elif (predicted := learner.predict(input_data, self.learner_threshold)) is not None:
+                    # Réponse candidate la mieux classée par le modèle en ligne
+                    response, probability = predicted
+                    confidence = round(probability, 3)
+                    source = 'predicted'
                 else:
-                    response = f"J'ai analysé votre requête : '{input_data}'. En mode d'apprentissage, je peux traiter diverses demandes."
-                
-                confidence = 0.85
+                    response = FALLBACK_RESPONSE.format(query=input_data)
+                    confidence = 0.85
             else:
+                source = None
                 response = "Données complexes reçues. Traitement en cours..."
                 confidence = 0.75
             
@@ -203,6 +804,7 @@ class AdvancedAIModel:
                 'response': response,
                 'confidence': confidence,
                 'model': self.model_name,
+                'intent': source,
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -219,34 +821,162 @@ class AdvancedAIModel:
         """Apprend à partir du feedback reçu"""
         # Simulation d'apprentissage
         pattern_key = hashlib.md5(str(input_data).encode()).hexdigest()[:16]
-        self.knowledge_base[pattern_key] = {
-            'input': input_data,
-            'output': expected_output,
-            'score': feedback_score,
-            'learned_at': datetime.now().isoformat()
-        }
+        # Horodatage pris sous verrou : learned_at croissant, cohérent avec le point
+        # de reprise des instantanés
+        with self._update_lock:
+            entry = {
+                'input': input_data,
+                'output': expected_output,
+                'score': feedback_score,
+                'learned_at': datetime.now().isoformat()
+            }
+            self.knowledge_base[pattern_key] = entry
+            self._index_knowledge(pattern_key, entry)
+        # Une connaissance peut changer la réponse de toute requête similaire (recherche vectorielle),
+        # avec ou sans contexte : nouvelle génération de cache plutôt qu'une seule clé invalidée
+        self.response_cache.clear()
         logger.info(f"📚 Apprentissage à partir du feedback: {feedback_score}")
 
-# Initialisation de l'application Flask
-app = Flask(__name__)
-CORS(app)
-
-# Initialisation des composants globaux
-try:
-    db_manager = HumeanDatabase()
-    data_connector = DataConnector(db_manager)
-    ai_model = AdvancedAIModel()
-    improvement_system = SelfImprovingSystem(data_connector)
+class HumeanComponents:
+    """Composants du serveur, créés à la première utilisation (import sans effet de bord)"""
+    
+    def __init__(self, db_path="humean_data.db", start_background=True, run_improvement_loop=True):
+        self.db_path = db_path
+        self.start_background = start_background
+        # Faux dans les workers pre-fork secondaires : une seule boucle par groupe
+        self.run_improvement_loop = run_improvement_loop
+        self._lock = threading.RLock()
+        self._db_manager = None
+        self._data_connector = None
+        self._ai_model = None
+        self._improvement_system = None
+        self._timeseries = None
+        self._started = False
     
-    # Démarrage des systèmes d'arrière-plan
-    improvement_system.start_continuous_learning()
+    @property
+    def db_manager(self):
+        if self._db_manager is None:
+            with self._lock:
+                if self._db_manager is None:
+                    self._db_manager = HumeanDatabase(self.db_path)
+        return self._db_manager
     
-except Exception as e:
-    logger.error(f"❌ Erreur initialisation: {e}")
-    sys.exit(1)
+    @property
+    def data_connector(self):
+        if self._data_connector is None:
+            with self._lock:
+                if self._data_connector is None:
+                    self._data_connector = DataConnector(self.db_manager)
+        return self._data_connector
+    
+    @property
+    def ai_model(self):
+        if self._ai_model is None:
+            with self._lock:
+                if self._ai_model is None:
+                    self._ai_model = AdvancedAIModel(
+                        cache_size=int(os.environ.get('HUMEAN_CACHE_SIZE', 1024)),
+                        cache_ttl=float(os.environ.get('HUMEAN_CACHE_TTL', 300)),
+                        intents_file=os.environ.get('HUMEAN_INTENTS_FILE', DEFAULT_INTENTS_FILE),
+                        db_manager=self.db_manager,
+                        knowledge_max_entries=int(os.environ.get('HUMEAN_KB_MAX_ENTRIES', 10000)),
+                        similarity_threshold=float(os.environ.get('HUMEAN_SIMILARITY_THRESHOLD', 0.8)),
+                        snapshot_dir=os.environ.get('HUMEAN_SNAPSHOT_DIR'),
+                        snapshot_interval=float(os.environ.get('HUMEAN_SNAPSHOT_INTERVAL', 3600)),
+                        persist_every=int(os.environ.get('HUMEAN_LEARNER_PERSIST_BATCHES', 10)),
+                        persist_interval=float(os.environ.get('HUMEAN_LEARNER_PERSIST_INTERVAL', 30)),
+                        sync_interval=float(os.environ.get('HUMEAN_MODEL_SYNC_INTERVAL', 2.0))
+                    )
+        return self._ai_model
+    
+    @property
+    def improvement_system(self):
+        if self._improvement_system is None:
+            with self._lock:
+                if self._improvement_system is None:
+                    self._improvement_system = SelfImprovingSystem(
+                        self.data_connector,
+                        batch_size=int(os.environ.get('HUMEAN_IMPROVEMENT_BATCH', 500)),
+                        min_interval=float(os.environ.get('HUMEAN_IMPROVEMENT_MIN_INTERVAL', 5.0)),
+                        max_interval=float(os.environ.get('HUMEAN_IMPROVEMENT_MAX_INTERVAL', 300.0))
+                    )
+                    # Modèle créé au premier cycle seulement (démarrage rapide)
+                    self._improvement_system.add_processor(lambda rows: self.ai_model.train_from_rows(rows))
+                    self._improvement_system.add_maintenance_task(self.timeseries.maintain)
+        return self._improvement_system
+    
+    @property
+    def timeseries(self):
+        if self._timeseries is None:
+            with self._lock:
+                if self._timeseries is None:
+                    from src.core.humean_timeseries import HOUR, MINUTE, TimeSeriesStore
+                    self._timeseries = TimeSeriesStore(self.db_manager, retention={
+                        0: float(os.environ.get('HUMEAN_PERF_RAW_RETENTION', 2 * 86400)),
+                        MINUTE: float(os.environ.get('HUMEAN_PERF_MINUTE_RETENTION', 14 * 86400)),
+                        HOUR: float(os.environ.get('HUMEAN_PERF_HOUR_RETENTION', 180 * 86400)),
+                    })
+        return self._timeseries
+    
+    def ensure_started(self):
+        """Démarre les systèmes d'arrière-plan (une seule fois)"""
+        if self._started or not self.start_background:
+            return
+        with self._lock:
+            if self._started:
+                return
+            self.data_connector.enable_write_behind(
+                max_batch=int(os.environ.get('HUMEAN_TRAINING_BATCH', 500)),
+                flush_interval=float(os.environ.get('HUMEAN_TRAINING_FLUSH_INTERVAL', 0.5)),
+                max_queue=int(os.environ.get('HUMEAN_TRAINING_QUEUE_SIZE', 10000))
+            )
+            if self.run_improvement_loop:
+                self.improvement_system.start_continuous_learning()
+            atexit.register(self.shutdown)
+            self._started = True
+    
+    def warm_up(self):
+        """Initialise tous les composants immédiatement (ex: avant fork)"""
+        self.ai_model
+        self.improvement_system
+    
+    def shutdown(self):
+        """Arrête les systèmes d'arrière-plan et vide les files"""
+        if self._improvement_system is not None:
+            self._improvement_system.stop()
+        if self._ai_model is not None:
+            self._ai_model.flush_learner_state()
+        if self._data_connector is not None:
+            self._data_connector.shutdown()
+    
+    def collect_metrics(self):
+        """Jauges des composants internes lues à chaque export /metrics"""
+        if self._ai_model is None or self._data_connector is None:
+            # Pas d'initialisation forcée par un simple export de métriques
+            return []
+        pool = self._db_manager.get_pool_stats()
+        writer = self._data_connector.get_writer_stats()
+        cache = self._ai_model.response_cache.get_stats()
+        return [
+            ('humean_db_pool_checkouts_total', 'Emprunts de connexions SQLite', 'counter', pool['checkouts']),
+            ('humean_db_pool_wait_seconds_total', "Attente cumulée d'une connexion", 'counter', pool['total_wait_ms'] / 1000),
+            ('humean_db_pool_in_use', 'Connexions empruntées', 'gauge', pool['in_use']),
+            ('humean_training_queue_depth', "File d'écriture des données d'entraînement", 'gauge', writer.get('queue_depth', 0)),
+            ('humean_training_rows_dropped_total', "Lignes d'entraînement abandonnées", 'counter', writer.get('dropped', 0)),
+            ('humean_response_cache_hits_total', 'Succès du cache de réponses', 'counter', cache['hits']),
+            ('humean_response_cache_misses_total', 'Échecs du cache de réponses', 'counter', cache['misses']),
+            ('humean_response_cache_coalesced_total', 'Requêtes coalescées (singleflight)', 'counter', cache['coalesced']),
+            ('humean_knowledge_vectors', 'Connaissances indexées', 'gauge', len(self._ai_model.vector_index)),
+        ]
+
+api = Blueprint('humean', __name__)
+
+def components():
+    """Composants de l'application Flask courante"""
+    return current_app.extensions['humean_components']
 
 # Routes de l'API
-@app.route('/')
+@api.route('/')
 def serve_dashboard():
     """Route principale - Interface de dashboard"""
     try:
@@ -274,6 +1004,7 @@ def serve_dashboard():
                 <h2>Endpoints disponibles:</h2>
                 <div class="endpoints">
                     <div class="endpoint">POST /api/query - Interroger l'IA</div>
+                    <div class="endpoint">POST /api/query/batch - Interroger l'IA par lot</div>
                     <div class="endpoint">GET /api/health - Statut du serveur</div>
                     <div class="endpoint">POST /api/feedback - Envoyer du feedback</div>
                     <div class="endpoint">GET /api/models - Liste des modèles</div>
@@ -290,11 +1021,14 @@ def serve_dashboard():
         </html>
         """
 
-@app.route('/api/query', methods=['POST'])
+@api.route('/api/query', methods=['POST'])
 def handle_query():
     """Endpoint pour les requêtes IA"""
     try:
-        data = request.get_json()
+        ai_model = components().ai_model
+        data_connector = components().data_connector
+        with span('parse'):
+            data = request.get_json()
         
         if not data or 'query' not in data:
             return jsonify({'error': 'Données de requête manquantes'}), 400
@@ -303,53 +1037,103 @@ def handle_query():
         context = data.get('context', {})
         
         # Traitement par le modèle IA
-        result = ai_model.process_query(query, context)
+        with span('process_query'):
+            result = ai_model.process_query(query, context)
         
-        # Stockage pour apprentissage futur
+        # Stockage pour apprentissage futur (écriture différée)
         if data.get('store_for_training', True):
-            data_connector.store_training_data(
-                input_data=query,
-                expected_output=result['response'],
-                model_name=ai_model.model_name
-            )
+            with span('store'):
+                data_connector.queue_training_data(
+                    input_data=query,
+                    expected_output=result['response'],
+                    model_name=ai_model.model_name
+                )
         
+        # Événement à fort volume : interpolation différée, échantillonné par le filtre DEBUG
+        logger.debug("Requête traitée (source=%s, confiance=%s)", result.get('intent'), result.get('confidence'))
         return jsonify(result)
         
     except Exception as e:
         logger.error(f"Erreur endpoint /api/query: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/feedback', methods=['POST'])
+@api.route('/api/query/batch', methods=['POST'])
+def handle_query_batch():
+    """Endpoint pour un lot de requêtes IA (résultats dans l'ordre d'envoi)"""
+    try:
+        ai_model = components().ai_model
+        data_connector = components().data_connector
+        with span('parse'):
+            data = request.get_json()
+        
+        if not data or not isinstance(data.get('queries'), list):
+            return jsonify({'error': "Liste 'queries' manquante"}), 400
+        
+        queries = data['queries']
+        max_batch = int(os.environ.get('HUMEAN_MAX_BATCH', 256))
+        if len(queries) > max_batch:
+            return jsonify({'error': f'Lot trop grand ({len(queries)} > {max_batch})'}), 413
+        
+        with span('process_batch', size=len(queries)):
+            results = ai_model.process_batch(queries, data.get('context', {}))
+        
+        # Une seule transaction pour toutes les données d'entraînement du lot
+        if data.get('store_for_training', True):
+            rows = [
+                (item['query'] if isinstance(item, dict) else item, result['response'])
+                for item, result in zip(queries, results) if 'error' not in result
+            ]
+            if rows:
+                with span('store'):
+                    data_connector.store_training_data_many(rows, ai_model.model_name)
+        
+        return jsonify({
+            'results': results,
+            'count': len(results),
+            'errors': sum(1 for result in results if 'error' in result)
+        })
+        
+    except Exception as e:
+        logger.error(f"Erreur endpoint /api/query/batch: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/feedback', methods=['POST'])
 def handle_feedback():
     """Endpoint pour recevoir du feedback sur les réponses"""
     try:
-        data = request.get_json()
+        ai_model = components().ai_model
+        with span('parse'):
+            data = request.get_json()
         
         if not data or 'input_data' not in data or 'feedback_score' not in data:
             return jsonify({'error': 'Données de feedback incomplètes'}), 400
         
         # Apprentissage à partir du feedback
-        ai_model.learn_from_feedback(
-            input_data=data['input_data'],
-            expected_output=data.get('expected_output'),
-            feedback_score=data['feedback_score']
-        )
+        with span('learn_from_feedback'):
+            ai_model.learn_from_feedback(
+                input_data=data['input_data'],
+                expected_output=data.get('expected_output'),
+                feedback_score=data['feedback_score']
+            )
         
+        logger.debug("Feedback reçu (score=%s)", data['feedback_score'])
         return jsonify({'status': 'Feedback traité avec succès'})
         
     except Exception as e:
         logger.error(f"Erreur endpoint /api/feedback: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/models', methods=['GET'])
+@api.route('/api/models', methods=['GET'])
 def list_models():
     """Liste les modèles IA disponibles"""
     try:
+        ai_model = components().ai_model
         return jsonify({
             'models': [
                 {
                     'name': ai_model.model_name,
                     'status': 'active',
+                    'snapshot_version': ai_model.snapshot_version,
                     'capabilities': ['natural_language', 'pattern_recognition', 'continuous_learning']
                 }
             ]
@@ -358,7 +1142,38 @@ def list_models():
         logger.error(f"Erreur endpoint /api/models: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/models/snapshots', methods=['GET'])
+def list_snapshots():
+    """Instantanés versionnés du modèle"""
+    ai_model = components().ai_model
+    return jsonify({
+        'model': ai_model.model_name,
+        'active_version': ai_model.snapshot_version,
+        'snapshots': ai_model.snapshot_store.list(ai_model.model_name)
+    })
+
+@api.route('/api/models/snapshots', methods=['POST'])
+def create_snapshot():
+    """Enregistre un instantané de l'état appris"""
+    try:
+        version = components().ai_model.save_snapshot()
+        return jsonify({'status': 'success', 'version': version}), 201
+    except Exception as e:
+        logger.error(f"Erreur création instantané: {e}")
+        return jsonify({'error': 'Erreur création instantané'}), 500
+
+@api.route('/api/models/snapshots/<int:version>/activate', methods=['POST'])
+def activate_snapshot(version):
+    """Active à chaud une version d'instantané"""
+    try:
+        if components().ai_model.activate_snapshot(version) is None:
+            return jsonify({'error': f'Instantané v{version} introuvable'}), 404
+        return jsonify({'status': 'success', 'active_version': version})
+    except Exception as e:
+        logger.error(f"Erreur activation instantané: {e}")
+        return jsonify({'error': 'Erreur activation instantané'}), 500
+
+@api.route('/api/health', methods=['GET'])
 def health_check():
     """Endpoint de vérification de santé du serveur"""
     return jsonify({
@@ -371,57 +1186,175 @@ def health_check():
         }
     })
 
-@app.route('/api/system-status', methods=['GET'])
+@api.route('/api/system-status', methods=['GET'])
 def system_status():
     """Endpoint de statut détaillé du système"""
+    db_manager = components().db_manager
+    data_connector = components().data_connector
+    ai_model = components().ai_model
     return jsonify({
         'status': 'operational',
         'server_time': datetime.now().isoformat(),
         'version': '1.0.0',
         'active_models': 1,
         'database': 'connected',
+        'database_pool': db_manager.get_pool_stats(),
+        'training_writer': data_connector.get_writer_stats(),
+        'response_cache': ai_model.response_cache.get_stats(),
+        'intents': ai_model.intent_engine.get_stats(),
+        'knowledge_base': ai_model.knowledge_base.get_stats(),
+        'vector_index': ai_model.vector_index.get_stats(),
+        'online_learner': ai_model.learner.get_stats(),
+        'self_improvement': components().improvement_system.get_stats(),
+        'admission': current_app.extensions['humean_admission'].get_stats(),
+        'logging': get_logging_stats(),
+        'tracing': current_app.extensions['humean_tracing'].get_stats(),
         'learning_system': 'active'
     })
 
-@app.route('/api/training-data', methods=['GET'])
+@api.route('/api/performance/series', methods=['GET'])
+def performance_series():
+    """Série agrégée d'une métrique de performance (niveau d'agrégat le plus grossier possible)"""
+    metric = request.args.get('metric')
+    if not metric:
+        return jsonify({'error': "Paramètre 'metric' requis"}), 400
+    try:
+        end = float(request.args.get('end', time.time()))
+        start = float(request.args.get('start', end - 3600))
+        step = int(request.args.get('step', 60))
+    except ValueError:
+        return jsonify({'error': 'Paramètres start/end/step invalides'}), 400
+    if step <= 0 or end <= start:
+        return jsonify({'error': 'Intervalle invalide'}), 400
+    
+    model = request.args.get('model', 'self_improvement')
+    resolution, points = components().timeseries.query(model, metric, start, end, step)
+    return jsonify({
+        'model': model,
+        'metric': metric,
+        'step': step,
+        'resolution': resolution or 'raw',
+        'points': points
+    })
+
+@api.route('/api/training-data', methods=['GET'])
 def get_training_data():
-    """Récupère les données d'entraînement"""
+    """Récupère les données d'entraînement (pagination par curseur ou flux NDJSON)"""
     try:
+        ai_model = components().ai_model
+        data_connector = components().data_connector
         model_name = request.args.get('model', ai_model.model_name)
-        limit = int(request.args.get('limit', 100))
+        cursor = request.args.get('cursor')
+        if cursor:
+            decode_cursor(cursor)
+        
+        if request.args.get('format') == 'ndjson':
+            # Export en flux : mémoire constante, premier octet immédiat
+            limit = request.args.get('limit')
+            limit = int(limit) if limit else None
+            if limit is not None and limit < 1:
+                raise ValueError("Paramètre 'limit' invalide (minimum 1)")
+            
+            def generate():
+                for row_id, timestamp, input_json, output_json in data_connector.iter_training_rows(
+                        model_name, cursor=cursor, limit=limit):
+                    # Les colonnes sont déjà du JSON : pas de décodage/réencodage
+                    yield (f'{{"id": {row_id}, "timestamp": {json.dumps(timestamp)}, '
+                           f'"input": {input_json}, "output": {output_json}}}\n')
+            
+            return Response(generate(), mimetype='application/x-ndjson')
         
-        data = data_connector.get_training_data(model_name, limit)
-        return jsonify({'training_data': data})
+        limit = int(request.args.get('limit', 100))
+        if limit < 1:
+            raise ValueError("Paramètre 'limit' invalide (minimum 1)")
+        data, next_cursor = data_connector.get_training_data_page(model_name, limit, cursor)
+        return jsonify({'training_data': data, 'next_cursor': next_cursor})
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Erreur endpoint /api/training-data: {e}")
         return jsonify({'error': str(e)}), 500
 
 # Gestion des erreurs
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint non trouvé'}), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_error(error):
     return jsonify({'error': 'Erreur interne du serveur'}), 500
 
-if __name__ == '__main__':
+def admission_metrics(admission):
+    """Jauges des limiteurs de concurrence pour /metrics"""
+    samples = []
+    for name, stats in admission.get_stats().items():
+        samples.extend([
+            (f'humean_admission_{name}_limit', f'Limite de concurrence ({name})', 'gauge', stats['limit']),
+            (f'humean_admission_{name}_in_flight', f'Requêtes admises en cours ({name})', 'gauge', stats['in_flight']),
+            (f'humean_admission_{name}_shed_total', f'Requêtes rejetées 503 ({name})', 'counter', stats['shed']),
+        ])
+    return samples
+
+def create_app(humean_components=None):
+    """Fabrique d'application : aucune base ni thread créés avant la première requête"""
+    application = Flask(__name__)
+    CORS(application)
+    metrics = install_metrics(application)
+    # Avant le contrôle d'admission : l'attente en file fait partie de la trace
+    install_tracing(application)
+    # Rejet des surcharges avant tout travail (initialisation comprise)
+    admission = install_admission_control(application)
+    
+    if humean_components is None:
+        humean_components = HumeanComponents(db_path=os.environ.get('HUMEAN_DB_PATH', 'humean_data.db'))
+    application.extensions['humean_components'] = humean_components
+    application.before_request(humean_components.ensure_started)
+    metrics.registry.register_collector(humean_components.collect_metrics)
+    metrics.registry.register_collector(lambda: admission_metrics(admission))
+    
+    application.register_blueprint(api)
+    return application
+
+# Application par défaut (création paresseuse des composants)
+app = create_app()
+
+def __getattr__(name):
+    """Accès module aux composants de l'application par défaut (db_manager, ai_model, ...)"""
+    if name in ('db_manager', 'data_connector', 'ai_model', 'improvement_system'):
+        return getattr(app.extensions['humean_components'], name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def run_server(host=None, port=None, debug=None):
+    """Démarre le serveur HUMEAN (initialisation complète avant d'accepter les requêtes)"""
+    configure_logging()
     logger.info("🚀 Démarrage du serveur HUMEAN...")
     
     # Configuration du serveur
-    host = os.environ.get('HUMEAN_HOST', '127.0.0.1')
-    port = int(os.environ.get('HUMEAN_PORT', 5000))
-    debug = os.environ.get('HUMEAN_DEBUG', 'False').lower() == 'true'
+    host = host or os.environ.get('HUMEAN_HOST', '127.0.0.1')
+    port = port or int(os.environ.get('HUMEAN_PORT', 5000))
+    if debug is None:
+        debug = os.environ.get('HUMEAN_DEBUG', 'False').lower() == 'true'
+    
+    humean_components = app.extensions['humean_components']
+    try:
+        humean_components.warm_up()
+        humean_components.ensure_started()
+    except Exception as e:
+        logger.error(f"❌ Erreur initialisation: {e}")
+        sys.exit(1)
     
     logger.info(f"📍 Serveur accessible sur: http://{host}:{port}")
     logger.info("📋 Endpoints disponibles:")
     logger.info("   GET  /              - Dashboard")
     logger.info("   POST /api/query     - Requêtes IA")
+    logger.info("   POST /api/query/batch - Requêtes IA par lot")
     logger.info("   GET  /api/health    - Statut serveur")
     logger.info("   POST /api/feedback  - Feedback")
     logger.info("   GET  /api/models    - Modèles disponibles")
     logger.info("   GET  /api/system-status - Statut détaillé")
+    logger.info("   GET  /metrics       - Métriques Prometheus")
+    logger.info("   GET  /debug/slow-requests - Requêtes lentes (étapes)")
     
     try:
         app.run(
@@ -432,4 +1365,20 @@ if __name__ == '__main__':
         )
     except Exception as e:
         logger.error(f"❌ Erreur démarrage serveur: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+def run_production_server(host=None, port=None, workers=None):
+    """Démarre le serveur multi-processus pre-fork (application préchargée)"""
+    from src.core.humean_prefork import run_prefork
+    
+    configure_logging()
+    host = host or os.environ.get('HUMEAN_HOST', '127.0.0.1')
+    port = port or int(os.environ.get('HUMEAN_PORT', 5000))
+    workers = workers or int(os.environ.get('HUMEAN_WORKERS', os.cpu_count() or 1))
+    run_prefork(app, host=host, port=port, workers=workers)
+
+if __name__ == '__main__':
+    if int(os.environ.get('HUMEAN_WORKERS', 1)) > 1:
+        run_production_server()
+    else:
+        run_server()
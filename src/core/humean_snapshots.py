@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+INSTANTANÉS DE MODÈLE HUMEAN
+Format binaire versionné et aligné (en-tête JSON + tableaux alignés sur 64 octets),
+chargé par mmap en vues NumPy sans copie ; fichiers annexes indexés dans model_snapshots
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+
+import numpy as np
+
+logger = logging.getLogger("HumeanServer")
+
+MAGIC = b"HUMSNAP\0"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")  # magie, version du format, taille de l'en-tête
+
+
+class SnapshotError(ValueError):
+    """Instantané illisible ou incompatible"""
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class StringTable(Sequence):
+    """Valeurs JSON stockées bout à bout, décodées uniquement à l'accès"""
+
+    def __init__(self, data, offsets, indices=None):
+        self._data = data
+        self._offsets = offsets
+        # Sous-ensemble optionnel (positions dans la table complète)
+        self._indices = indices
+
+    @staticmethod
+    def encode(values):
+        """-> (octets uint8, décalages int64 de longueur n + 1)"""
+        chunks = [json.dumps(v, ensure_ascii=False).encode("utf-8") for v in values]
+        offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        np.cumsum([len(c) for c in chunks], out=offsets[1:])
+        return np.frombuffer(b"".join(chunks), dtype=np.uint8), offsets
+
+    def __len__(self):
+        return len(self._indices) if self._indices is not None else len(self._offsets) - 1
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        if self._indices is not None:
+            position = int(self._indices[position])
+        start, end = int(self._offsets[position]), int(self._offsets[position + 1])
+        return json.loads(self._data[start:end].tobytes())
+
+    def subset(self, indices):
+        """Vue restreinte aux positions données (sans décodage)"""
+        return StringTable(self._data, self._offsets, np.asarray(indices, dtype=np.int64))
+
+
+def _layout(arrays, strings, metadata):
+    """-> (préambule + en-tête, [(décalage absolu, tableau)], taille totale)"""
+    arrays = dict(arrays or {})
+    for name, values in (strings or {}).items():
+        arrays[f"{name}.data"], arrays[f"{name}.offsets"] = StringTable.encode(values)
+
+    table = {}
+    placed = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        table[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        placed.append((offset, array))
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({
+        "metadata": metadata or {},
+        "arrays": table,
+        "strings": sorted(strings or {}),
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header))
+    head = _PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)) + header
+    head += b"\0" * (data_start - len(head))
+    return head, [(data_start + o, array) for o, array in placed], data_start + offset
+
+
+def serialize(arrays=None, strings=None, metadata=None):
+    """Sérialise tableaux NumPy, tables de chaînes et métadonnées -> bytes"""
+    head, placed, total = _layout(arrays, strings, metadata)
+    buffer = bytearray(total)
+    buffer[:len(head)] = head
+    for start, array in placed:
+        if array.nbytes:
+            buffer[start:start + array.nbytes] = memoryview(array).cast("B")
+    return bytes(buffer)
+
+
+def write_snapshot(path, arrays=None, strings=None, metadata=None):
+    """Écrit un instantané de façon atomique (fichier temporaire + rename) ; retourne sa taille"""
+    head, placed, total = _layout(arrays, strings, metadata)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(head)
+        for start, array in placed:
+            if array.nbytes:
+                # Tableaux écrits directement depuis leur mémoire, sans copie intermédiaire
+                f.seek(start)
+                f.write(memoryview(array).cast("B"))
+        f.truncate(total)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return total
+
+
+class Snapshot:
+    """Instantané chargé : vues NumPy en lecture seule sur le tampon (mmap ou bytes)"""
+
+    def __init__(self, buffer, source=None):
+        self.source = source
+        if len(buffer) < _PREAMBLE.size:
+            raise SnapshotError("Instantané tronqué")
+        magic, version, header_len = _PREAMBLE.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise SnapshotError("Signature d'instantané invalide")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"Version de format non supportée: {version}")
+        header = json.loads(bytes(buffer[_PREAMBLE.size:_PREAMBLE.size + header_len]))
+        data_start = _align(_PREAMBLE.size + header_len)
+
+        self.metadata = header["metadata"]
+        self.arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + spec["offset"])
+            self.arrays[name] = array.reshape(spec["shape"])
+        self._strings = header["strings"]
+
+    def __contains__(self, name):
+        return name in self.arrays or name in self._strings
+
+    def array(self, name):
+        return self.arrays[name]
+
+    def strings(self, name):
+        return StringTable(self.arrays[f"{name}.data"], self.arrays[f"{name}.offsets"])
+
+
+def open_snapshot(path):
+    """Projette un fichier d'instantané en mémoire (aucune copie des tableaux)"""
+    with open(path, "rb") as f:
+        # Le mapping reste valide après fermeture du fichier, tant que des vues le référencent
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return Snapshot(mapped, source=path)
+
+
+def load_snapshot_bytes(data):
+    """Instantané depuis un bloc en mémoire (ex: BLOB SQLite)"""
+    return Snapshot(data)
+
+
+class SnapshotStore:
+    """Fichiers d'instantanés versionnés, indexés dans model_snapshots"""
+
+    def __init__(self, db_manager, directory):
+        self.db = db_manager
+        self.directory = directory
+
+    def save(self, model_name, arrays=None, strings=None, metadata=None):
+        """Écrit la version suivante et l'enregistre comme version courante ; retourne la version"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self.db.transaction() as conn:
+            version = conn.execute(
+                "SELECT COALESCE(MAX(version), 0) + 1 FROM model_snapshots WHERE model_name = ?", (model_name,)
+            ).fetchone()[0]
+            path = os.path.join(self.directory, f"{model_name}.v{version}.hsnap")
+            metadata = dict(metadata or {}, model_name=model_name, version=version)
+            size = write_snapshot(path, arrays, strings, metadata)
+            conn.execute(
+                "INSERT INTO model_snapshots (model_name, version, path, size_bytes) VALUES (?, ?, ?, ?)",
+                (model_name, version, path, size)
+            )
+            conn.execute(
+                "INSERT INTO ai_models (name, version, training_date) VALUES (?, ?, CURRENT_TIMESTAMP) "
+                "ON CONFLICT(name) DO UPDATE SET version = excluded.version, training_date = excluded.training_date",
+                (model_name, str(version))
+            )
+        logger.info(f"📸 Instantané {model_name} v{version} enregistré ({size} octets)")
+        return version
+
+    def list(self, model_name):
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                "SELECT version, path, size_bytes, created_at FROM model_snapshots "
+                "WHERE model_name = ? ORDER BY version DESC", (model_name,)
+            ).fetchall()
+        return [{'version': v, 'path': p, 'size_bytes': s, 'created_at': c} for v, p, s, c in rows]
+
+    def path_for(self, model_name, version=None):
+        """Chemin de la version demandée (la plus récente si None), ou None"""
+        with self.db.connection() as conn:
+            if version is None:
+                row = conn.execute(
+                    "SELECT path FROM model_snapshots WHERE model_name = ? ORDER BY version DESC LIMIT 1",
+                    (model_name,)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT path FROM model_snapshots WHERE model_name = ? AND version = ?",
+                    (model_name, version)
+                ).fetchone()
+        return row[0] if row else None
+
+    def open(self, model_name, version=None):
+        path = self.path_for(model_name, version)
+        if path is None or not os.path.exists(path):
+            return None
+        return open_snapshot(path)
+
+    def prune(self, model_name, keep=3):
+        """Supprime les versions les plus anciennes au-delà de `keep`"""
+        with self.db.transaction() as conn:
+            old = conn.execute(
+                "SELECT version, path FROM model_snapshots WHERE model_name = ? "
+                "ORDER BY version DESC LIMIT -1 OFFSET ?", (model_name, keep)
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM model_snapshots WHERE model_name = ? AND version = ?",
+                [(model_name, version) for version, _ in old]
+            )
+        for _, path in old:
+            try:
+                # Les processus qui ont projeté le fichier gardent leur mapping
+                os.remove(path)
+            except OSError:
+                pass
+        return len(old)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+SÉRIES TEMPORELLES DE PERFORMANCE HUMEAN
+Agrégats 1 min / 1 h / 1 jour (min, max, somme, nombre, esquisse de quantiles) calculés
+incrémentalement depuis performance_logs, rétention par niveau et lecture au niveau le plus grossier
+"""
+
+import json
+import logging
+import math
+import time
+
+logger = logging.getLogger("HumeanServer")
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+RESOLUTIONS = (MINUTE, HOUR, DAY)
+
+# Durée de conservation (secondes) ; None = illimitée. 0 désigne les points bruts.
+DEFAULT_RETENTION = {
+    0: 2 * DAY,
+    MINUTE: 14 * DAY,
+    HOUR: 180 * DAY,
+    DAY: None,
+}
+
+
+class QuantileSketch:
+    """Esquisse de quantiles fusionnable à erreur relative bornée (casiers logarithmiques)"""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+
+    def _key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key):
+        # Centre du casier : erreur relative <= relative_accuracy
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def add(self, value, count=1):
+        if value > 0:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + count
+        elif value < 0:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + count
+        else:
+            self.zeros += count
+        self.count += count
+
+    def merge(self, other):
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q):
+        """Valeur approchée du quantile q (0..1), None si vide"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+    def to_bytes(self):
+        return json.dumps({
+            "a": self.relative_accuracy,
+            "p": self.positive,
+            "n": self.negative,
+            "z": self.zeros,
+        }, separators=(",", ":")).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, data):
+        state = json.loads(data)
+        sketch = cls(state["a"])
+        sketch.positive = {int(k): c for k, c in state["p"].items()}
+        sketch.negative = {int(k): c for k, c in state["n"].items()}
+        sketch.zeros = state["z"]
+        sketch.count = sketch.zeros + sum(sketch.positive.values()) + sum(sketch.negative.values())
+        return sketch
+
+
+class _Bucket:
+    """Agrégat d'un intervalle : nombre, somme, min, max, esquisse"""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "sketch")
+
+    def __init__(self, count=0, total=0.0, minimum=None, maximum=None, sketch=None):
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+        self.sketch = sketch or QuantileSketch()
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.sketch.add(value)
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        for attr, pick in (("minimum", min), ("maximum", max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else (mine if theirs is None else pick(mine, theirs)))
+        self.sketch.merge(other.sketch)
+
+    def to_point(self, timestamp, quantiles):
+        point = {
+            "t": timestamp,
+            "count": self.count,
+            "min": self.minimum,
+            "max": self.maximum,
+            "avg": self.total / self.count if self.count else None,
+        }
+        for q in quantiles:
+            point[f"p{round(q * 100):g}"] = self.sketch.quantile(q)
+        return point
+
+
+class TimeSeriesStore:
+    """Agrégation incrémentale et requêtes par intervalle sur performance_logs"""
+
+    WATERMARK_NAME = "performance_rollups"
+
+    def __init__(self, db_manager, resolutions=RESOLUTIONS, retention=None, chunk_size=5000):
+        self.db = db_manager
+        self.resolutions = tuple(sorted(resolutions))
+        self.retention = dict(DEFAULT_RETENTION)
+        if retention:
+            self.retention.update(retention)
+        self.chunk_size = chunk_size
+        self._stats = {"points_rolled_up": 0, "raw_expired": 0, "rollups_expired": 0}
+
+    def record(self, model_name, metric_name, value, timestamp=None):
+        """Ajoute un point brut (horodatage epoch optionnel, sinon maintenant)"""
+        with self.db.transaction() as conn:
+            if timestamp is None:
+                conn.execute(
+                    "INSERT INTO performance_logs (model_name, metric_name, metric_value) VALUES (?, ?, ?)",
+                    (model_name, metric_name, float(value))
+                )
+            else:
+                conn.execute(
+                    "INSERT INTO performance_logs (model_name, metric_name, metric_value, timestamp) "
+                    "VALUES (?, ?, ?, datetime(?, 'unixepoch'))",
+                    (model_name, metric_name, float(value), int(timestamp))
+                )
+
+    def _watermark(self, conn):
+        row = conn.execute(
+            "SELECT watermark FROM improvement_state WHERE name = ?", (self.WATERMARK_NAME,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def rollup(self):
+        """Agrège les points bruts arrivés depuis le dernier passage ; retourne leur nombre"""
+        processed = 0
+        while True:
+            # Un lot par transaction : agrégats et point de reprise avancent ensemble
+            with self.db.transaction() as conn:
+                watermark = self._watermark(conn)
+                rows = conn.execute(
+                    "SELECT id, model_name, metric_name, metric_value, CAST(strftime('%s', timestamp) AS INTEGER) "
+                    "FROM performance_logs WHERE id > ? ORDER BY id LIMIT ?",
+                    (watermark, self.chunk_size)
+                ).fetchall()
+                if not rows:
+                    break
+                buckets = {}
+                for _, model_name, metric_name, value, epoch in rows:
+                    for resolution in self.resolutions:
+                        key = (model_name, metric_name, resolution, epoch - epoch % resolution)
+                        bucket = buckets.get(key)
+                        if bucket is None:
+                            bucket = buckets[key] = _Bucket()
+                        bucket.add(value)
+                self._merge_buckets(conn, buckets)
+                conn.execute(
+                    "INSERT INTO improvement_state (name, watermark, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP) "
+                    "ON CONFLICT(name) DO UPDATE SET watermark = excluded.watermark, updated_at = excluded.updated_at",
+                    (self.WATERMARK_NAME, rows[-1][0])
+                )
+            processed += len(rows)
+            if len(rows) < self.chunk_size:
+                break
+        self._stats["points_rolled_up"] += processed
+        return processed
+
+    @staticmethod
+    def _merge_buckets(conn, buckets):
+        for (model_name, metric_name, resolution, start), bucket in buckets.items():
+            row = conn.execute(
+                "SELECT count, total, min_value, max_value, sketch FROM performance_rollups "
+                "WHERE model_name = ? AND metric_name = ? AND resolution = ? AND bucket_start = ?",
+                (model_name, metric_name, resolution, start)
+            ).fetchone()
+            if row is not None:
+                bucket.merge(_Bucket(row[0], row[1], row[2], row[3], QuantileSketch.from_bytes(row[4])))
+            conn.execute(
+                "INSERT OR REPLACE INTO performance_rollups "
+                "(model_name, metric_name, resolution, bucket_start, count, total, min_value, max_value, sketch) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (model_name, metric_name, resolution, start, bucket.count, bucket.total,
+                 bucket.minimum, bucket.maximum, bucket.sketch.to_bytes())
+            )
+
+    def expire(self, now=None):
+        """Applique la rétention ; les points bruts ne sont supprimés qu'une fois agrégés"""
+        now = time.time() if now is None else now
+        raw_deleted = rollups_deleted = 0
+        with self.db.transaction() as conn:
+            raw_keep = self.retention.get(0)
+            if raw_keep is not None:
+                raw_deleted = conn.execute(
+                    "DELETE FROM performance_logs WHERE id <= ? AND timestamp < datetime(?, 'unixepoch')",
+                    (self._watermark(conn), int(now - raw_keep))
+                ).rowcount
+            for resolution in self.resolutions:
+                keep = self.retention.get(resolution)
+                if keep is None:
+                    continue
+                rollups_deleted += conn.execute(
+                    "DELETE FROM performance_rollups WHERE resolution = ? AND bucket_start < ?",
+                    (resolution, int(now - keep))
+                ).rowcount
+        self._stats["raw_expired"] += raw_deleted
+        self._stats["rollups_expired"] += rollups_deleted
+        return raw_deleted, rollups_deleted
+
+    def maintain(self):
+        """Passage périodique : agrégation puis rétention"""
+        self.rollup()
+        self.expire()
+
+    def pick_resolution(self, step, start, now=None):
+        """Niveau le plus grossier dont le pas divise `step` et dont la rétention couvre `start`"""
+        now = time.time() if now is None else now
+        for resolution in reversed(self.resolutions):
+            keep = self.retention.get(resolution)
+            if resolution <= step and step % resolution == 0 and (keep is None or start >= now - keep):
+                return resolution
+        return 0
+
+    def query(self, model_name, metric_name, start, end, step=MINUTE, quantiles=(0.5, 0.9, 0.99), now=None):
+        """Points agrégés par pas de `step` secondes sur [start, end) -> (résolution lue, points)"""
+        step = max(int(step), 1)
+        resolution = self.pick_resolution(step, start, now)
+        merged = {}
+        with self.db.connection() as conn:
+            if resolution:
+                rows = conn.execute(
+                    "SELECT bucket_start, count, total, min_value, max_value, sketch FROM performance_rollups "
+                    "WHERE model_name = ? AND metric_name = ? AND resolution = ? "
+                    "AND bucket_start >= ? AND bucket_start < ? ORDER BY bucket_start",
+                    (model_name, metric_name, resolution, int(start), int(end))
+                ).fetchall()
+                for bucket_start, count, total, minimum, maximum, sketch in rows:
+                    slot = bucket_start - bucket_start % step
+                    bucket = _Bucket(count, total, minimum, maximum, QuantileSketch.from_bytes(sketch))
+                    if slot in merged:
+                        merged[slot].merge(bucket)
+                    else:
+                        merged[slot] = bucket
+            else:
+                # Pas plus fin que le plus petit agrégat : lecture des points bruts
+                rows = conn.execute(
+                    "SELECT CAST(strftime('%s', timestamp) AS INTEGER), metric_value FROM performance_logs "
+                    "WHERE model_name = ? AND metric_name = ? "
+                    "AND timestamp >= datetime(?, 'unixepoch') AND timestamp < datetime(?, 'unixepoch')",
+                    (model_name, metric_name, int(start), int(end))
+                ).fetchall()
+                for epoch, value in rows:
+                    merged.setdefault(epoch - epoch % step, _Bucket()).add(value)
+        points = [merged[slot].to_point(slot, quantiles) for slot in sorted(merged)]
+        return resolution, points
+
+    def get_stats(self):
+        with self.db.connection() as conn:
+            levels = dict(conn.execute(
+                "SELECT resolution, COUNT(*) FROM performance_rollups GROUP BY resolution"
+            ).fetchall())
+            watermark = self._watermark(conn)
+        stats = dict(self._stats)
+        stats["rollups"] = {str(r): levels.get(r, 0) for r in self.resolutions}
+        stats["watermark"] = watermark
+        return stats
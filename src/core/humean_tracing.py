@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+TRAÇAGE DES REQUÊTES HUMEAN
+Arbre d'étapes (spans) par requête, durées renvoyées dans l'en-tête Server-Timing
+et tampon circulaire des requêtes lentes consultable sur /debug/slow-requests
+"""
+
+import functools
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import g, jsonify, request
+
+_local = threading.local()
+_TOKEN = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class Span:
+    """Étape chronométrée ; les temps additionnels (ex: base) sont cumulés dans `timings`"""
+
+    __slots__ = ("name", "start", "end", "children", "attrs", "timings")
+
+    def __init__(self, name, attrs=None):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end = None
+        self.children = []
+        self.attrs = attrs or {}
+        self.timings = {}
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def finish(self):
+        if self.end is None:
+            self.end = time.perf_counter()
+
+    def to_dict(self, origin):
+        node = {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+        }
+        if self.attrs:
+            node["attrs"] = self.attrs
+        if self.timings:
+            node["timings_ms"] = {name: round(s * 1000, 3) for name, s in self.timings.items()}
+        if self.children:
+            node["children"] = [child.to_dict(origin) for child in self.children]
+        return node
+
+
+def current_span():
+    return getattr(_local, "current", None)
+
+
+@contextmanager
+def span(name, **attrs):
+    """Étape fille de l'étape courante ; sans effet hors d'une requête tracée"""
+    parent = getattr(_local, "current", None)
+    if parent is None:
+        yield None
+        return
+    child = Span(name, attrs)
+    parent.children.append(child)
+    _local.current = child
+    try:
+        yield child
+    finally:
+        child.finish()
+        _local.current = parent
+
+
+def traced(name=None):
+    """Décorateur : exécute la fonction dans une étape (nom de la fonction par défaut)"""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "current", None) is None:
+                return func(*args, **kwargs)
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_timing(name, seconds):
+    """Cumule une durée mesurée ailleurs (ex: connexion SQLite rendue au pool) sur l'étape courante"""
+    current = getattr(_local, "current", None)
+    if current is None:
+        return
+    current.timings[name] = current.timings.get(name, 0.0) + seconds
+    root = _local.root
+    if root is not current:
+        root.timings[name] = root.timings.get(name, 0.0) + seconds
+
+
+def server_timing(root):
+    """Valeur d'en-tête Server-Timing : étapes de premier niveau, temps cumulés, total"""
+    totals = {}
+    for child in root.children:
+        totals[child.name] = totals.get(child.name, 0.0) + child.duration
+    for name, seconds in root.timings.items():
+        totals[name] = totals.get(name, 0.0) + seconds
+    parts = [f"{_TOKEN.sub('_', name)};dur={seconds * 1000:.2f}" for name, seconds in totals.items()]
+    parts.append(f"total;dur={root.duration * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class FlaskTracing:
+    """Trace chaque requête Flask ; conserve les plus lentes dans un tampon circulaire"""
+
+    def __init__(self, slow_threshold_ms=None, capacity=None, emit_header=None):
+        env = os.environ
+        if slow_threshold_ms is None:
+            slow_threshold_ms = float(env.get('HUMEAN_SLOW_REQUEST_MS', 250))
+        if capacity is None:
+            capacity = int(env.get('HUMEAN_TRACE_BUFFER', 100))
+        if emit_header is None:
+            emit_header = env.get('HUMEAN_SERVER_TIMING', 'true').lower() == 'true'
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.emit_header = emit_header
+        self._slow = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._stats = {"traced": 0, "slow": 0}
+
+    def init_app(self, app):
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.teardown_request(self._teardown)
+        app.add_url_rule('/debug/slow-requests', 'slow_requests', self._serve)
+        app.extensions['humean_tracing'] = self
+
+    def _before(self):
+        root = Span("request")
+        _local.root = _local.current = root
+        g._trace_root = root
+
+    def _after(self, response):
+        root = getattr(g, "_trace_root", None)
+        if root is None:
+            return response
+        root.finish()
+        if self.emit_header:
+            response.headers['Server-Timing'] = server_timing(root)
+        self._record(root, response.status_code)
+        g._trace_root = None
+        return response
+
+    def _teardown(self, error=None):
+        root = getattr(g, "_trace_root", None)
+        if root is not None:
+            # Exception non interceptée : after_request n'a pas été appelé
+            root.finish()
+            self._record(root, 500)
+            g._trace_root = None
+        _local.root = _local.current = None
+
+    def _record(self, root, status):
+        with self._lock:
+            self._stats["traced"] += 1
+            if root.duration < self.slow_threshold:
+                return
+            self._stats["slow"] += 1
+            self._slow.append({
+                "method": request.method,
+                "path": request.path,
+                "status": status,
+                "duration_ms": round(root.duration * 1000, 3),
+                "timestamp": datetime.now().isoformat(),
+                "server_timing": server_timing(root),
+                "spans": root.to_dict(root.start),
+            })
+
+    def slow_requests(self, limit=None):
+        """Requêtes lentes récentes, la plus récente en premier"""
+        with self._lock:
+            entries = list(self._slow)
+        entries.reverse()
+        return entries[:limit] if limit else entries
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["buffered"] = len(self._slow)
+        stats["slow_threshold_ms"] = self.slow_threshold * 1000
+        return stats
+
+    def _serve(self):
+        limit = request.args.get('limit', type=int)
+        return jsonify({
+            'threshold_ms': self.slow_threshold * 1000,
+            'requests': self.slow_requests(limit),
+        })
+
+
+def install_tracing(app, **options):
+    """Installe le traçage une seule fois par application"""
+    existing = app.extensions.get('humean_tracing')
+    if existing is not None:
+        return existing
+    tracing = FlaskTracing(**options)
+    tracing.init_app(app)
+    return tracing
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+INDEX VECTORIEL HUMEAN
+Requêtes encodées en vecteurs creux par hachage, stockés dans une matrice NumPy
+contiguë (une ligne mémoire par dimension) pour une similarité cosinus en O(nnz × n)
+"""
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEncoder:
+    """Encodeur à hachage signé (unigrammes + bigrammes de mots), stable entre processus"""
+
+    def __init__(self, dim=256):
+        self.dim = dim
+
+    def features(self, text):
+        """Retourne (indices uniques, valeurs normalisées L2) du vecteur creux"""
+        tokens = _TOKEN.findall(str(text).lower())
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        weights = {}
+        for gram in grams:
+            h = zlib.crc32(gram.encode("utf-8"))
+            index = h % self.dim
+            sign = 1.0 if (h >> 31) & 1 else -1.0
+            weights[index] = weights.get(index, 0.0) + sign
+
+        indices = np.fromiter(weights.keys(), dtype=np.intp, count=len(weights))
+        values = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+        norm = float(np.sqrt(np.dot(values, values)))
+        if norm == 0.0:
+            return indices[:0], values[:0]
+        return indices, values / norm
+
+    def encode(self, text):
+        """Vecteur dense normalisé"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        indices, values = self.features(text)
+        vector[indices] = values
+        return vector
+
+
+class VectorIndex:
+    """Index des connaissances apprises, ajouts incrémentaux sans reconstruction
+
+    Borné à max_entries entrées (None = sans limite) : au-delà, une nouvelle clé reprend la
+    colonne de l'entrée évincée (LRU pondérée par le score, comme KnowledgeStore).
+    """
+
+    def __init__(self, dim=256, initial_capacity=1024, threshold=0.8, max_entries=None, eviction_sample=8):
+        self.encoder = HashingEncoder(dim)
+        self.dim = dim
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.eviction_sample = eviction_sample
+        if max_entries is not None:
+            initial_capacity = min(initial_capacity, max_entries)
+        # Matrice transposée (dim, capacité) : chaque dimension est contiguë
+        self._matrix = np.zeros((dim, initial_capacity), dtype=np.float32)
+        self._size = 0
+        self._keys = []
+        self._outputs = []
+        self._scores = np.zeros(initial_capacity, dtype=np.float32)
+        # Clé -> position, de la moins récemment utilisée à la plus récente
+        self._positions = OrderedDict()
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def add(self, key, text, output, score=1.0):
+        """Ajoute ou met à jour une entrée (croissance géométrique de la matrice)"""
+        vector = self.encoder.encode(text)
+        with self._lock:
+            if self._positions is None:
+                self._materialize_locked()
+            position = self._positions.get(key)
+            if position is None and self.max_entries is not None and self._size >= self.max_entries:
+                position = self._evict_locked()
+                self._keys[position] = key
+                self._outputs[position] = output
+                self._positions[key] = position
+            elif position is None:
+                position = self._size
+                if position == self._matrix.shape[1]:
+                    self._grow_locked()
+                self._keys.append(key)
+                self._outputs.append(output)
+                self._positions[key] = position
+            else:
+                self._outputs[position] = output
+                self._positions.move_to_end(key)
+            self._matrix[:, position] = vector
+            self._scores[position] = score
+            if position == self._size:
+                # Publié après l'écriture de la colonne
+                self._size += 1
+
+    def _evict_locked(self):
+        """Évince parmi les plus anciennes entrées celle de plus faible score ; retourne sa position"""
+        candidates = []
+        for key in self._positions:
+            candidates.append(key)
+            if len(candidates) >= self.eviction_sample:
+                break
+        victim = min(candidates, key=lambda k: self._scores[self._positions[k]])
+        self._evictions += 1
+        return self._positions.pop(victim)
+
+    def _grow_locked(self):
+        capacity = max(self._matrix.shape[1] * 2, 16)
+        if self.max_entries is not None:
+            capacity = max(min(capacity, self.max_entries), self._size)
+        matrix = np.zeros((self.dim, capacity), dtype=np.float32)
+        matrix[:, :self._size] = self._matrix[:, :self._size]
+        scores = np.zeros(capacity, dtype=np.float32)
+        scores[:self._size] = self._scores[:self._size]
+        self._matrix, self._scores = matrix, scores
+
+    def _materialize_locked(self):
+        """Première écriture après chargement d'un instantané : copie des vues en lecture seule"""
+        if self.max_entries is not None and self._size > self.max_entries:
+            # Instantané plus grand que la limite : seules les entrées de meilleur score sont gardées
+            keep = np.sort(np.argsort(-self._scores[:self._size], kind="stable")[:self.max_entries])
+            self._evictions += self._size - len(keep)
+            self._matrix = self._matrix[:, keep]
+            self._scores = self._scores[keep]
+            self._keys = [self._keys[i] for i in keep.tolist()]
+            self._outputs = [self._outputs[i] for i in keep.tolist()]
+            self._size = len(keep)
+        self._keys = list(self._keys)
+        self._outputs = list(self._outputs)
+        self._positions = OrderedDict((key, position) for position, key in enumerate(self._keys))
+        self._grow_locked()
+
+    def export_state(self, prefix=""):
+        """(tableaux, tables de chaînes) pour un instantané de modèle"""
+        with self._lock:
+            size = self._size
+            arrays = {
+                prefix + "matrix": self._matrix[:, :size],
+                prefix + "scores": self._scores[:size],
+            }
+            strings = {prefix + "keys": self._keys[:size], prefix + "outputs": self._outputs[:size]}
+        return arrays, strings
+
+    @classmethod
+    def from_snapshot(cls, snapshot, prefix="", threshold=0.8, max_entries=None, eviction_sample=8):
+        """Index adossé aux vues d'un instantané : chargement sans copie ni décodage"""
+        matrix = snapshot.array(prefix + "matrix")
+        index = cls(dim=matrix.shape[0], initial_capacity=0, threshold=threshold,
+                    max_entries=max_entries, eviction_sample=eviction_sample)
+        index._matrix = matrix
+        index._scores = snapshot.array(prefix + "scores")
+        index._keys = snapshot.strings(prefix + "keys")
+        index._outputs = snapshot.strings(prefix + "outputs")
+        # Table clé -> position construite à la première écriture seulement
+        index._positions = None
+        index._size = matrix.shape[1]
+        return index
+
+    def _snapshot(self):
+        with self._lock:
+            return self._matrix, self._scores, self._size
+
+    def _similarities(self, matrix, size, text):
+        """Similarité cosinus de la requête avec les `size` premières entrées"""
+        indices, values = self.encoder.features(text)
+        sims = np.zeros(size, dtype=np.float32)
+        if size == 0:
+            return sims
+        buffer = np.empty(size, dtype=np.float32)
+        # Seules les dimensions non nulles de la requête sont lues
+        for index, value in zip(indices.tolist(), values.tolist()):
+            np.multiply(matrix[index, :size], value, out=buffer)
+            sims += buffer
+        return sims
+
+    def similarities(self, text):
+        """Similarité cosinus de la requête avec toutes les entrées"""
+        matrix, _, size = self._snapshot()
+        return self._similarities(matrix, size, text)
+
+    def search(self, text, k=5, threshold=None):
+        """Top-k (position, similarité) au-dessus du seuil, par similarité décroissante"""
+        return self.search_many([text], k, threshold)[0]
+
+    def search_many(self, texts, k=5, threshold=None):
+        """Recherche groupée sur un même instantané de la matrice"""
+        threshold = self.threshold if threshold is None else threshold
+        matrix, _, size = self._snapshot()
+        # Requêtes hachées très creuses (~10 dimensions non nulles) : un passage creux
+        # par requête lit bien moins de mémoire qu'un produit matriciel dense du lot
+        return [self._top_k(self._similarities(matrix, size, text), k, threshold) for text in texts]
+
+    @staticmethod
+    def _top_k(sims, k, threshold):
+        candidates = np.flatnonzero(sims >= threshold)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(sims[candidates], -k)[-k:]]
+        order = candidates[np.argsort(-sims[candidates], kind="stable")]
+        return [(int(i), float(sims[i])) for i in order]
+
+    def best_answer(self, text, k=5, threshold=None):
+        """Meilleure réponse apprise : score de feedback le plus élevé parmi les voisins"""
+        return self._pick(self.search(text, k, threshold))
+
+    def best_answers(self, texts, k=5, threshold=None):
+        """Version groupée de best_answer"""
+        return [self._pick(hits) for hits in self.search_many(texts, k, threshold)]
+
+    def _pick(self, hits):
+        if not hits:
+            return None
+        _, scores, _ = self._snapshot()
+        position, similarity = max(hits, key=lambda hit: (scores[hit[0]], hit[1]))
+        key = self._keys[position]
+        with self._lock:
+            # Réponse servie : entrée rafraîchie dans l'ordre d'éviction
+            if self._positions is not None and self._positions.get(key) == position:
+                self._positions.move_to_end(key)
+        return {
+            'key': key,
+            'output': self._outputs[position],
+            'similarity': similarity,
+            'score': float(scores[position])
+        }
+
+    def get_stats(self):
+        """Taille et empreinte mémoire de l'index"""
+        matrix, _, size = self._snapshot()
+        return {
+            "entries": size,
+            "capacity": matrix.shape[1],
+            "dim": self.dim,
+            "threshold": self.threshold,
+            "max_entries": self.max_entries,
+            "evictions": self._evictions,
+            "matrix_bytes": int(matrix.nbytes),
+        }
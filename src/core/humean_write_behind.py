@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+ÉCRITURE DIFFÉRÉE HUMEAN
+File bornée + thread écrivain qui regroupe les INSERT en une transaction
+"""
+
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger("HumeanServer")
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Tampon d'écriture vidé par lot (taille ou délai) via executemany"""
+
+    def __init__(self, db_manager, sql, max_batch=500, flush_interval=0.5,
+                 max_queue=10000, block_timeout=0.0, name="write-behind"):
+        self.db = db_manager
+        self.sql = sql
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.name = name
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "flushes": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Démarre le thread écrivain"""
+        if self.is_running:
+            return
+        self._thread = threading.Thread(target=self._writer_loop, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"🖊️ Écriture différée '{self.name}' démarrée")
+
+    def submit(self, row):
+        """Met une ligne en file; retourne False si elle a été abandonnée"""
+        try:
+            if self.block_timeout > 0:
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+            return False
+        with self._lock:
+            self._stats["enqueued"] += 1
+        return True
+
+    def stop(self, timeout=10.0):
+        """Vide la file puis arrête le thread écrivain"""
+        if not self.is_running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info(f"🛑 Écriture différée '{self.name}' arrêtée")
+
+    def _writer_loop(self):
+        """Boucle du thread écrivain"""
+        while True:
+            batch = []
+            stopping = False
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch.append(first)
+
+            # Regroupe jusqu'à la taille max ou l'expiration du délai
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+            if stopping:
+                break
+
+        # Vidage final de ce qui reste en file
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.max_batch):
+            self._flush(leftover[start:start + self.max_batch])
+
+    def _flush(self, batch):
+        """Écrit un lot dans une seule transaction"""
+        start = time.perf_counter()
+        try:
+            with self.db.transaction() as conn:
+                conn.executemany(self.sql, batch)
+            with self._lock:
+                self._stats["written"] += len(batch)
+                self._stats["flushes"] += 1
+                self._stats["last_batch_size"] = len(batch)
+                self._stats["last_flush_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        except Exception as e:
+            with self._lock:
+                self._stats["failed"] += len(batch)
+            logger.error(f"Erreur écriture différée '{self.name}': {e}")
+
+    def get_stats(self):
+        """Compteurs de la file d'écriture"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["running"] = self.is_running
+        return stats
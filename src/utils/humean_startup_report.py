@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+RAPPORT DE DÉMARRAGE HUMEAN
+Temps d'import par module (python -X importtime) et délai démarrage à froid -> première requête
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Exécuté dans un processus neuf pour mesurer un vrai démarrage à froid
+COLD_START_SCRIPT = r'''
+import json, time
+t0 = time.perf_counter()
+from core import humean_server
+t_import = time.perf_counter()
+client = humean_server.app.test_client()
+client.get('/api/health')
+t_first = time.perf_counter()
+client.post('/api/query', json={'query': 'bonjour', 'store_for_training': False})
+t_query = time.perf_counter()
+humean_server.app.extensions['humean_components'].shutdown()
+print(json.dumps({
+    'import_ms': round((t_import - t0) * 1000, 1),
+    'first_request_ms': round((t_first - t0) * 1000, 1),
+    'first_query_ms': round((t_query - t0) * 1000, 1),
+}))
+'''
+
+
+def _env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([ROOT_DIR, os.path.join(ROOT_DIR, 'src'), env.get('PYTHONPATH', '')])
+    env['PYTHONIOENCODING'] = 'utf-8'
+    return env
+
+
+def import_breakdown(module="core.humean_server"):
+    """Temps d'import (self, cumulé) en ms par module, via -X importtime"""
+    with tempfile.TemporaryDirectory() as workdir:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, cwd=workdir, env=_env()
+        )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        modules.append({
+            "module": name,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "top_level": len(name) == len(name.lstrip()),
+        })
+    return modules
+
+
+def cold_start():
+    """Délais depuis le lancement du processus : import, première requête, première requête IA"""
+    with tempfile.TemporaryDirectory() as workdir:
+        result = subprocess.run(
+            [sys.executable, "-c", COLD_START_SCRIPT],
+            capture_output=True, text=True, cwd=workdir, env=_env()
+        )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "échec démarrage")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport de démarrage HUMEAN")
+    parser.add_argument("--top", type=int, default=15, help="nombre de modules affichés")
+    parser.add_argument("--json", help="enregistre le rapport dans ce fichier")
+    args = parser.parse_args()
+
+    modules = import_breakdown()
+    timings = cold_start()
+
+    print("⏱️ RAPPORT DE DÉMARRAGE HUMEAN")
+    print("=" * 60)
+    print(f"   Import core.humean_server : {timings['import_ms']} ms")
+    print(f"   Première requête servie   : {timings['first_request_ms']} ms")
+    print(f"   Première requête IA       : {timings['first_query_ms']} ms")
+    print(f"\n📦 Modules les plus coûteux (cumulé, top {args.top}):")
+    for entry in sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)[:args.top]:
+        print(f"   {entry['cumulative_ms']:>8.1f} ms  (self {entry['self_ms']:>6.1f})  {entry['module'].strip()}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"timings": timings, "modules": modules}, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Rapport enregistré: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,25 +4,24 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 def start_server():
     '''Wrapper pour démarrer le serveur HUMEAN'''
-    from core.humean_server import app
-    import logging
+    from core.humean_server import app, configure_logging
     
-    # Configurer le logging pour éviter les erreurs d'encodage
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('humean_server.log', encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
+    # Journalisation asynchrone (thread d'écriture dédié, rotation du fichier)
+    configure_logging('humean_server.log')
     
     print('🚀 Démarrage du serveur HUMEAN...')
     print('📍 Accessible sur: http://127.0.0.1:5000')
     print('📝 Logs enregistrés dans: humean_server.log')
     print('🛑 Appuyez sur Ctrl+C pour arrêter')
     
-    app.run(host='127.0.0.1', port=5000, debug=False)
+    # HUMEAN_WORKERS > 1 : serveur pre-fork multi-processus
+    workers = int(os.environ.get('HUMEAN_WORKERS', 1))
+    if workers > 1:
+        from core.humean_prefork import run_prefork
+        print(f'🧬 Mode pre-fork: {workers} workers')
+        run_prefork(app, host='127.0.0.1', port=5000, workers=workers)
+    else:
+        app.run(host='127.0.0.1', port=5000, debug=False)
 
 if __name__ == '__main__':
     start_server()
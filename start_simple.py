@@ -10,13 +10,11 @@ print('🛑 Ctrl+C pour arrêter')
 print('=' * 40)
 
 try:
-    import core.humean_server
-    print('✅ Serveur démarré avec succès!')
+    from core.humean_server import run_server
+    print('✅ Serveur chargé, démarrage...')
     
-    # Garder le programme en vie
-    import time
-    while True:
-        time.sleep(1)
+    # Bloquant jusqu'à Ctrl+C
+    run_server()
 except KeyboardInterrupt:
     print('\n👋 Arrêt du serveur')
 except Exception as e:
@@ -0,0 +1,14 @@
+"""
+Configuration pytest HUMEAN
+Exécute les tests hors de l'arborescence pour ne pas polluer la base et les logs
+"""
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+# Le serveur crée sa base et son fichier de log dans le répertoire courant
+os.chdir(tempfile.mkdtemp(prefix="humean_tests_"))
@@ -0,0 +1,98 @@
+"""
+Tests du contrôle d'admission (limiteurs adaptatifs, rejet 503)
+"""
+import threading
+import time
+
+from flask import Flask
+
+from src.core.humean_admission import AdaptiveLimiter, install_admission_control
+
+
+def test_admits_up_to_limit_then_sheds_after_queue_timeout():
+    limiter = AdaptiveLimiter("t", initial_limit=2, max_limit=2, queue_timeout=0.02)
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+    start = time.perf_counter()
+    assert limiter.acquire() is None
+    assert time.perf_counter() - start >= 0.015
+    stats = limiter.get_stats()
+    assert stats["in_flight"] == 2 and stats["shed"] == 1
+
+
+def test_queued_request_is_admitted_on_release():
+    limiter = AdaptiveLimiter("t", initial_limit=1, max_limit=1, queue_timeout=1.0)
+    limiter.acquire()
+    threading.Timer(0.05, limiter.release, args=(0.05,)).start()
+    waited = limiter.acquire()
+    assert waited is not None and waited >= 0.03
+
+
+def test_full_queue_sheds_immediately():
+    limiter = AdaptiveLimiter("t", initial_limit=1, max_limit=1, queue_timeout=5.0, max_queue=0)
+    limiter.acquire()
+    start = time.perf_counter()
+    assert limiter.acquire() is None
+    assert time.perf_counter() - start < 0.05
+
+
+def test_limit_adapts_to_latency():
+    limiter = AdaptiveLimiter("t", initial_limit=10, min_limit=2, max_limit=100)
+    for _ in range(50):
+        for _ in range(10):
+            limiter.acquire()
+        for _ in range(10):
+            limiter.release(0.01)
+    grown = limiter.limit
+    assert grown > 10
+
+    for _ in range(3):
+        held = int(limiter.limit)
+        for _ in range(held):
+            limiter.acquire()
+        for _ in range(held):
+            limiter.release(0.5)  # latence x50 : saturation
+    assert limiter.limit < grown / 2
+
+
+def test_flask_returns_503_with_retry_after():
+    app = Flask(__name__)
+    gate = threading.Event()
+    limiter = AdaptiveLimiter("bulk", initial_limit=1, max_limit=1, queue_timeout=0.01)
+    install_admission_control(app, pools=[(('/slow',), limiter)])
+
+    @app.route('/slow')
+    def slow():
+        gate.wait(2)
+        return 'ok'
+
+    @app.route('/free')
+    def free():
+        return 'ok'
+
+    client = app.test_client()
+    first = threading.Thread(target=lambda: client.get('/slow'))
+    first.start()
+    while limiter.in_flight == 0:
+        time.sleep(0.001)
+
+    rejected = app.test_client().get('/slow')
+    assert rejected.status_code == 503
+    assert int(rejected.headers['Retry-After']) >= 1
+    assert app.test_client().get('/free').status_code == 200
+
+    gate.set()
+    first.join()
+    assert limiter.in_flight == 0
+    assert app.test_client().get('/slow').status_code == 200
+
+
+def test_server_app_classifies_routes():
+    from src.core.humean_server import HumeanComponents, create_app
+
+    app = create_app(HumeanComponents(start_background=False))
+    control = app.extensions['humean_admission']
+    assert control.limiter_for('/api/query').name == 'interactive'
+    assert control.limiter_for('/api/query/batch').name == 'bulk'
+    assert control.limiter_for('/data/connect/financial').name == 'bulk'
+    assert control.limiter_for('/api/health') is None
@@ -0,0 +1,50 @@
+"""
+Tests de la fabrique d'application et de l'initialisation paresseuse
+"""
+import os
+import subprocess
+import sys
+
+from conftest import ROOT_DIR
+
+
+def test_import_has_no_side_effects(tmp_path):
+    script = (
+        "import sys, threading\n"
+        "from core import humean_server\n"
+        "assert threading.active_count() == 1, threading.enumerate()\n"
+        "assert 'numpy' not in sys.modules\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT_DIR, os.path.join(ROOT_DIR, 'src')]))
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, check=True)
+    assert os.listdir(tmp_path) == []
+
+
+def test_components_are_created_on_first_use(tmp_path):
+    from core.humean_server import HumeanComponents, create_app
+
+    components = HumeanComponents(db_path=str(tmp_path / "lazy.db"))
+    app = create_app(components)
+    assert not (tmp_path / "lazy.db").exists()
+    assert components._ai_model is None
+
+    client = app.test_client()
+    assert client.get('/api/health').status_code == 200
+    assert (tmp_path / "lazy.db").exists()
+    assert components.improvement_system.is_running
+    assert components._ai_model is None
+
+    assert client.post('/api/query', json={'query': 'salut'}).get_json()['intent'] == 'greeting'
+    assert components._ai_model is not None
+    components.shutdown()
+    assert not components.improvement_system.is_running
+
+
+def test_apps_are_isolated(tmp_path):
+    from core.humean_server import HumeanComponents, create_app
+
+    first = create_app(HumeanComponents(db_path=str(tmp_path / "a.db"), start_background=False))
+    second = create_app(HumeanComponents(db_path=str(tmp_path / "b.db"), start_background=False))
+    first.test_client().post('/api/query', json={'query': 'isolé'})
+    rows = second.test_client().get('/api/training-data').get_json()['training_data']
+    assert rows == []
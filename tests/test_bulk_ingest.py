@@ -0,0 +1,68 @@
+"""
+Tests de l'ingestion en masse de raw_data (store_raw_data_many)
+"""
+import json
+import sqlite3
+
+import pytest
+
+from src.core.humean_data_connector import HumeanDataConnector
+
+
+@pytest.fixture
+def connector(tmp_path, capsys):
+    connector = HumeanDataConnector(db_path=str(tmp_path / "ingest.db"))
+    capsys.readouterr()
+    return connector
+
+
+def _rows(connector):
+    conn = sqlite3.connect(connector.db_path)
+    try:
+        return conn.execute(
+            "SELECT source_type, data_content, timestamp, processed FROM raw_data ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_generator_is_ingested_in_chunks_with_progress(connector, capsys):
+    calls = []
+    feed = (("financial", {"symbol": "AAPL", "i": i}) for i in range(25))
+    inserted = connector.store_raw_data_many(feed, chunk_size=10, progress=lambda total, chunk: calls.append((total, chunk)))
+
+    assert inserted == 25
+    assert calls == [(10, 10), (20, 10), (25, 5)]
+    rows = _rows(connector)
+    assert [json.loads(r[1])["i"] for r in rows] == list(range(25))
+    assert all(r[0] == "financial" and r[3] == 0 for r in rows)
+    # Aucune sortie par ligne
+    assert capsys.readouterr().out == ""
+
+
+def test_source_type_and_preserialized_json(connector):
+    inserted = connector.store_raw_data_many(['{"a": 1}', {"b": 2}], source_type="iot")
+    assert inserted == 2
+    rows = _rows(connector)
+    assert [(r[0], r[1]) for r in rows] == [("iot", '{"a": 1}'), ("iot", '{"b": 2}')]
+
+
+def test_explicit_timestamps_are_kept(connector):
+    connector.store_raw_data_many([("social", {"x": 1}, "2024-01-02 03:04:05")])
+    assert _rows(connector)[0][2] == "2024-01-02 03:04:05"
+
+
+def test_failed_chunk_is_rolled_back(connector):
+    def feed():
+        for i in range(15):
+            yield "financial", {"i": i}
+        yield "financial", {"bad": object()}  # non sérialisable
+
+    with pytest.raises(TypeError):
+        connector.store_raw_data_many(feed(), chunk_size=10)
+    # Premier lot validé, second annulé en entier
+    assert len(_rows(connector)) == 10
+
+
+def test_empty_input(connector):
+    assert connector.store_raw_data_many(iter(())) == 0
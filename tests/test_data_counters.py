@@ -0,0 +1,130 @@
+"""
+Tests des compteurs maintenus de get_data_stats (cohérence transactionnelle, réconciliation)
+"""
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.core.humean_data_connector import HumeanDataConnector
+from src.core.humean_jobs import CoalescingJob
+
+
+@pytest.fixture
+def connector(tmp_path, capsys):
+    connector = HumeanDataConnector(db_path=str(tmp_path / "counters.db"))
+    capsys.readouterr()
+    yield connector
+    connector.close()
+
+
+def _feed(n):
+    kinds = ["financial", "scientific", "social", "unknown"]
+    for i in range(n):
+        yield kinds[i % len(kinds)], {"symbol": "AAPL", "query": "ia", "topic": "ia", "i": i}
+
+
+def _scanned_stats(connector):
+    """Statistiques calculées par balayage complet (référence)"""
+    conn = sqlite3.connect(connector.db_path)
+    try:
+        return {
+            "total_data_points": conn.execute("SELECT COUNT(*) FROM raw_data").fetchone()[0],
+            "processed_data": conn.execute("SELECT COUNT(*) FROM raw_data WHERE processed = TRUE").fetchone()[0],
+            "p3_insights_generated": conn.execute("SELECT COUNT(*) FROM p3_insights").fetchone()[0],
+            "data_sources_connected": len(connector.data_sources),
+            "data_by_type": dict(conn.execute("SELECT source_type, COUNT(*) FROM raw_data GROUP BY source_type")),
+        }
+    finally:
+        conn.close()
+
+
+def test_counters_follow_every_write_path(connector):
+    connector.store_raw_data("iot", {"sensor": 1})
+    connector.store_raw_data_many(_feed(250), chunk_size=100)
+    connector.store_raw_data_many([{"query": "x"}] * 30, source_type="scientific")
+    connector.generate_p3_insights(chunk_size=64, max_chunks=2)
+    assert connector.get_data_stats() == _scanned_stats(connector)
+
+    connector.generate_p3_insights(chunk_size=64)
+    stats = connector.get_data_stats()
+    assert stats == _scanned_stats(connector)
+    assert stats["processed_data"] == stats["total_data_points"] == 281
+    assert connector.get_insight_backlog()["backlog_rows"] == 0
+
+
+def test_replayed_insight_chunk_does_not_double_count(connector):
+    connector.store_raw_data_many(_feed(40))
+    with connector.db_pool.connection() as conn:
+        chunk = next(connector._iter_unprocessed_chunks(conn, 40))
+        inserts, updates = connector._insights_for_chunk(chunk)
+        connector._write_insights(conn, inserts, updates)
+        connector._write_insights(conn, inserts, updates)
+    assert connector.get_data_stats() == _scanned_stats(connector)
+
+
+def test_failed_chunk_leaves_counters_untouched(connector):
+    def records():
+        yield from _feed(10)
+        raise RuntimeError("source interrompue")
+
+    with pytest.raises(RuntimeError):
+        connector.store_raw_data_many(records(), chunk_size=5)
+    stats = connector.get_data_stats()
+    assert stats["total_data_points"] == 10
+    assert stats == _scanned_stats(connector)
+
+
+def test_reconciliation_fixes_drift_from_external_writes(connector):
+    connector.store_raw_data_many(_feed(20))
+    conn = sqlite3.connect(connector.db_path)
+    conn.execute("DELETE FROM raw_data WHERE source_type = 'social'")
+    conn.execute("INSERT INTO raw_data (source_type, data_content) VALUES ('iot', '{}')")
+    conn.commit()
+    conn.close()
+    assert connector.get_data_stats() != _scanned_stats(connector)
+
+    drift = connector.reconcile_data_stats()
+    assert drift == {"raw_data": -4, "source_type:social": -5, "source_type:iot": 1}
+    assert connector.get_data_stats() == _scanned_stats(connector)
+    assert connector.reconcile_data_stats() == {}
+    assert connector.last_reconciliation["drift"] == {}
+
+
+def test_ingest_runs_during_reconciliation(connector, monkeypatch):
+    connector.store_raw_data_many(_feed(20))
+    inserted = []
+
+    def ingest_during_scan():
+        # Écrivain concurrent pendant le recomptage : ne doit pas attendre la fin du balayage
+        writer = threading.Thread(target=lambda: inserted.append(connector.store_raw_data_many(_feed(8))))
+        writer.start()
+        writer.join(5)
+        return 0
+
+    with connector.db_pool.connection() as conn:
+        conn.create_function("ingest_during_scan", 0, ingest_during_scan)
+    monkeypatch.setattr(connector, "COUNTER_RECOUNT_SQL",
+                        connector.COUNTER_RECOUNT_SQL + " UNION ALL SELECT 'probe', ingest_during_scan()")
+
+    assert connector.reconcile_data_stats() == {}
+    assert inserted == [8]
+    stats = connector.get_data_stats()
+    assert stats["total_data_points"] == 28
+    assert stats == _scanned_stats(connector)
+
+
+def test_periodic_job_runs_without_trigger():
+    runs = []
+    job = CoalescingJob(lambda: runs.append(time.monotonic()), name="test-periodic", min_interval=0.0, period=0.05)
+    job.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(runs) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        job.stop()
+    assert len(runs) >= 2
+    assert job.get_stats()["scheduled"] >= 2
+    assert job.get_stats()["triggers"] == 0
@@ -0,0 +1,109 @@
+"""
+Tests du pool de connexions SQLite HUMEAN
+"""
+import threading
+
+import pytest
+
+from src.core.humean_db_pool import SQLiteConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), max_size=2, timeout=1.0)
+    yield pool
+    pool.close()
+
+
+def test_pragmas_applied(pool):
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_connections_are_reused(pool):
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    stats = pool.get_stats()
+    assert stats["checkouts"] == 2
+    assert stats["connections"] == 1
+    assert stats["in_use"] == 0
+
+
+def test_nested_checkout_shares_connection(pool):
+    with pool.transaction() as outer:
+        outer.execute("CREATE TABLE t (x INTEGER)")
+        with pool.transaction() as inner:
+            assert inner is outer
+            inner.execute("INSERT INTO t VALUES (1)")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+
+def test_transaction_rolls_back_on_error(pool):
+    with pool.transaction() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    with pytest.raises(ValueError):
+        with pool.transaction() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise ValueError("boom")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_pool_is_bounded_and_records_waits(pool):
+    release = threading.Event()
+    held = threading.Barrier(3)
+
+    def hold():
+        with pool.connection():
+            held.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for t in threads:
+        t.start()
+    held.wait()
+
+    threading.Timer(0.05, release.set).start()
+    with pool.connection():
+        pass
+    for t in threads:
+        t.join()
+
+    stats = pool.get_stats()
+    assert stats["connections"] == 2
+    assert stats["waits"] == 1
+    assert stats["max_wait_ms"] > 0
+
+
+def test_server_routes_use_pool():
+    from core import humean_server
+
+    connector = humean_server.data_connector
+    assert connector.store_training_data("bonjour", "salut", "pool_test")
+    assert connector.get_training_data("pool_test") == [{'input': 'bonjour', 'output': 'salut'}]
+
+    client = humean_server.app.test_client()
+    stats = client.get('/api/system-status').get_json()['database_pool']
+    assert stats["checkouts"] >= 2
+
+
+def test_data_connector_uses_application_pool(pool, capsys):
+    from src.core.humean_data_connector import HumeanDataConnector
+
+    connector = HumeanDataConnector(pool=pool)
+    assert connector.db_path == pool.db_path
+    connector.store_raw_data("iot", {"sensor": 1})
+    connector.generate_p3_insights()
+    assert connector.get_data_stats()["p3_insights_generated"] == 1
+    assert len(connector.get_recent_insights()) == 1
+    assert pool.get_stats()["connections"] == 1
+
+    # Pool de l'application : non fermé avec le connecteur
+    connector.close()
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM raw_data").fetchone()[0] == 1
@@ -0,0 +1,84 @@
+"""
+Tests des cycles d'amélioration incrémentaux (point de reprise persistant)
+"""
+import pytest
+
+from core.humean_server import DataConnector, HumeanDatabase, SelfImprovingSystem
+
+
+@pytest.fixture
+def connector(tmp_path):
+    db = HumeanDatabase(str(tmp_path / "improve.db"))
+    db.init_database()
+    return DataConnector(db)
+
+
+def _seed(connector, count, start=0):
+    connector.store_training_data_many([(f"q{i}", f"r{i}") for i in range(start, start + count)], "m")
+
+
+def _performance(connector, metric):
+    with connector.db.connection() as conn:
+        return [row[0] for row in conn.execute(
+            "SELECT metric_value FROM performance_logs WHERE model_name = 'self_improvement' "
+            "AND metric_name = ? ORDER BY id", (metric,)
+        )]
+
+
+def test_cycle_processes_only_new_rows(connector):
+    system = SelfImprovingSystem(connector, batch_size=10)
+    seen = []
+    system.add_processor(lambda rows: seen.extend(r['input'] for r in rows))
+
+    _seed(connector, 25)
+    result = system._run_improvement_cycle()
+    assert result['rows'] == 25 and not result['backlog']
+    assert seen == [f"q{i}" for i in range(25)]
+
+    assert system._run_improvement_cycle()['rows'] == 0
+    _seed(connector, 3, start=25)
+    assert system._run_improvement_cycle()['rows'] == 3
+    assert seen[-3:] == ["q25", "q26", "q27"]
+    assert _performance(connector, 'cycle_rows') == [25, 0, 3]
+    assert len(_performance(connector, 'cycle_duration_ms')) == 3
+
+
+def test_watermark_survives_restart(connector):
+    _seed(connector, 12)
+    SelfImprovingSystem(connector, batch_size=5)._run_improvement_cycle()
+
+    restarted = SelfImprovingSystem(connector, batch_size=5)
+    seen = []
+    restarted.add_processor(lambda rows: seen.extend(rows))
+    _seed(connector, 2, start=12)
+    assert restarted._run_improvement_cycle()['rows'] == 2
+    assert [r['input'] for r in seen] == ["q12", "q13"]
+
+
+def test_cycle_is_bounded_and_reports_backlog(connector):
+    _seed(connector, 50)
+    system = SelfImprovingSystem(connector, batch_size=10, max_batches=2, min_interval=1.0)
+    result = system._run_improvement_cycle()
+    assert result['rows'] == 20 and result['backlog']
+    assert system._next_interval(result) == 1.0
+    assert connector.get_watermark(SelfImprovingSystem.WATERMARK_NAME) == result['watermark']
+
+
+def test_interval_backs_off_when_idle(connector):
+    system = SelfImprovingSystem(connector, min_interval=1.0, max_interval=8.0)
+    for expected in (2.0, 4.0, 8.0, 8.0):
+        system.interval = system._next_interval(system._run_improvement_cycle())
+        assert system.interval == expected
+
+
+def test_failing_processor_does_not_advance_watermark(connector):
+    _seed(connector, 5)
+    system = SelfImprovingSystem(connector)
+
+    def boom(rows):
+        raise RuntimeError("échec")
+
+    system.add_processor(boom)
+    with pytest.raises(RuntimeError):
+        system._run_improvement_cycle()
+    assert connector.get_watermark(SelfImprovingSystem.WATERMARK_NAME) == 0
@@ -0,0 +1,150 @@
+"""
+Tests de la génération d'insights P3 par lots (reprise après arrêt, idempotence)
+"""
+import sqlite3
+
+import pytest
+
+from src.core.humean_data_connector import HumeanDataConnector
+
+
+@pytest.fixture
+def connector(tmp_path, capsys):
+    connector = HumeanDataConnector(db_path=str(tmp_path / "insights.db"))
+    capsys.readouterr()
+    yield connector
+    connector.close()
+
+
+def _feed(n, start=0):
+    kinds = ["financial", "scientific", "social", "iot"]
+    for i in range(start, start + n):
+        kind = kinds[i % len(kinds)]
+        yield kind, {"symbol": "AAPL", "query": "ia", "topic": "ia", "sensor_type": "env", "i": i}
+
+
+def _query(connector, sql):
+    conn = sqlite3.connect(connector.db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_processes_backlog_in_id_ordered_chunks(connector):
+    connector.store_raw_data_many(_feed(2500))
+    calls = []
+    generated = connector.generate_p3_insights(chunk_size=1000, progress=lambda rows, insights: calls.append(rows))
+
+    assert generated == 2500
+    assert calls == [1000, 2000, 2500]
+    assert _query(connector, "SELECT COUNT(*) FROM raw_data WHERE processed = FALSE") == [(0,)]
+    assert _query(connector, "SELECT COUNT(DISTINCT raw_data_id), COUNT(*) FROM p3_insights") == [(2500, 2500)]
+
+
+def test_max_chunks_bounds_work_and_next_call_resumes(connector):
+    connector.store_raw_data_many(_feed(250))
+    assert connector.generate_p3_insights(chunk_size=100, max_chunks=1) == 100
+    assert _query(connector, "SELECT MIN(id) FROM raw_data WHERE processed = FALSE") == [(101,)]
+    assert connector.generate_p3_insights(chunk_size=100) == 150
+    assert connector.generate_p3_insights(chunk_size=100) == 0
+
+
+def test_crash_mid_backlog_resumes_without_reprocessing(connector, monkeypatch):
+    connector.store_raw_data_many(_feed(300))
+    original = connector._write_insights
+    writes = []
+
+    def failing_write(conn, inserts, updates):
+        if len(writes) == 1:
+            raise RuntimeError("arrêt brutal")
+        writes.append(len(inserts))
+        original(conn, inserts, updates)
+
+    monkeypatch.setattr(connector, "_write_insights", failing_write)
+    assert connector.generate_p3_insights(chunk_size=100) == 100
+    monkeypatch.setattr(connector, "_write_insights", original)
+
+    assert connector.generate_p3_insights(chunk_size=100) == 200
+    assert _query(connector, "SELECT COUNT(*), COUNT(DISTINCT raw_data_id) FROM p3_insights") == [(300, 300)]
+
+
+def test_replayed_chunk_does_not_duplicate_insights(connector):
+    connector.store_raw_data_many(_feed(10))
+    with connector.db_pool.connection() as conn:
+        chunk = next(connector._iter_unprocessed_chunks(conn, 10))
+        inserts, updates = connector._insights_for_chunk(chunk)
+        connector._write_insights(conn, inserts, updates)
+        connector._write_insights(conn, inserts, updates)
+    assert _query(connector, "SELECT COUNT(*) FROM p3_insights") == [(10,)]
+
+
+def test_rows_without_insight_are_not_rescanned(connector):
+    connector.store_raw_data_many([("unknown", {"x": 1}), ("financial", {"symbol": "AAPL"})])
+    assert connector.generate_p3_insights() == 1
+    assert _query(connector, "SELECT source_type, processed, p3_insight_generated FROM raw_data ORDER BY id") == [
+        ("unknown", 1, 0), ("financial", 1, 1)
+    ]
+
+
+def test_malformed_row_does_not_block_backlog(connector):
+    connector.store_raw_data_many([
+        ("financial", "not json"), ("scientific", {"query": "ia"}), ("social", "[1, 2]"), ("iot", {"sensor_type": "env"})
+    ])
+    conn = sqlite3.connect(connector.db_path)
+    conn.execute("INSERT INTO raw_data (source_type, data_content) VALUES ('financial', NULL)")
+    conn.commit()
+    conn.close()
+
+    assert connector.generate_p3_insights(chunk_size=2) == 2
+    assert _query(connector, "SELECT processed, p3_insight_generated FROM raw_data ORDER BY id") == [
+        (1, 0), (1, 1), (1, 0), (1, 1), (1, 0)
+    ]
+    assert connector.generate_p3_insights() == 0
+
+
+def test_parallel_pool_matches_serial_result(connector, tmp_path):
+    feed = list(_feed(1200)) + [("unknown", {"x": 1})]
+    connector.store_raw_data_many(feed)
+    calls = []
+    generated = connector.generate_p3_insights(chunk_size=100, workers=2,
+                                               progress=lambda rows, insights: calls.append(rows))
+
+    assert generated == 1200
+    assert calls[-1] == 1201
+    assert _query(connector, "SELECT COUNT(*) FROM raw_data WHERE processed = FALSE") == [(0,)]
+    assert _query(connector, "SELECT COUNT(*), COUNT(DISTINCT raw_data_id) FROM p3_insights") == [(1200, 1200)]
+    by_type = dict(_query(connector, "SELECT r.source_type, COUNT(*) FROM p3_insights i "
+                                     "JOIN raw_data r ON r.id = i.raw_data_id GROUP BY r.source_type"))
+    assert by_type == {"financial": 300, "scientific": 300, "social": 300, "iot": 300}
+
+
+def test_partitions_by_source_type(connector):
+    connector.store_raw_data_many([("social", {}), (None, {}), ("financial", {}), ("iot", {})])
+    with connector.db_pool.connection() as conn:
+        assert connector._unprocessed_source_types(conn) == ["financial", "iot", "social", None]
+        chunks = list(connector._iter_partition_chunks(conn, None, 10))
+    assert [[row[0] for row in chunk] for chunk in chunks] == [[2]]
+
+
+def test_parallel_respects_max_chunks(connector):
+    connector.store_raw_data_many(_feed(400))
+    assert connector.generate_p3_insights(chunk_size=50, max_chunks=3, workers=2) == 150
+    assert connector.generate_p3_insights(chunk_size=50, workers=2) == 250
+
+
+def test_small_backlog_stays_serial_and_pool_is_reused(connector):
+    connector.store_raw_data_many(_feed(10))
+    assert connector.generate_p3_insights(chunk_size=100, workers=2) == 10
+    assert connector._pool is None
+
+    connector.store_raw_data_many(_feed(400))
+    assert connector.generate_p3_insights(chunk_size=100, workers=2) == 400
+    pool = connector._pool
+    assert pool is not None
+    connector.store_raw_data_many(_feed(400))
+    assert connector.generate_p3_insights(chunk_size=100, workers=2) == 400
+    assert connector._pool is pool
+
+    connector.close()
+    assert connector._pool is None
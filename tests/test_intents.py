@@ -0,0 +1,87 @@
+"""
+Tests du moteur d'intentions compilé
+"""
+import json
+import os
+import time
+
+from src.core.humean_intents import IntentEngine, _trie_pattern
+
+
+def test_default_rules_keep_original_priority():
+    engine = IntentEngine()
+    assert engine.match("Salut, quelle heure est-il ?").name == "greeting"
+    assert engine.match("L'HEURE svp").name == "clock"
+    assert engine.match("merci bien").name == "thanks"
+    assert engine.match("analyse du marché") is None
+
+
+def test_substring_and_overlapping_keywords():
+    engine = IntentEngine(rules=[
+        {"name": "a", "keywords": ["cdef"], "response": "a"},
+        {"name": "b", "keywords": ["abcd", "ab"], "response": "b"},
+    ])
+    assert engine.match("xxabcdefxx").name == "a"
+    assert engine.match("zab").name == "b"
+
+
+def test_prefix_keyword_of_higher_priority_rule_wins():
+    # Même sémantique que la chaîne de `in` d'origine : première règle présente
+    engine = IntentEngine(rules=[
+        {"name": "b", "keywords": ["heure", "merci"], "response": "b"},
+        {"name": "c", "keywords": ["heures", "mercie"], "response": "c"},
+    ])
+    assert engine.match("deux heures").name == "b"
+    assert engine.match("je vous mercie").name == "b"
+
+    engine = IntentEngine(rules=[
+        {"name": "c", "keywords": ["heures"], "response": "c"},
+        {"name": "b", "keywords": ["heure"], "response": "b"},
+    ])
+    assert engine.match("deux heures").name == "c"
+    assert engine.match("une heure").name == "b"
+
+
+def test_trie_pattern_matches_every_keyword():
+    import re
+    keywords = ["heure", "heures", "hello", "help", "h"]
+    regex = re.compile(_trie_pattern(keywords))
+    for keyword in keywords:
+        assert regex.fullmatch(keyword)
+
+
+def test_counts_per_intent():
+    engine = IntentEngine()
+    engine.match("bonjour")
+    engine.match("salut")
+    engine.match("rien")
+    stats = engine.get_stats()
+    assert stats["matches"] == {"greeting": 2}
+    assert stats["unmatched"] == 1
+
+
+def test_hot_reload_from_file(tmp_path):
+    path = tmp_path / "intents.json"
+    path.write_text(json.dumps({"intents": [{"name": "one", "keywords": ["alpha"], "response": "1"}]}))
+    engine = IntentEngine(config_path=str(path), reload_interval=0)
+    assert engine.match("alpha").name == "one"
+
+    path.write_text(json.dumps({"intents": [{"name": "two", "keywords": ["beta"], "response": "2"}]}))
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    assert engine.match("beta").name == "two"
+    assert engine.match("alpha") is None
+
+    # Un fichier invalide conserve les règles actives
+    path.write_text("{invalid")
+    os.utime(path, (time.time() + 10, time.time() + 10))
+    assert engine.match("beta").name == "two"
+
+
+def test_model_uses_intents():
+    from core.humean_server import AdvancedAIModel
+
+    model = AdvancedAIModel(model_name="intent_test")
+    result = model.process_query("Bonjour !")
+    assert result['intent'] == "greeting"
+    assert result['response'].startswith("Bonjour")
+    assert model.process_query("Quelle heure ?")['response'].startswith("Il est actuellement")
@@ -0,0 +1,146 @@
+"""
+Tests de la tâche d'arrière-plan regroupée (déclenchements, cadence, relance)
+"""
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from src.core.humean_jobs import CoalescingJob
+
+
+@pytest.fixture
+def make_job():
+    jobs = []
+
+    def factory(func, min_interval=0.0):
+        job = CoalescingJob(func, name="test-job", min_interval=min_interval)
+        jobs.append(job)
+        job.start()
+        return job
+
+    yield factory
+    for job in jobs:
+        job.stop()
+
+
+def test_triggers_during_a_run_coalesce_into_one_rerun(make_job):
+    gate = threading.Event()
+    runs = []
+
+    def func():
+        runs.append(time.monotonic())
+        gate.wait(5)
+
+    job = make_job(func)
+    job.trigger()
+    while not job.get_stats()["running"]:
+        time.sleep(0.001)
+    for _ in range(20):
+        job.trigger()
+    gate.set()
+    assert job.wait_idle(5)
+
+    stats = job.get_stats()
+    assert len(runs) == 2
+    assert stats["triggers"] == 21
+    assert stats["coalesced"] == 19
+    assert stats["pending"] == 0
+
+
+def test_min_interval_bounds_run_rate(make_job):
+    runs = []
+    job = make_job(lambda: runs.append(time.monotonic()), min_interval=0.1)
+    job.trigger()
+    assert job.wait_idle(5)
+    job.trigger()
+    assert job.wait_idle(5)
+    assert len(runs) == 2
+    assert runs[1] - runs[0] >= 0.09
+
+
+def test_reruns_while_work_remains(make_job):
+    remaining = [3]
+
+    def func():
+        remaining[0] -= 1
+        return remaining[0] > 0
+
+    job = make_job(func)
+    job.trigger()
+    assert job.wait_idle(5)
+    assert remaining[0] == 0
+    assert job.get_stats()["runs"] == 3
+
+
+def test_failures_are_counted_and_job_keeps_running(make_job):
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    job = make_job(func)
+    job.trigger()
+    assert job.wait_idle(5)
+    job.trigger()
+    assert job.wait_idle(5)
+    stats = job.get_stats()
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "boom"
+    assert stats["runs"] == 2
+
+
+def test_data_connect_defers_insights_and_exposes_queue(tmp_path, monkeypatch):
+    from src.core import humean_data_api
+    from src.core.humean_data_connector import HumeanDataConnector
+
+    connector = HumeanDataConnector(db_path=str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(humean_data_api, "data_connector", connector)
+    job = CoalescingJob(humean_data_api._run_insight_generation, name="test-insights", min_interval=0.0)
+    monkeypatch.setattr(humean_data_api, "insight_job", job)
+
+    app = Flask(__name__)
+    humean_data_api.create_data_endpoints(app)
+    client = app.test_client()
+    try:
+        job.stop()
+        response = client.post('/data/connect/financial', json={'symbol': 'MSFT'})
+        assert response.get_json()["insights"] == "scheduled"
+
+        queue = client.get('/data/insights').get_json()["insight_queue"]
+        assert queue["pending"] == 1
+        assert queue["backlog_rows"] == 1
+        assert queue["lag_seconds"] >= 0
+
+        job.start()
+        assert job.wait_idle(5)
+        queue = client.get('/data/insights').get_json()["insight_queue"]
+        assert queue["backlog_rows"] == 0
+        assert queue["runs"] == 1
+        assert client.get("/data/insights").get_json()["data_stats"]["p3_insights_generated"] >= 1
+    finally:
+        job.stop()
+
+
+def test_insight_pass_without_progress_does_not_rearm(tmp_path, monkeypatch):
+    from src.core import humean_data_api
+    from src.core.humean_data_connector import HumeanDataConnector
+
+    connector = HumeanDataConnector(db_path=str(tmp_path / "stall.db"))
+    connector.store_raw_data_many([("financial", {"symbol": "AAPL"})])
+    monkeypatch.setattr(humean_data_api, "data_connector", connector)
+    monkeypatch.setattr(humean_data_api, "insight_progress", {"last_pass_rows": 0, "stalled_passes": 0})
+    # Écriture en échec : l'arriéré ne bouge pas
+    monkeypatch.setattr(connector, "_write_insights", lambda *args: (_ for _ in ()).throw(RuntimeError("verrou")))
+
+    assert humean_data_api._run_insight_generation() is False
+    assert humean_data_api.insight_progress == {"last_pass_rows": 0, "stalled_passes": 1}
+
+    monkeypatch.undo()
+    monkeypatch.setattr(humean_data_api, "data_connector", connector)
+    monkeypatch.setattr(humean_data_api, "insight_progress", {"last_pass_rows": 0, "stalled_passes": 0})
+    assert humean_data_api._run_insight_generation() is False
+    assert humean_data_api.insight_progress["last_pass_rows"] == 1
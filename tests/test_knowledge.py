@@ -0,0 +1,65 @@
+"""
+Tests de la base de connaissances bornée et persistante
+"""
+import pytest
+
+from src.core.humean_knowledge import KnowledgeStore
+
+
+@pytest.fixture
+def db(tmp_path):
+    from core.humean_server import HumeanDatabase
+
+    db = HumeanDatabase(db_path=str(tmp_path / "kb.db"), pool_size=2)
+    yield db
+    db.pool.close()
+
+
+def _entry(i, score=0.5):
+    return {'input': f"q{i}", 'output': f"r{i}", 'score': score, 'learned_at': "2026-01-01T00:00:00"}
+
+
+def test_memory_stays_bounded(db):
+    store = KnowledgeStore(db, max_entries=50)
+    for i in range(1000):
+        store[f"k{i}"] = _entry(i)
+    assert len(store) == 50
+    assert store.count_persisted() == 1000
+    assert store.get_stats()["evictions"] == 950
+
+
+def test_evicted_entries_fault_back_in(db):
+    store = KnowledgeStore(db, max_entries=2)
+    for i in range(5):
+        store[f"k{i}"] = _entry(i)
+    assert store["k0"]["output"] == "r0"
+    assert store.get_stats()["faults"] == 1
+    assert len(store) == 2
+
+
+def test_low_score_entries_are_evicted_first(db):
+    store = KnowledgeStore(db, max_entries=2, eviction_sample=2)
+    store["good"] = _entry(0, score=1.0)
+    store["bad"] = _entry(1, score=0.0)
+    store["new"] = _entry(2, score=0.5)
+    assert store.get_stats()["evictions"] == 1
+    assert "good" in store._entries
+    assert "bad" not in store._entries
+
+
+def test_survives_restart(db):
+    KnowledgeStore(db)["k"] = _entry(1)
+    reopened = KnowledgeStore(db)
+    assert reopened.get("k")["input"] == "q1"
+    assert reopened.get("missing") is None
+
+
+def test_feedback_endpoint_persists():
+    from core import humean_server
+
+    client = humean_server.app.test_client()
+    response = client.post('/api/feedback', json={
+        'input_data': 'capitale de la France', 'expected_output': 'Paris', 'feedback_score': 0.9
+    })
+    assert response.status_code == 200
+    assert humean_server.ai_model.knowledge_base.get_stats()["writes"] >= 1
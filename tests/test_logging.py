@@ -0,0 +1,150 @@
+"""
+Tests de la journalisation asynchrone (file + thread d'écriture, rotation, échantillonnage)
+"""
+import logging
+import os
+
+import pytest
+
+from src.core.humean_logging import (
+    DroppingQueueHandler, SamplingFilter, configure_logging, flush_logging, get_logging_stats, stop_logging,
+    use_process_log_file
+)
+
+
+@pytest.fixture
+def restore_root():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    for handler in handlers:
+        root.removeHandler(handler)
+    yield root
+    stop_logging()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def _lines(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_records_written_by_listener_thread(tmp_path, restore_root):
+    log_file = str(tmp_path / "server.log")
+    configure_logging(log_file, console=False)
+    logger = logging.getLogger("HumeanServer")
+    data = {'a': 1}
+    logger.info("requête %s", data)
+    data['a'] = 2  # interpolé au moment de l'appel, pas à l'écriture
+    flush_logging()
+
+    lines = _lines(log_file)
+    assert len(lines) == 1
+    assert "HumeanServer - INFO - requête {'a': 1}" in lines[0]
+    assert get_logging_stats()['async'] is True
+
+
+def test_exception_text_is_preserved(tmp_path, restore_root):
+    log_file = str(tmp_path / "server.log")
+    configure_logging(log_file, console=False)
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logging.getLogger("HumeanServer").exception("échec")
+    flush_logging()
+    content = "\n".join(_lines(log_file))
+    assert "échec" in content and "RuntimeError: boom" in content
+
+
+def test_size_rotation(tmp_path, restore_root):
+    log_file = str(tmp_path / "server.log")
+    configure_logging(log_file, max_bytes=500, backup_count=2, console=False)
+    logger = logging.getLogger("HumeanServer")
+    for i in range(100):
+        logger.info("ligne %d %s", i, "x" * 40)
+    stop_logging()
+    assert os.path.exists(log_file + ".1")
+    assert os.path.exists(log_file + ".2")
+    assert not os.path.exists(log_file + ".3")
+
+
+def test_debug_events_are_sampled(tmp_path, restore_root):
+    log_file = str(tmp_path / "server.log")
+    configure_logging(log_file, level="DEBUG", debug_sample_rate=10, console=False)
+    logger = logging.getLogger("HumeanServer")
+    for i in range(100):
+        logger.debug("événement %d", i)
+        logger.debug("autre %d", i)
+    for i in range(5):
+        logger.info("important %d", i)
+    flush_logging()
+    lines = _lines(log_file)
+    assert sum("événement" in line for line in lines) == 10
+    assert sum("autre" in line for line in lines) == 10
+    assert sum("important" in line for line in lines) == 5
+
+
+def test_sampling_filter_passes_other_levels():
+    sampler = SamplingFilter(rate=1000)
+    debug = logging.makeLogRecord({'levelno': logging.DEBUG, 'msg': 'x'})
+    warning = logging.makeLogRecord({'levelno': logging.WARNING, 'msg': 'x'})
+    assert sampler.filter(debug) is True
+    assert sampler.filter(debug) is False
+    assert all(sampler.filter(warning) for _ in range(10))
+
+
+def test_reconfigure_replaces_handler(tmp_path, restore_root):
+    configure_logging(str(tmp_path / "a.log"), console=False)
+    configure_logging(str(tmp_path / "b.log"), console=False)
+    installed = [h for h in logging.getLogger().handlers if isinstance(h, DroppingQueueHandler)]
+    assert len(installed) == 1
+    logging.getLogger("HumeanServer").warning("seconde configuration")
+    flush_logging()
+    assert _lines(str(tmp_path / "a.log")) == []
+    assert len(_lines(str(tmp_path / "b.log"))) == 1
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path, restore_root):
+    handler = configure_logging(str(tmp_path / "server.log"), queue_size=1, console=False)
+    # Thread d'écriture arrêté : la file ne se vide plus
+    handler_queue = handler.queue
+    stop_logging()
+    logging.getLogger().addHandler(handler)
+    handler.queue = handler_queue
+    try:
+        for i in range(5):
+            logging.getLogger("HumeanServer").warning("message %d", i)
+    finally:
+        logging.getLogger().removeHandler(handler)
+    assert handler.dropped >= 4
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="fork indisponible")
+def test_forked_child_writes_its_own_file(tmp_path, restore_root):
+    log_file = str(tmp_path / "server.log")
+    configure_logging(log_file, console=False)
+    logger = logging.getLogger("HumeanServer")
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            path = use_process_log_file("worker3")
+            logger.info("depuis le worker")
+            stop_logging()
+            code = 0 if path == str(tmp_path / "server.worker3.log") else 2
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    logger.info("depuis le maître")
+    flush_logging()
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert [line.split(" - ")[-1] for line in _lines(log_file)] == ["depuis le maître"]
+    assert [line.split(" - ")[-1] for line in _lines(tmp_path / "server.worker3.log")] == ["depuis le worker"]
+
+
+def test_process_log_file_without_file_target(restore_root):
+    configure_logging(None, console=False)
+    assert use_process_log_file("worker0") is None
@@ -0,0 +1,66 @@
+"""
+Tests des métriques Prometheus
+"""
+from flask import Flask
+
+from src.core.humean_metrics import MetricsRegistry, install_metrics
+
+
+def _sample(text, prefix):
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_histogram_and_counter_rendering():
+    registry = MetricsRegistry()
+    latency = registry.histogram("lat_seconds", "latence", ("route",), buckets=(0.1, 1.0))
+    latency.observe("/a", value=0.05)
+    latency.observe("/a", value=0.5)
+    latency.observe("/a", value=5.0)
+    text = registry.render()
+    assert '# TYPE lat_seconds histogram' in text
+    assert _sample(text, 'lat_seconds_bucket{route="/a",le="0.1"}') == 1
+    assert _sample(text, 'lat_seconds_bucket{route="/a",le="1"}') == 2
+    assert _sample(text, 'lat_seconds_bucket{route="/a",le="+Inf"}') == 3
+    assert _sample(text, 'lat_seconds_count{route="/a"}') == 3
+
+
+def test_routes_are_instrumented_including_errors():
+    app = Flask(__name__)
+    install_metrics(app)
+    assert install_metrics(app) is app.extensions['humean_metrics']
+
+    @app.route('/ok/<int:item>')
+    def ok(item):
+        return {'item': item}
+
+    @app.route('/boom')
+    def boom():
+        raise RuntimeError("boom")
+
+    client = app.test_client()
+    client.get('/ok/1')
+    client.get('/ok/2')
+    client.get('/boom')
+    client.get('/absent')
+    text = client.get('/metrics').get_data(as_text=True)
+
+    assert _sample(text, 'humean_http_requests_total{method="GET",route="/ok/<int:item>",status="200"}') == 2
+    assert _sample(text, 'humean_http_requests_total{method="GET",route="/boom",status="500"}') == 1
+    assert _sample(text, 'humean_http_requests_total{method="GET",route="<unmatched>",status="404"}') == 1
+    assert _sample(text, 'humean_http_requests_in_flight{route="/ok/<int:item>"}') == 0
+    assert _sample(text, 'humean_http_exceptions_total{route="/boom"}') == 1
+
+
+def test_server_metrics_include_db_time_and_components():
+    from core import humean_server
+
+    client = humean_server.app.test_client()
+    client.get('/api/training-data?limit=1')
+    text = client.get('/metrics').get_data(as_text=True)
+    assert _sample(text, 'humean_http_request_db_seconds_count{route="/api/training-data"}') >= 1
+    assert _sample(text, 'humean_http_request_db_seconds_sum{route="/api/training-data"}') > 0
+    assert 'humean_db_pool_checkouts_total' in text
+    assert 'humean_response_cache_hits_total' in text
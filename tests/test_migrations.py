@@ -0,0 +1,69 @@
+"""
+Tests des migrations du schéma et des plans de requête indexés
+"""
+import sqlite3
+
+import pytest
+
+from src.core.humean_migrations import SCHEMA_VERSION, apply_migrations, get_schema_version
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "schema.db"))
+    apply_migrations(conn)
+    yield conn
+    conn.close()
+
+
+def _plan(conn, sql, params=()):
+    return " | ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+def test_migrations_are_idempotent(conn):
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    assert apply_migrations(conn) == []
+
+
+def test_upgrades_legacy_database(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "legacy.db"))
+    conn.execute("CREATE TABLE raw_data (id INTEGER PRIMARY KEY AUTOINCREMENT, source_type TEXT, "
+                 "data_content TEXT, timestamp DATETIME, processed BOOLEAN DEFAULT FALSE, "
+                 "p3_insight_generated BOOLEAN DEFAULT FALSE)")
+    conn.execute("INSERT INTO raw_data (source_type, data_content) VALUES ('iot', '{}')")
+    conn.commit()
+
+    assert apply_migrations(conn) == [v for v in range(1, SCHEMA_VERSION + 1)]
+    assert conn.execute("SELECT COUNT(*) FROM raw_data").fetchone()[0] == 1
+    # Compteurs maintenus amorcés depuis les données existantes
+    counters = dict(conn.execute("SELECT counter, value FROM data_counters"))
+    assert counters == {"raw_data": 1, "processed": 0, "p3_insights": 0, "source_type:iot": 1}
+    conn.close()
+
+
+def test_training_data_plan_uses_index(conn):
+    plan = _plan(conn, "SELECT input_data, expected_output FROM training_data "
+                       "WHERE model_name = ? ORDER BY timestamp DESC LIMIT ?", ("humean_core", 10))
+    assert "idx_training_data_model_ts" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_unprocessed_raw_data_plan_uses_partial_index(conn):
+    plan = _plan(conn, "SELECT id, source_type, data_content FROM raw_data WHERE processed = FALSE")
+    assert "idx_raw_data_unprocessed" in plan
+
+
+def test_recent_insights_plan_uses_index(conn):
+    plan = _plan(conn, "SELECT i.insight_text, r.source_type FROM p3_insights i "
+                       "JOIN raw_data r ON i.raw_data_id = r.id ORDER BY i.generated_at DESC LIMIT ?", (5,))
+    assert "idx_p3_insights_generated_at" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_data_connector_applies_migrations(tmp_path):
+    from src.core.humean_data_connector import HumeanDataConnector
+
+    connector = HumeanDataConnector(db_path=str(tmp_path / "connector.db"))
+    conn = sqlite3.connect(connector.db_path)
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    conn.close()
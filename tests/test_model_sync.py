@@ -0,0 +1,111 @@
+"""
+Tests du partage de l'état appris entre processus (poids en base, synchronisation des workers)
+"""
+import sqlite3
+import time
+
+import pytest
+
+from src.core.humean_server import AdvancedAIModel, HumeanDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    return HumeanDatabase(str(tmp_path / "sync.db"))
+
+
+def _model(db, **kwargs):
+    return AdvancedAIModel(db_manager=db, learner_dim=1 << 12, snapshot_interval=0, **kwargs)
+
+
+def _rows(pairs, model_name="humean_core"):
+    return [{'id': i, 'model_name': model_name, 'input': q, 'output': o} for i, (q, o) in enumerate(pairs)]
+
+
+def _stored_version(db):
+    conn = sqlite3.connect(db.db_path)
+    try:
+        row = conn.execute("SELECT version FROM ai_models WHERE name = 'humean_core:learner'").fetchone()
+    finally:
+        conn.close()
+    return int(row[0]) if row else None
+
+
+def test_clock_answers_are_not_learned(db):
+    model = _model(db)
+    trained = model.train_from_rows(_rows([("quelle heure est-il", "Il est actuellement 14:03:22")] * 4))
+    assert trained == 0
+    assert model.intent_engine.get_stats()["matches"] == {}
+    # Même intention, réponse apprise fournie par un humain : conservée
+    assert model.train_from_rows(_rows([("heure d'ouverture", "de 9h à 18h")] * 4)) == 4
+
+
+def test_weights_are_persisted_every_n_batches(db):
+    model = _model(db, persist_every=3, persist_interval=3600)
+    for _ in range(2):
+        model.train_from_rows(_rows([("prix du billet", "10 euros")] * 3))
+    assert _stored_version(db) is None
+    model.train_from_rows(_rows([("prix du billet", "10 euros")] * 3))
+    assert _stored_version(db) == model.learner.get_stats()['updates']
+
+    model.train_from_rows(_rows([("horaires du musée", "9h-18h")] * 3))
+    model.flush_learner_state()
+    assert _stored_version(db) == model.learner.get_stats()['updates']
+
+
+def test_serving_worker_reloads_weights_written_by_trainer(db):
+    trainer = _model(db, persist_every=1)
+    worker = _model(db, sync_interval=0.01)
+    assert worker.learner.rank("prix du billet") == []
+
+    trainer.train_from_rows(_rows([("prix du billet", "10 euros")] * 4))
+    time.sleep(0.02)
+    worker.process_query("bonjour")
+    assert worker.learner.rank("prix du billet") == trainer.learner.rank("prix du billet")
+    # Version déjà chargée : pas de nouveau rechargement
+    assert worker.sync_shared_state() is False
+
+
+def test_feedback_from_another_worker_is_served(db):
+    worker_a = _model(db)
+    worker_b = _model(db)
+    assert worker_b.process_query("capitale du japon")['intent'] is None
+
+    worker_a.learn_from_feedback("capitale du japon", "Tokyo", 5)
+    assert worker_b.sync_shared_state() is True
+    result = worker_b.process_query("capitale du japon")
+    assert (result['response'], result['intent']) == ("Tokyo", "learned")
+    assert worker_b.sync_shared_state() is False
+
+
+def test_snapshot_activation_propagates_to_other_workers(db):
+    worker_a = _model(db)
+    worker_b = _model(db)
+    worker_a.learn_from_feedback("couleur du ciel", "bleu", 5)
+    assert worker_a.save_snapshot() == 1
+    worker_a.save_snapshot()
+
+    worker_b.sync_shared_state()
+    assert worker_b.snapshot_version == 2
+    assert worker_a.activate_snapshot(1) == 1
+    worker_b.sync_shared_state()
+    assert worker_b.snapshot_version == 1
+    assert worker_b.process_query("couleur du ciel")['response'] == "bleu"
+
+    # Redémarrage : l'instantané publié est repris, pas le plus récent
+    assert _model(db).snapshot_version == 1
+
+
+def test_learner_version_increases_after_rollback(db):
+    trainer = _model(db, persist_every=1)
+    worker = _model(db)
+    trainer.train_from_rows(_rows([("prix du billet", "10 euros")] * 4))
+    trainer.save_snapshot()
+    trainer.train_from_rows(_rows([("prix du billet", "12 euros")] * 8))
+    worker.sync_shared_state()
+
+    trainer.activate_snapshot(1)
+    worker.sync_shared_state()
+    trainer.train_from_rows(_rows([("horaires du musée", "9h-18h")] * 2))
+    assert worker.sync_shared_state() is True
+    assert worker.learner.rank("horaires du musée") == trainer.learner.rank("horaires du musée")
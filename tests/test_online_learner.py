@@ -0,0 +1,89 @@
+"""
+Tests du modèle en ligne (SGD sur caractéristiques hachées)
+"""
+import random
+
+import pytest
+
+from core.humean_online_learner import OnlineLearner
+
+TOPICS = {
+    "Il fera beau demain": ["temps", "pluie", "soleil", "météo", "nuages"],
+    "Le tarif est de 10 euros": ["prix", "coût", "tarif", "combien", "payer"],
+    "Ouvert de 9h à 18h": ["heure", "ouvert", "horaires", "fermeture", "matin"],
+}
+
+
+def _pairs(count, seed=0):
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(count):
+        answer = rng.choice(list(TOPICS))
+        pairs.append((" ".join(rng.sample(TOPICS[answer], 2)) + f" question {i}", answer))
+    return pairs
+
+
+@pytest.fixture(scope="module")
+def trained():
+    learner = OnlineLearner(dim=1 << 16)
+    learner.partial_fit(_pairs(3000))
+    return learner
+
+
+def test_ranks_the_matching_answer_first(trained):
+    assert trained.rank("quel temps avec la pluie")[0][0] == "Il fera beau demain"
+    assert trained.rank("combien faut il payer")[0][0] == "Le tarif est de 10 euros"
+    assert trained.rank("horaires du matin")[0][0] == "Ouvert de 9h à 18h"
+
+
+def test_rank_returns_probabilities_in_order(trained):
+    ranked = trained.rank("prix et tarif", k=3)
+    assert len(ranked) == 3
+    probabilities = [p for _, p in ranked]
+    assert probabilities == sorted(probabilities, reverse=True)
+    assert all(0.0 <= p <= 1.0 for p in probabilities)
+
+
+def test_single_occurrence_answers_are_not_candidates():
+    learner = OnlineLearner(dim=1 << 12)
+    learner.partial_fit([("bonjour a tous", "réponse unique")])
+    assert learner.rank("bonjour a tous") == []
+    learner.partial_fit([("bonjour encore", "réponse unique")])
+    assert learner.rank("bonjour")[0][0] == "réponse unique"
+
+
+def test_state_roundtrip_warm_starts(trained):
+    restored = OnlineLearner(dim=1 << 16)
+    restored.load_bytes(trained.to_bytes())
+    assert restored.rank("pluie et soleil") == trained.rank("pluie et soleil")
+    assert restored.is_trained
+
+    with pytest.raises(ValueError):
+        OnlineLearner(dim=1 << 12).load_bytes(trained.to_bytes())
+
+
+def test_model_trains_from_rows_and_predicts(tmp_path):
+    from core.humean_server import AdvancedAIModel, FALLBACK_RESPONSE, HumeanDatabase
+
+    db = HumeanDatabase(str(tmp_path / "learner.db"))
+    db.init_database()
+    model = AdvancedAIModel(db_manager=db, learner_dim=1 << 16)
+    rows = [{'model_name': model.model_name, 'input': q, 'output': a} for q, a in _pairs(2000)]
+    # Les réponses par défaut du modèle sont ignorées
+    rows.append({'model_name': model.model_name, 'input': 'x', 'output': FALLBACK_RESPONSE.format(query='x')})
+    rows.append({'model_name': 'autre', 'input': 'prix', 'output': 'ailleurs'})
+    assert model.train_from_rows(rows) == 2000
+
+    result = model.process_query("le prix à payer")
+    assert result['intent'] == 'predicted'
+    assert result['response'] == "Le tarif est de 10 euros"
+
+    # Poids écrits par paliers : l'arrêt du serveur enregistre le reste
+    model.flush_learner_state()
+    restarted = AdvancedAIModel(db_manager=db, learner_dim=1 << 16)
+    assert restarted.learner.rank("le prix à payer") == model.learner.rank("le prix à payer")
+
+
+def test_unknown_queries_are_not_predicted(trained):
+    assert trained.predict("qui est le président") is None
+    assert trained.predict("combien faut il payer")[0] == "Le tarif est de 10 euros"
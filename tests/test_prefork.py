@@ -0,0 +1,94 @@
+"""
+Tests du serveur pre-fork (POSIX uniquement)
+"""
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import ROOT_DIR
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork indisponible")
+
+SERVER_SCRIPT = r'''
+import sys
+from core.humean_server import HumeanComponents, create_app
+from core.humean_prefork import PreforkServer
+
+components = HumeanComponents(db_path=sys.argv[1])
+server = PreforkServer(create_app(components), port=0, workers=2, restart_delay=0.1)
+print(server.bind(), flush=True)
+server.serve_forever()
+'''
+
+
+def _children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return sorted(int(child) for child in f.read().split())
+
+
+def _wait_for(predicate, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.1)
+    raise AssertionError("condition non atteinte")
+
+
+def _get(port, path):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def prefork_server(tmp_path):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT_DIR, os.path.join(ROOT_DIR, 'src')]))
+    proc = subprocess.Popen([sys.executable, "-c", SERVER_SCRIPT, str(tmp_path / "prefork.db")],
+                            cwd=tmp_path, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    port = int(proc.stdout.readline())
+    _wait_for(lambda: len(_children(proc.pid)) == 2)
+    yield proc, port
+    proc.send_signal(signal.SIGTERM)
+    proc.wait(timeout=15)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/task"), reason="procfs requis")
+def test_workers_serve_shared_socket(prefork_server):
+    proc, port = prefork_server
+    for _ in range(10):
+        status, body = _get(port, "/api/health")
+        assert status == 200
+        assert body["status"] == "healthy"
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/task"), reason="procfs requis")
+def test_crashed_worker_is_respawned(prefork_server):
+    proc, port = prefork_server
+    victim = _children(proc.pid)[0]
+    os.kill(victim, signal.SIGKILL)
+
+    workers = _wait_for(lambda: (lambda c: c if len(c) == 2 and victim not in c else None)(_children(proc.pid)))
+    assert victim not in workers
+    assert _get(port, "/api/health")[0] == 200
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/task"), reason="procfs requis")
+def test_sigterm_stops_master_and_workers(prefork_server):
+    proc, port = prefork_server
+    workers = _children(proc.pid)
+    proc.send_signal(signal.SIGTERM)
+    assert proc.wait(timeout=15) == 0
+    for pid in workers:
+        assert not os.path.exists(f"/proc/{pid}") or open(f"/proc/{pid}/stat").read().split()[2] == "Z"
@@ -0,0 +1,49 @@
+"""
+Tests de l'endpoint de requêtes par lot
+"""
+import pytest
+
+
+@pytest.fixture
+def server():
+    from core import humean_server
+    return humean_server
+
+
+def _count(server, query):
+    with server.db_manager.connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM training_data WHERE input_data = ?",
+                            (f'"{query}"',)).fetchone()[0]
+
+
+def test_results_in_order_with_per_item_errors(server):
+    client = server.app.test_client()
+    response = client.post('/api/query/batch', json={'queries': [
+        'Bonjour', {'query': 'merci', 'context': {'a': 1}}, {'context': {}}, 'lot unique 42'
+    ]})
+    assert response.status_code == 200
+    body = response.get_json()
+    results = body['results']
+    assert body['count'] == 4
+    assert body['errors'] == 1
+    assert results[0]['intent'] == 'greeting'
+    assert results[1]['intent'] == 'thanks'
+    assert 'error' in results[2]
+    assert "lot unique 42" in results[3]['response']
+    assert _count(server, 'lot unique 42') == 1
+
+
+def test_batch_rejects_bad_payloads(server, monkeypatch):
+    client = server.app.test_client()
+    assert client.post('/api/query/batch', json={'query': 'x'}).status_code == 400
+    monkeypatch.setenv('HUMEAN_MAX_BATCH', '2')
+    assert client.post('/api/query/batch', json={'queries': ['a', 'b', 'c']}).status_code == 413
+
+
+def test_batch_shares_response_cache(server):
+    client = server.app.test_client()
+    before = server.ai_model.response_cache.get_stats()['hits']
+    # Réponse indépendante de l'orthographe (les réponses par défaut, qui la reprennent, ne sont pas cachées)
+    client.post('/api/query/batch', json={'queries': ['merci pour le cache', 'Merci pour le cache !'],
+                                          'store_for_training': False})
+    assert server.ai_model.response_cache.get_stats()['hits'] == before + 1
@@ -0,0 +1,113 @@
+"""
+Tests du cache de réponses et du singleflight
+"""
+import threading
+import time
+
+from src.core.humean_response_cache import ResponseCache, make_cache_key, normalize_query
+
+
+def test_normalization_groups_near_identical_queries():
+    assert normalize_query("  Bonjour   HUMEAN !") == normalize_query("bonjour humean")
+    assert make_cache_key("salut", {"b": 1, "a": 2}) == make_cache_key("Salut", {"a": 2, "b": 1})
+    assert make_cache_key("salut", {"a": 1}) != make_cache_key("salut", {"a": 2})
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResponseCache(max_size=2, ttl=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["expired"] == 1
+
+
+def test_singleflight_coalesces_concurrent_calls():
+    cache = ResponseCache()
+    calls = []
+    gate = threading.Event()
+
+    def compute():
+        calls.append(1)
+        gate.wait(1)
+        return {"value": 42}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"value": 42}] * 8
+    stats = cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 7
+
+
+def test_errors_and_rejected_results_are_not_cached():
+    cache = ResponseCache()
+    cache.get_or_compute("k", lambda: {"confidence": 0.0}, should_cache=lambda r: r["confidence"] > 0)
+    assert cache.get("k") is None
+
+
+def test_clear_discards_results_computed_before_it():
+    cache = ResponseCache()
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "ancienne"
+
+    thread = threading.Thread(target=cache.get_or_compute, args=("k", slow))
+    thread.start()
+    started.wait(5)
+    cache.clear()
+    assert cache.get_or_compute("k", lambda: "nouvelle") == "nouvelle"
+    release.set()
+    thread.join(5)
+    assert cache.get("k") == "nouvelle"
+    assert cache.get_stats()["generation"] == 1
+
+
+def test_model_caches_but_bypasses_clock():
+    from core.humean_server import AdvancedAIModel
+
+    model = AdvancedAIModel(model_name="cache_test")
+    first = model.process_query("Merci beaucoup")
+    second = model.process_query("merci   beaucoup !")
+    assert first['response'] == second['response']
+    model.process_query("Quelle heure est-il ?")
+
+    stats = model.response_cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bypassed"] == 1
+
+
+def test_model_does_not_cache_echoing_fallback_and_feedback_refreshes_variants():
+    from core.humean_server import AdvancedAIModel
+
+    model = AdvancedAIModel(model_name="cache_echo_test")
+    first = model.process_query("Capitale du Japon ?")
+    assert "Capitale du Japon ?" in first['response']
+    assert "capitale du japon" in model.process_query("capitale du japon")['response']
+    assert model.response_cache.get_stats()["size"] == 0
+
+    model.process_query("quelle est la capitale du japon donc")
+    model.process_query("merci pour tout", {"lang": "fr"})
+    assert model.response_cache.get_stats()["size"] == 1
+    model.learn_from_feedback("quelle est la capitale du japon", "Tokyo", 5)
+    assert model.response_cache.get_stats()["size"] == 0
+    assert model.process_query("quelle est la capitale du japon donc")['response'] == "Tokyo"
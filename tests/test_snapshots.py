@@ -0,0 +1,109 @@
+"""
+Tests des instantanés de modèle (format aligné, mmap, activation à chaud)
+"""
+import numpy as np
+import pytest
+
+from core.humean_snapshots import (ALIGNMENT, SnapshotError, load_snapshot_bytes, open_snapshot,
+                                   serialize, write_snapshot)
+from core.humean_vector_index import VectorIndex
+
+
+def test_roundtrip_is_aligned_and_zero_copy(tmp_path):
+    matrix = np.arange(12, dtype=np.float32).reshape(3, 4)
+    path = str(tmp_path / "a.hsnap")
+    write_snapshot(path, {"m": matrix, "empty": np.zeros(0, dtype=np.int64)},
+                   {"s": ["é", {"k": [1, 2]}, None]}, {"note": "x"})
+
+    snapshot = open_snapshot(path)
+    loaded = snapshot.array("m")
+    np.testing.assert_array_equal(loaded, matrix)
+    assert loaded.ctypes.data % ALIGNMENT == 0
+    assert not loaded.flags.owndata and not loaded.flags.writeable
+    assert snapshot.array("empty").shape == (0,)
+    assert list(snapshot.strings("s")) == ["é", {"k": [1, 2]}, None]
+    assert snapshot.metadata == {"note": "x"}
+    assert open(path, "rb").read() == serialize({"m": matrix, "empty": np.zeros(0, dtype=np.int64)},
+                                                {"s": ["é", {"k": [1, 2]}, None]}, {"note": "x"})
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(SnapshotError):
+        load_snapshot_bytes(b"PK\x03\x04" + b"\0" * 32)
+
+
+def test_vector_index_from_snapshot_then_write():
+    index = VectorIndex(dim=64, initial_capacity=2)
+    for i in range(5):
+        index.add(f"k{i}", f"question numéro {i}", {"r": i}, score=i)
+    arrays, strings = index.export_state()
+    restored = VectorIndex.from_snapshot(load_snapshot_bytes(serialize(arrays, strings)))
+
+    assert len(restored) == 5
+    assert restored.best_answer("question numéro 3", threshold=0.9)["output"] == {"r": 3}
+    # Première écriture : copie des vues, puis mises à jour normales
+    restored.add("k3", "question numéro 3", {"r": "modifié"}, score=10)
+    restored.add("k9", "autre chose", "neuf")
+    assert len(restored) == 6
+    assert restored.best_answer("question numéro 3", threshold=0.9)["output"] == {"r": "modifié"}
+
+
+def _model(db, **kwargs):
+    from core.humean_server import AdvancedAIModel
+    return AdvancedAIModel(db_manager=db, learner_dim=1 << 12, **kwargs)
+
+
+@pytest.fixture
+def db(tmp_path):
+    from core.humean_server import HumeanDatabase
+    return HumeanDatabase(str(tmp_path / "snap.db"))
+
+
+def test_restart_loads_snapshot_and_later_knowledge(db):
+    model = _model(db)
+    model.learn_from_feedback("quelle est la capitale", "Paris", 5)
+    model.learner.partial_fit([("prix du billet", "10 euros")] * 3)
+    assert model.save_snapshot() == 1
+
+    # Aucune connaissance postérieure : vues de l'instantané utilisées telles quelles
+    assert not _model(db).vector_index._matrix.flags.writeable
+
+    model.learn_from_feedback("plus haute montagne", "Mont Blanc", 5)
+    restarted = _model(db)
+    assert restarted.snapshot_version == 1
+    assert restarted.process_query("quelle est la capitale")['response'] == "Paris"
+    assert restarted.process_query("plus haute montagne")['response'] == "Mont Blanc"
+    assert restarted.learner.rank("prix du billet") == model.learner.rank("prix du billet")
+
+
+def test_hot_swap_through_api(tmp_path):
+    from core.humean_server import HumeanComponents, create_app
+
+    components = HumeanComponents(db_path=str(tmp_path / "swap.db"), start_background=False)
+    client = create_app(components).test_client()
+    client.post('/api/feedback', json={'input_data': 'couleur du ciel', 'expected_output': 'bleu',
+                                       'feedback_score': 5})
+    assert client.post('/api/models/snapshots').get_json()['version'] == 1
+    client.post('/api/feedback', json={'input_data': 'couleur du ciel', 'expected_output': 'gris',
+                                       'feedback_score': 9})
+    assert client.post('/api/models/snapshots').get_json()['version'] == 2
+
+    assert client.post('/api/query', json={'query': 'couleur du ciel'}).get_json()['response'] == 'gris'
+    assert client.post('/api/models/snapshots/1/activate').status_code == 200
+    # La connaissance plus récente que l'instantané v1 est réindexée
+    assert client.post('/api/query', json={'query': 'couleur du ciel'}).get_json()['response'] == 'gris'
+    assert client.post('/api/models/snapshots/7/activate').status_code == 404
+
+    listing = client.get('/api/models/snapshots').get_json()
+    assert listing['active_version'] == 1
+    assert [s['version'] for s in listing['snapshots']] == [2, 1]
+
+
+def test_prune_keeps_latest_versions(db):
+    import os
+    model = _model(db)
+    for _ in range(4):
+        model.save_snapshot(keep=2)
+    versions = model.snapshot_store.list(model.model_name)
+    assert [v['version'] for v in versions] == [4, 3]
+    assert sorted(os.listdir(model.snapshot_store.directory)) == ["humean_core.v3.hsnap", "humean_core.v4.hsnap"]
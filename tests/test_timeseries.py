@@ -0,0 +1,97 @@
+"""
+Tests des agrégats temporels de performance_logs
+"""
+import random
+import time
+
+import pytest
+
+from core.humean_timeseries import DAY, HOUR, MINUTE, QuantileSketch, TimeSeriesStore
+
+T0 = 1_760_000_400  # début d'heure (UTC)
+
+
+@pytest.fixture
+def store(tmp_path):
+    from core.humean_server import HumeanDatabase
+    return TimeSeriesStore(HumeanDatabase(str(tmp_path / "series.db")), chunk_size=50)
+
+
+def test_sketch_quantiles_are_within_relative_error():
+    rng = random.Random(3)
+    values = sorted(rng.lognormvariate(3, 1) for _ in range(5000))
+    sketch, left, right = QuantileSketch(0.01), QuantileSketch(0.01), QuantileSketch(0.01)
+    for i, v in enumerate(values):
+        sketch.add(v)
+        (left if i % 2 else right).add(v)
+    left.merge(right)
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) / exact <= 0.011
+        assert left.quantile(q) == sketch.quantile(q)
+    assert QuantileSketch.from_bytes(sketch.to_bytes()).quantile(0.9) == sketch.quantile(0.9)
+
+
+def test_rollup_is_incremental_and_exact_for_min_max_avg(store):
+    for i in range(120):  # deux heures, un point par minute
+        store.record("m", "latency_ms", i, timestamp=T0 + i * MINUTE)
+    assert store.rollup() == 120
+    assert store.rollup() == 0
+    store.record("m", "latency_ms", 1000, timestamp=T0 + 30)
+    assert store.rollup() == 1
+
+    resolution, points = store.query("m", "latency_ms", T0, T0 + 2 * HOUR, step=HOUR, now=T0 + 2 * HOUR)
+    assert resolution == HOUR
+    assert [p["count"] for p in points] == [61, 60]
+    assert points[0]["min"] == 0 and points[0]["max"] == 1000
+    assert points[1]["avg"] == pytest.approx(sum(range(60, 120)) / 60)
+
+    resolution, points = store.query("m", "latency_ms", T0, T0 + 5 * MINUTE, step=MINUTE, now=T0 + 2 * HOUR)
+    assert resolution == MINUTE and len(points) == 5 and points[0]["count"] == 2
+
+
+def test_coarsest_satisfying_resolution_is_chosen(store):
+    now = T0 + 10 * DAY
+    assert store.pick_resolution(DAY, now - 30 * DAY, now) == DAY
+    assert store.pick_resolution(2 * HOUR, now - DAY, now) == HOUR
+    assert store.pick_resolution(5 * MINUTE, now - DAY, now) == MINUTE
+    assert store.pick_resolution(10, now - 60, now) == 0
+    # Minutes expirées au-delà de 14 jours : l'heure est la plus fine disponible
+    assert store.pick_resolution(HOUR, now - 30 * DAY, now) == HOUR
+    assert store.pick_resolution(MINUTE, now - 30 * DAY, now) == 0
+
+
+def test_raw_query_for_sub_minute_steps(store):
+    for i in range(6):
+        store.record("m", "x", i, timestamp=T0 + i * 10)
+    resolution, points = store.query("m", "x", T0, T0 + MINUTE, step=20, now=T0 + MINUTE)
+    assert resolution == 0
+    assert [p["count"] for p in points] == [2, 2, 2]
+
+
+def test_retention_only_drops_rolled_up_raw_points(store):
+    store.record("m", "x", 1, timestamp=T0)
+    store.rollup()
+    store.record("m", "x", 2, timestamp=T0 + 1)
+    raw_deleted, rollups_deleted = store.expire(now=T0 + 20 * DAY)
+    assert raw_deleted == 1
+    assert rollups_deleted == 1  # agrégat minute au-delà de 14 jours
+    assert store.rollup() == 1
+    _, points = store.query("m", "x", T0 - DAY, T0 + DAY, step=HOUR, now=T0 + 20 * DAY)
+    assert points[0]["count"] == 2
+
+
+def test_series_endpoint(tmp_path):
+    from core.humean_server import HumeanComponents, create_app
+
+    components = HumeanComponents(db_path=str(tmp_path / "api.db"), start_background=False)
+    client = create_app(components).test_client()
+    start = int(time.time()) // HOUR * HOUR - HOUR
+    components.timeseries.record("self_improvement", "cycle_rows", 5, timestamp=start + 10)
+    components.timeseries.rollup()
+
+    body = client.get(f'/api/performance/series?metric=cycle_rows&start={start}&end={start + HOUR}&step=3600').get_json()
+    assert body['resolution'] == HOUR
+    assert body['points'][0]['count'] == 1 and body['points'][0]['p50'] == pytest.approx(5, rel=0.01)
+    assert client.get('/api/performance/series').status_code == 400
+    assert client.get('/api/performance/series?metric=x&step=abc').status_code == 400
@@ -0,0 +1,111 @@
+"""
+Tests du traçage par étapes (Server-Timing, tampon des requêtes lentes)
+"""
+import time
+
+from flask import Flask
+
+from src.core.humean_tracing import add_timing, current_span, install_tracing, span, traced
+
+
+def _app(**options):
+    app = Flask(__name__)
+    tracing = install_tracing(app, **options)
+
+    @traced('work')
+    def work():
+        with span('inner', step=1):
+            time.sleep(0.002)
+        add_timing('db', 0.001)
+
+    @app.route('/slow')
+    def slow():
+        with span('parse'):
+            pass
+        work()
+        work()
+        return 'ok'
+
+    @app.route('/boom')
+    def boom():
+        raise RuntimeError("boom")
+
+    return app, tracing
+
+
+def test_spans_are_noops_outside_a_request():
+    with span('orphan') as s:
+        assert s is None
+    add_timing('db', 1.0)
+    assert current_span() is None
+
+
+def test_server_timing_header_aggregates_top_level_stages():
+    app, _ = _app(slow_threshold_ms=10_000)
+    response = app.test_client().get('/slow')
+    header = response.headers['Server-Timing']
+    names = [part.split(';')[0] for part in header.split(', ')]
+    assert names == ['parse', 'work', 'db', 'total']
+    durations = dict((p.split(';dur=')[0], float(p.split(';dur=')[1])) for p in header.split(', '))
+    assert durations['work'] >= 4.0
+    assert abs(durations['db'] - 2.0) < 0.01
+
+
+def test_slow_requests_keep_full_span_tree():
+    app, tracing = _app(slow_threshold_ms=0, capacity=2)
+    client = app.test_client()
+    for _ in range(3):
+        client.get('/slow')
+
+    payload = client.get('/debug/slow-requests').get_json()
+    # Tampon circulaire : les deux plus récentes, la plus récente en premier
+    assert [r['path'] for r in payload['requests']] == ['/slow', '/slow']
+    tree = payload['requests'][0]['spans']
+    assert tree['name'] == 'request'
+    assert [c['name'] for c in tree['children']] == ['parse', 'work', 'work']
+    inner = tree['children'][1]['children'][0]
+    assert inner['name'] == 'inner' and inner['attrs'] == {'step': 1}
+    assert tree['children'][1]['timings_ms']['db'] == 1.0
+    # /debug/slow-requests est lui aussi tracé, après lecture du tampon
+    assert tracing.get_stats()['slow'] == 4
+
+
+def test_fast_requests_are_not_buffered():
+    app, tracing = _app(slow_threshold_ms=10_000)
+    app.test_client().get('/slow')
+    assert tracing.slow_requests() == []
+    assert tracing.get_stats()['traced'] == 1
+
+
+def test_unhandled_exception_is_recorded():
+    app, tracing = _app(slow_threshold_ms=0)
+    app.test_client().get('/boom')
+    assert tracing.slow_requests()[0]['status'] == 500
+    assert current_span() is None
+
+
+def test_query_endpoint_reports_stages():
+    from src.core.humean_server import HumeanComponents, create_app
+
+    app = create_app(HumeanComponents(db_path='tracing.db', start_background=False))
+    response = app.test_client().post('/api/query', json={'query': 'bonjour', 'store_for_training': False})
+    assert response.status_code == 200
+    header = response.headers['Server-Timing']
+    assert 'parse;dur=' in header and 'process_query;dur=' in header
+
+
+def test_data_connect_traces_ingestion_only():
+    from src.core.humean_data_api import create_data_endpoints
+
+    app = Flask(__name__)
+    create_data_endpoints(app)
+    app.extensions['humean_tracing'].slow_threshold = 0
+    response = app.test_client().post('/data/connect/financial', json={'symbol': 'MSFT'})
+    assert response.status_code == 200
+    header = response.headers['Server-Timing']
+    assert 'connect;dur=' in header
+    # Génération des insights déléguée à la tâche d'arrière-plan
+    assert 'generate_p3_insights' not in header
+    tree = app.extensions['humean_tracing'].slow_requests()[0]['spans']
+    connect = next(c for c in tree['children'] if c['name'] == 'connect')
+    assert connect['children'][0]['name'] == 'store_raw_data'
@@ -0,0 +1,68 @@
+"""
+Tests de l'export paginé / en flux des données d'entraînement
+"""
+import json
+
+import pytest
+
+
+@pytest.fixture
+def server():
+    from core import humean_server
+    return humean_server
+
+
+@pytest.fixture
+def seeded(server, request):
+    model = f"export_{request.node.name}"
+    with server.db_manager.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO training_data (input_data, expected_output, model_name, timestamp) VALUES (?, ?, ?, ?)",
+            [(json.dumps(f"q{i}"), json.dumps({"r": i}), model, "2026-01-01 00:00:00") for i in range(25)]
+        )
+    return model
+
+
+def test_keyset_pages_cover_all_rows_once(server, seeded):
+    client = server.app.test_client()
+    seen, cursor = [], None
+    while True:
+        url = f'/api/training-data?model={seeded}&limit=10' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(url).get_json()
+        seen.extend(item['input'] for item in body['training_data'])
+        cursor = body['next_cursor']
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(f"q{i}" for i in range(25))
+    assert len(seen) == 25
+
+
+def test_ndjson_stream(server, seeded):
+    client = server.app.test_client()
+    response = client.get(f'/api/training-data?model={seeded}&format=ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 25
+    assert [line['id'] for line in lines] == sorted((line['id'] for line in lines), reverse=True)
+    assert lines[0]['output'] == {"r": 24}
+
+
+def test_stream_uses_small_chunks(server, seeded):
+    rows = list(server.data_connector.iter_training_rows(seeded, chunk_size=4, limit=9))
+    assert len(rows) == 9
+
+
+def test_invalid_cursor_is_rejected(server):
+    response = server.app.test_client().get('/api/training-data?cursor=@@@')
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=-5", "limit=0&format=ndjson"])
+def test_non_positive_limit_is_rejected(server, query):
+    response = server.app.test_client().get(f'/api/training-data?{query}')
+    assert response.status_code == 400
+    assert 'limit' in response.get_json()['error']
+
+
+def test_empty_page_has_no_cursor(server):
+    assert server.data_connector.get_training_data_page("aucun_modele", limit=0) == ([], None)
@@ -0,0 +1,114 @@
+"""
+Tests de l'index vectoriel des connaissances apprises
+"""
+import numpy as np
+
+from src.core.humean_vector_index import HashingEncoder, VectorIndex
+
+
+def test_encoding_is_stable_and_normalized():
+    encoder = HashingEncoder(dim=64)
+    a = encoder.encode("Quelle est la capitale de la France ?")
+    b = encoder.encode("quelle est la capitale de la france")
+    assert np.allclose(a, b)
+    assert abs(float(np.linalg.norm(a)) - 1.0) < 1e-5
+    assert not encoder.encode("").any()
+
+
+def test_nearest_neighbour_above_threshold():
+    index = VectorIndex(dim=256, initial_capacity=2, threshold=0.6)
+    index.add("fr", "quelle est la capitale de la france", "Paris", 1.0)
+    index.add("it", "quelle est la capitale de l'italie", "Rome", 1.0)
+    index.add("m", "prix du bitcoin aujourd'hui", "Je ne sais pas", 0.2)
+    assert len(index) == 3
+    assert index.get_stats()["capacity"] >= 3
+
+    assert index.best_answer("Quelle est la capitale de la France")['output'] == "Paris"
+    assert index.best_answer("recette de la tarte aux pommes") is None
+
+
+def test_best_score_wins_among_neighbours_and_updates_in_place():
+    index = VectorIndex(threshold=0.5)
+    index.add("a", "meteo a paris demain", "Pluie", 0.1)
+    index.add("b", "meteo a paris demain matin", "Soleil", 0.9)
+    assert index.best_answer("meteo a paris demain")['output'] == "Soleil"
+
+    index.add("a", "meteo a paris demain", "Nuageux", 1.0)
+    assert len(index) == 2
+    assert index.best_answer("meteo a paris demain")['output'] == "Nuageux"
+
+
+def test_batched_search_matches_single_search():
+    index = VectorIndex(threshold=0.3)
+    for i in range(50):
+        index.add(f"k{i}", f"question numero {i} sur le sujet {i % 7}", f"r{i}")
+    queries = ["question numero 3 sur le sujet 3", "question numero 42 sur le sujet 0"]
+    batched = index.search_many(queries, k=3)
+    for query, hits in zip(queries, batched):
+        single = index.search(query, k=3)
+        assert [p for p, _ in hits] == [p for p, _ in single]
+        assert np.allclose([s for _, s in hits], [s for _, s in single], atol=1e-5)
+
+
+def test_index_is_bounded_by_score_weighted_lru():
+    index = VectorIndex(dim=64, initial_capacity=1024, threshold=0.9, max_entries=4, eviction_sample=2)
+    assert index.get_stats()["capacity"] == 4
+    index.add("a", "question alpha", "A", 0.9)
+    index.add("b", "question beta", "B", 0.1)
+    index.add("c", "question gamma", "C", 0.5)
+    index.add("d", "question delta", "D", 0.5)
+    index.add("a", "question alpha", "A2", 0.9)  # mise à jour : rafraîchie, pas d'éviction
+
+    # Plus anciennes (b, c) : b, de plus faible score, cède sa colonne
+    index.add("e", "question epsilon", "E", 0.5)
+    assert len(index) == 4
+    assert index.best_answer("question beta") is None
+    assert index.best_answer("question epsilon")["output"] == "E"
+
+    # c servi récemment : d devient la plus ancienne avec la nouvelle
+    assert index.best_answer("question gamma")["output"] == "C"
+    index.add("f", "question zeta", "F", 0.5)
+    assert index.best_answer("question delta") is None
+    assert [index.best_answer(q)["output"] for q in ("question alpha", "question gamma", "question zeta")] == [
+        "A2", "C", "F"
+    ]
+    stats = index.get_stats()
+    assert (stats["entries"], stats["capacity"], stats["evictions"]) == (4, 4, 2)
+
+
+def test_oversized_snapshot_is_trimmed_on_first_write():
+    from src.core.humean_snapshots import load_snapshot_bytes, serialize
+
+    index = VectorIndex(dim=64)
+    for i in range(6):
+        index.add(f"k{i}", f"question numero {i}", f"r{i}", score=i)
+    arrays, strings = index.export_state()
+    restored = VectorIndex.from_snapshot(load_snapshot_bytes(serialize(arrays, strings)), max_entries=4)
+
+    restored.add("k9", "autre chose", "neuf", score=10)
+    assert len(restored) == 4
+    assert restored.get_stats()["capacity"] == 4
+    assert restored.best_answer("question numero 1", threshold=0.9) is None
+    assert restored.best_answer("question numero 5", threshold=0.9)["output"] == "r5"
+    assert restored.best_answer("autre chose", threshold=0.9)["output"] == "neuf"
+
+
+def test_model_index_shares_knowledge_capacity():
+    from core.humean_server import AdvancedAIModel
+
+    model = AdvancedAIModel(model_name="vector_cap_test", knowledge_max_entries=3)
+    for i in range(10):
+        model.learn_from_feedback(f"question numero {i}", f"r{i}", 1.0)
+    assert len(model.vector_index) == 3
+    assert model.vector_index.get_stats()["max_entries"] == 3
+
+
+def test_model_answers_from_feedback():
+    from core.humean_server import AdvancedAIModel
+
+    model = AdvancedAIModel(model_name="vector_test")
+    model.process_query("Quelle est la capitale du Japon ?")
+    model.learn_from_feedback("Quelle est la capitale du Japon ?", "Tokyo", 1.0)
+    result = model.process_query("quelle est la capitale du japon")
+    assert result['response'] == "Tokyo"
+    assert result['intent'] == "learned"
@@ -0,0 +1,83 @@
+"""
+Tests de l'écriture différée des données d'entraînement
+"""
+import time
+
+import pytest
+
+from src.core.humean_db_pool import SQLiteConnectionPool
+from src.core.humean_write_behind import WriteBehindQueue
+
+
+class _Db:
+    def __init__(self, path):
+        self.pool = SQLiteConnectionPool(path, max_size=2)
+        with self.pool.transaction() as conn:
+            conn.execute("CREATE TABLE rows (value INTEGER)")
+
+    def transaction(self):
+        return self.pool.transaction()
+
+    def count(self):
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = _Db(str(tmp_path / "wb.db"))
+    yield db
+    db.pool.close()
+
+
+def test_flushes_by_size(db):
+    writer = WriteBehindQueue(db, "INSERT INTO rows VALUES (?)", max_batch=10, flush_interval=60)
+    writer.start()
+    for i in range(10):
+        assert writer.submit((i,))
+    for _ in range(100):
+        if db.count() == 10:
+            break
+        time.sleep(0.01)
+    assert db.count() == 10
+    assert writer.get_stats()["flushes"] == 1
+    writer.stop()
+
+
+def test_flushes_by_time(db):
+    writer = WriteBehindQueue(db, "INSERT INTO rows VALUES (?)", max_batch=1000, flush_interval=0.05)
+    writer.start()
+    writer.submit((1,))
+    time.sleep(0.3)
+    assert db.count() == 1
+    writer.stop()
+
+
+def test_drops_when_full_and_counts(db):
+    writer = WriteBehindQueue(db, "INSERT INTO rows VALUES (?)", max_queue=2)
+    assert writer.submit((1,))
+    assert writer.submit((2,))
+    assert not writer.submit((3,))
+    assert writer.get_stats()["dropped"] == 1
+
+
+def test_stop_drains_pending_rows(db):
+    writer = WriteBehindQueue(db, "INSERT INTO rows VALUES (?)", max_batch=7, flush_interval=60)
+    for i in range(50):
+        writer.submit((i,))
+    writer.start()
+    writer.stop()
+    assert db.count() == 50
+    stats = writer.get_stats()
+    assert stats["written"] == 50
+    assert stats["queue_depth"] == 0
+
+
+def test_query_endpoint_uses_write_behind():
+    from core import humean_server
+
+    client = humean_server.app.test_client()
+    before = humean_server.data_connector.get_writer_stats()["enqueued"]
+    response = client.post('/api/query', json={'query': 'merci'})
+    assert response.status_code == 200
+    assert humean_server.data_connector.get_writer_stats()["enqueued"] == before + 1